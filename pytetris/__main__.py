@@ -4,21 +4,25 @@
 @Author         : yanyongyu
 @Date           : 2020-05-14 22:08:31
 @LastEditors    : yanyongyu
-@LastEditTime   : 2020-06-01 17:05:00
+@LastEditTime   : 2026-10-18 21:12:47
 @Description    : None
 @GitHub         : https://github.com/yanyongyu
 """
 __author__ = "yanyongyu"
 
-import pygame
+import sys
 import logging
-
-from .game import Game
+import argparse
+from typing import List, Optional
 
 logging.basicConfig(level=logging.INFO)
 
 
 def main():
+    # 仅在打开窗口时导入 pygame
+    import pygame
+    from .game import Game
+
     try:
         game = Game()
         game.start()
@@ -31,5 +35,52 @@ def main():
         pygame.quit()
 
 
+def _non_negative(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{value} is negative")
+    return number
+
+
+def simulate(argv: Optional[List[str]] = None):
+    """Play AI games without a window, ``python -m pytetris simulate``"""
+    from .simulate import MAX_PIECES
+    from .batch import simulate as run_simulate
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pytetris simulate",
+        description="Play AI games without a window and stream JSON lines")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ai",
+                        default="greedy",
+                        help="<search>[:<weights>], e.g. lookahead:tuned")
+    parser.add_argument("--max-pieces",
+                        type=int,
+                        default=MAX_PIECES,
+                        help="0 plays until game over")
+    parser.add_argument("--start-line", type=int, default=0)
+    parser.add_argument("--every",
+                        type=_non_negative,
+                        default=100,
+                        help="games between aggregate statistics, 0 for "
+                        "only the final ones")
+    parser.add_argument("--output", default=None, help="defaults to stdout")
+    args = parser.parse_args(argv)
+
+    output = (open(args.output, "w", encoding="utf-8")
+              if args.output else sys.stdout)
+    try:
+        run_simulate(output, args.ai, args.games, args.seed, args.workers,
+                     args.max_pieces or None, args.start_line, args.every)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
 if __name__ == "__main__":
-    main()
+    if sys.argv[1:2] == ["simulate"]:
+        simulate(sys.argv[2:])
+    else:
+        main()
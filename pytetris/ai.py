@@ -11,11 +11,15 @@
 __author__ = "yanyongyu"
 
 import logging
-from typing import List
+from typing import Dict, List, Tuple, Union, Callable, Optional, Sequence
 from dataclasses import dataclass
 
 import numpy as np
 
+from .tetris import Shape, shapes_of
+from .features import BoardStats
+from .weights import EL_TETRIS, PIERRE_DELLACHERIE, Weights
+
 
 @dataclass
 class Result(object):
@@ -26,6 +30,14 @@ class Result(object):
     priority: int
 
 
+def placement_priority(shape: Shape, index: int, x: int) -> int:
+    """Tie break of placements with equal scores, lower is better
+
+    Placements near the middle come first, then lower shape indexes.
+    """
+    return 100 * abs((10 - shape.width) // 2 - x) + index
+
+
 def _check_collision(matrix: np.ndarray) -> bool:
     return np.any(matrix > 1)
 
@@ -90,75 +102,451 @@ def _board_wells(matrix: np.ndarray) -> int:
     return score
 
 
-def pierre_dellacherie(matrix: np.ndarray,
-                       current: List[np.ndarray]) -> List[Result]:
+def _drop_placements(matrix: np.ndarray, shapes: Tuple[Shape, ...]):
+    """Find the landing row of every straight drop at once
+
+    The piece falls from ``y = 0`` until the first collision, so its landing
+    row only depends on the first filled cell of each board column and the
+    lowest cell of each piece column.
+
+    Args:
+        matrix (np.ndarray): Matrix of the game
+        shapes (Tuple[Shape, ...]): Placement tables of the current tetris
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: index, x and y of each
+            legal placement in ``(index, x)`` order
+    """
+    tops = np.argmax(matrix != 0, axis=0)
+    xs = np.arange(-1, 9)
+    indexes, placed_xs, ys = [], [], []
+    for index, shape in enumerate(shapes):
+        bottoms = np.array(shape.bottoms)
+        columns = xs[:, None] + 3 + np.arange(shape.width)[None, :]
+        limits = np.where(bottoms >= 0, tops[columns] - 3 - bottoms, 25)
+        y = np.min(limits, axis=1)
+        legal = y >= 0
+        indexes.append(np.full(np.count_nonzero(legal), index))
+        placed_xs.append(xs[legal])
+        ys.append(y[legal])
+    return np.concatenate(indexes), np.concatenate(placed_xs), np.concatenate(
+        ys)
+
+
+def _stack_boards(matrix: np.ndarray, shapes: Tuple[Shape, ...],
+                  indexes: np.ndarray, xs: np.ndarray, ys: np.ndarray):
+    """Stack the board after every placement into one 3-D array
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Boards with the piece added and the
+            piece cells alone, both shaped ``(N, 25, 16)``
+    """
+    pieces = np.zeros((len(indexes),) + matrix.shape, dtype=matrix.dtype)
+    for index, shape in enumerate(shapes):
+        selected = np.flatnonzero(indexes == index)
+        rows, cols = np.array(shape.cells).T
+        pieces[selected[:, None], ys[selected, None] + 2 + rows,
+               xs[selected, None] + 3 + cols] = 1
+    return matrix[None, :, :] + pieces, pieces
+
+
+def _batch_landing_height(shapes: Tuple[Shape, ...], indexes: np.ndarray,
+                          ys: np.ndarray) -> np.ndarray:
+    first_rows = np.array([shape.first_row for shape in shapes])
+    return 20 - ys - first_rows[indexes]
+
+
+def _batch_eroded_piece_cells_metric(boards: np.ndarray,
+                                     pieces: np.ndarray) -> np.ndarray:
+    cleared = np.all(boards[:, 2:-3, :], axis=2)
+    cleared_num = np.sum(cleared, axis=1)
+    contributed = np.sum(np.sum(pieces[:, 2:-3, :], axis=2) * cleared, axis=1)
+    return contributed * cleared_num
+
+
+def _batch_board_row_transitions(boards: np.ndarray) -> np.ndarray:
+    return np.sum(boards[:, 2:22, 3:14] != boards[:, 2:22, 2:13], axis=(1, 2))
+
+
+def _batch_board_column_transitions(boards: np.ndarray) -> np.ndarray:
+    return np.sum(boards[:, 2:23, 3:13] != boards[:, 1:22, 3:13], axis=(1, 2))
+
+
+def _batch_board_buried_holes(boards: np.ndarray) -> np.ndarray:
+    filled = boards[:, :, 3:13] != 0
+    covered = np.maximum.accumulate(filled, axis=1)
+    return np.sum(covered & ~filled, axis=(1, 2))
+
+
+def _batch_board_wells(boards: np.ndarray) -> np.ndarray:
+    wells = ((boards[:, 2:23, 3:13] == 0) & (boards[:, 2:23, 2:12] == 1) &
+             (boards[:, 2:23, 4:14] == 1))
+    # 每个井格在连续井中的深度之和即为 1 + 2 + ... + n
+    counts = np.cumsum(wells, axis=1)
+    resets = np.maximum.accumulate(np.where(wells, 0, counts), axis=1)
+    return np.sum(counts - resets, axis=(1, 2))
+
+
+class Batch(object):
+    """Candidate placements of a tetris on a board, evaluated together
+
+    Features are computed on first access and kept, so evaluators sharing
+    a feature compute it once per batch.
+
+    Attributes:
+        matrix (np.ndarray): Matrix of the game
+        shapes (Tuple[Shape, ...]): Placement tables of the tetris
+        indexes (np.ndarray): Shape index of each placement
+        xs (np.ndarray): X coordinate of each placement
+        ys (np.ndarray): Y coordinate of each placement
+        boards (np.ndarray): Boards after each placement, ``(N, 25, 16)``
+        pieces (np.ndarray): Cells of each placed piece, ``(N, 25, 16)``
+        values (Dict[str, np.ndarray]): Computed features
+    """
+
+    def __init__(self, matrix: np.ndarray, current: List[np.ndarray]):
+        self.matrix = matrix
+        self.shapes = shapes_of(current)
+        self.indexes, self.xs, self.ys = _drop_placements(matrix, self.shapes)
+        self.boards, self.pieces = _stack_boards(matrix, self.shapes,
+                                                 self.indexes, self.xs,
+                                                 self.ys)
+        self.values: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        value = self.values.get(name)
+        if value is None:
+            value = self.values[name] = FEATURES[name](self)
+        return value
+
+    @property
+    def priority(self) -> np.ndarray:
+        widths = np.array([shape.width for shape in self.shapes])
+        return (100 * np.abs((10 - widths[self.indexes]) // 2 - self.xs) +
+                self.indexes)
+
+
+FEATURES: Dict[str, Callable[[Batch], np.ndarray]] = {}
+
+
+def register_feature(name: str):
+    """Register a feature computed over a batch of placements
+
+    The function gets the ``Batch`` and returns one value per placement.
+    Other features are available as ``batch[name]``.
+    """
+
+    def decorator(func: Callable[[Batch], np.ndarray]):
+        FEATURES[name] = func
+        return func
+
+    return decorator
+
+
+# 方块海拔
+register_feature("landing_height")(lambda batch: _batch_landing_height(
+    batch.shapes, batch.indexes, batch.ys))
+# 消除行数
+register_feature("eroded_piece_cells_metric")(
+    lambda batch: _batch_eroded_piece_cells_metric(batch.boards, batch.pieces))
+# 行变换
+register_feature("board_row_transitions")(
+    lambda batch: _batch_board_row_transitions(batch.boards))
+# 列变换
+register_feature("board_column_transitions")(
+    lambda batch: _batch_board_column_transitions(batch.boards))
+# 空洞数
+register_feature("board_buried_holes")(
+    lambda batch: _batch_board_buried_holes(batch.boards))
+# 井深度
+register_feature("board_wells")(lambda batch: _batch_board_wells(batch.boards))
+
+
+@register_feature("column_heights")
+def _batch_column_heights(batch: Batch) -> np.ndarray:
+    """Height of each of the 10 columns, ``(N, 10)``, before clearing"""
+    # 底部墙行保证每列都有方块
+    filled = batch.boards[:, 2:, 3:13] != 0
+    return 20 - np.argmax(filled, axis=1)
+
+
+@register_feature("aggregate_height")
+def _batch_aggregate_height(batch: Batch) -> np.ndarray:
+    return np.sum(batch["column_heights"], axis=1)
+
+
+@register_feature("bumpiness")
+def _batch_bumpiness(batch: Batch) -> np.ndarray:
+    return np.sum(np.abs(np.diff(batch["column_heights"], axis=1)), axis=1)
+
+
+@register_feature("max_height")
+def _batch_max_height(batch: Batch) -> np.ndarray:
+    return np.max(batch["column_heights"], axis=1)
+
+
+@register_feature("cells")
+def _batch_cells(batch: Batch) -> np.ndarray:
+    """Visible field after each placement, ``(N, 20, 10)``"""
+    return batch.boards[:, 2:22, 3:13] != 0
+
+
+@register_feature("complete_lines")
+def _batch_complete_lines(batch: Batch) -> np.ndarray:
+    return np.sum(np.all(batch.boards[:, 2:-3, :], axis=2), axis=1)
+
+
+@dataclass(frozen=True)
+class Evaluator(object):
+    """Named linear combination of registered features
+
+    Attributes:
+        name (str): Name of the evaluator
+        features (Tuple[str, ...]): Names of the features
+        weights (Tuple[float, ...]): Weight of each feature
+    """
+
+    name: str
+    features: Tuple[str, ...]
+    weights: Tuple[float, ...]
+
+    def score(self, batch: Batch) -> np.ndarray:
+        score = self.weights[0] * batch[self.features[0]]
+        for feature, weight in zip(self.features[1:], self.weights[1:]):
+            score = score + weight * batch[feature]
+        return score
+
+
+PIERRE_DELLACHERIE_FEATURES = ("landing_height", "eroded_piece_cells_metric",
+                               "board_row_transitions",
+                               "board_column_transitions",
+                               "board_buried_holes", "board_wells")
+
+EVALUATORS: Dict[str, Evaluator] = {}
+
+
+def register_evaluator(evaluator: Evaluator) -> Evaluator:
+    EVALUATORS[evaluator.name] = evaluator
+    return evaluator
+
+
+register_evaluator(
+    Evaluator("pierre-dellacherie", PIERRE_DELLACHERIE_FEATURES,
+              PIERRE_DELLACHERIE))
+register_evaluator(
+    Evaluator("el-tetris", PIERRE_DELLACHERIE_FEATURES, EL_TETRIS))
+# https://codemyroad.wordpress.com/2013/04/14/tetris-ai-the-near-perfect-player/
+register_evaluator(
+    Evaluator("yiyuan-lee", ("aggregate_height", "complete_lines",
+                             "board_buried_holes", "bumpiness"),
+              (-0.510066, 0.760666, -0.35663, -0.184483)))
+# El-Tetris 加上高度特征, 权重可用调参工具进一步优化
+register_evaluator(
+    Evaluator("el-tetris-heights",
+              PIERRE_DELLACHERIE_FEATURES + ("bumpiness", "max_height"),
+              EL_TETRIS + (-1., -1.)))
+
+CANDIDATE_DTYPE = np.dtype([
+    ("index", np.int64),
+    ("x", np.int64),
+    ("y", np.int64),
+    ("score", np.float64),
+    ("priority", np.int64),
+    ("landing_height", np.int64),
+    ("eroded_piece_cells_metric", np.int64),
+    ("board_row_transitions", np.int64),
+    ("board_column_transitions", np.int64),
+    ("board_buried_holes", np.int64),
+    ("board_wells", np.int64),
+])
+
+
+def _top_k(score: np.ndarray, priority: np.ndarray,
+           k: Optional[int]) -> np.ndarray:
+    """Order of the k best candidates
+
+    Candidates are ranked by score descending, priority ascending and keep
+    the enumeration order when both tie. With ``k`` only the candidates
+    scoring at least the k-th best score are sorted.
+    """
+    if k is not None and k < len(score):
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        # 保留与第 k 名同分的候选, 交给优先级决定
+        kth = np.partition(score, len(score) - k)[len(score) - k]
+        selected = np.flatnonzero(score >= kth)
+        order = np.lexsort((priority[selected], -score[selected]))
+        return selected[order[:k]]
+    return np.lexsort((priority, -score))
+
+
+def _candidates(batch: Batch, evaluator: Evaluator, k: Optional[int],
+                dtype: np.dtype) -> np.ndarray:
+    if not len(batch):
+        return np.empty(0, dtype=dtype)
+    score = evaluator.score(batch)
+    priority = batch.priority
+
+    candidates = np.empty(len(batch), dtype=dtype)
+    candidates["index"] = batch.indexes
+    candidates["x"] = batch.xs
+    candidates["y"] = batch.ys
+    candidates["score"] = score
+    candidates["priority"] = priority
+    for feature in evaluator.features:
+        candidates[feature] = batch[feature]
+
+    # 分数降序, 优先级升序, 同分时保持枚举顺序
+    return candidates[_top_k(score, priority, k)]
+
+
+def evaluate(matrix: np.ndarray,
+             current: List[np.ndarray],
+             evaluators: Sequence[Union[str, Evaluator]] = ("el-tetris",),
+             k: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Rank the placements of a tetris with several evaluators
+
+    The placements are stacked once and every feature is computed once,
+    however many evaluators use it.
+
+    Args:
+        matrix (np.ndarray): Matrix of the game
+        current (np.ndarray): Shapes of the current tetris
+        evaluators (Sequence[Union[str, Evaluator]], optional): Evaluators
+            or names in EVALUATORS. Anything with ``name``, ``features``
+            and ``score(batch)`` works. Defaults to El-Tetris.
+        k (Optional[int], optional): Number of best candidates to return.
+            Defaults to all of them.
+
+    Returns:
+        Dict[str, np.ndarray]: Candidates of each evaluator, best first,
+            with index, x, y, score, priority and the features as fields
+    """
+    batch = Batch(matrix, current)
+    results = {}
+    for evaluator in evaluators:
+        if isinstance(evaluator, str):
+            evaluator = EVALUATORS[evaluator]
+        # 多维特征 (如各列高度) 存为子数组
+        dtype = np.dtype(CANDIDATE_DTYPE.descr[:5] +
+                         [(feature, np.float64, batch[feature].shape[1:])
+                          for feature in evaluator.features])
+        results[evaluator.name] = _candidates(batch, evaluator, k, dtype)
+    return results
+
+
+def pierre_dellacherie_candidates(
+        matrix: np.ndarray,
+        current: List[np.ndarray],
+        k: Optional[int] = None,
+        weights: Weights = EL_TETRIS) -> np.ndarray:
     """Pierre Dellacherie algorithm for tetris
     
     Improve:
         El-Tetris
         https://imake.ninja/el-tetris-an-improvement-on-pierre-dellacheries-algorithm/
 
+    All placements are evaluated together on a stack of candidate boards.
+
+    Args:
+        matrix (np.ndarray): Matrix of the game
+        current (np.ndarray): Shapes of the current tetris
+        k (Optional[int], optional): Number of best candidates to return.
+            Defaults to all of them.
+        weights (Weights, optional): Feature weights. Defaults to EL_TETRIS.
+
+    Returns:
+        np.ndarray: Candidates of ``CANDIDATE_DTYPE``, best first
+    """
+    return _candidates(
+        Batch(matrix, current),
+        Evaluator("pierre-dellacherie", PIERRE_DELLACHERIE_FEATURES,
+                  tuple(weights)), k, CANDIDATE_DTYPE)
+
+
+def pierre_dellacherie(matrix: np.ndarray,
+                       current: List[np.ndarray],
+                       k: Optional[int] = None,
+                       weights: Weights = EL_TETRIS) -> List[Result]:
+    """Pierre Dellacherie algorithm for tetris, as a list of results
+
+    See ``pierre_dellacherie_candidates``.
+
     Args:
         matrix (np.ndarray): Matrix of the game
         current (np.ndarray): Shapes of the current tetris
+        k (Optional[int], optional): Number of best results to return.
+            Defaults to all of them.
+        weights (Weights, optional): Feature weights. Defaults to EL_TETRIS.
+    """
+    candidates = pierre_dellacherie_candidates(matrix, current, k, weights)
+    if logging.root.isEnabledFor(logging.DEBUG):
+        for candidate in candidates:
+            logging.debug(
+                "\n".join(f"[.] {name}: {candidate[name]}"
+                          for name in CANDIDATE_DTYPE.names[5:]) +
+                f"\n[i] x: {candidate['x']}, y: {candidate['y']}, "
+                f"index: {candidate['index']}"
+                f"\n[i] score: {candidate['score']}, "
+                f"priority: {candidate['priority']}")
+    return results_of(candidates)
+
+
+def results_of(candidates: np.ndarray) -> List[Result]:
+    """Convert a candidate array to a list of results"""
+    return [
+        Result(index, x, y, score, priority)
+        for index, x, y, score, priority in zip(
+            candidates["index"].tolist(), candidates["x"].tolist(),
+            candidates["y"].tolist(), candidates["score"].tolist(),
+            candidates["priority"].tolist())
+    ]
+
+
+def placement_result(stats: BoardStats,
+                     shape: Shape,
+                     index: int,
+                     x: int,
+                     y: int,
+                     weights: Weights = EL_TETRIS) -> Result:
+    """Pierre Dellacherie score of one placement from board statistics"""
+    landing_height = 20 - y - shape.first_row
+    (eroded_piece_cells_metric, board_row_transitions,
+     board_column_transitions, board_buried_holes,
+     board_wells) = stats.delta(shape, x, y)
+    score = (weights[0] * landing_height +
+             weights[1] * eroded_piece_cells_metric +
+             weights[2] * board_row_transitions +
+             weights[3] * board_column_transitions +
+             weights[4] * board_buried_holes + weights[5] * board_wells)
+    return Result(index, x, y, score, placement_priority(shape, index, x))
+
+
+def incremental_pierre_dellacherie(
+        stats: BoardStats,
+        current: List[np.ndarray],
+        weights: Weights = EL_TETRIS) -> List[Result]:
+    """Pierre Dellacherie algorithm scored from board statistics
+
+    Same ranking as ``pierre_dellacherie``, but each placement only touches
+    the rows and columns of the piece instead of a full board.
+
+    Args:
+        stats (BoardStats): Statistics of the game board
+        current (np.ndarray): Shapes of the current tetris
+        weights (Weights, optional): Feature weights. Defaults to EL_TETRIS.
     """
     results = []
-    for index, shape in enumerate(current):
+    for index, shape in enumerate(shapes_of(current)):
         for x in range(-1, 9):
-            y = 0
-            height, width = shape.shape
-            new_matrix = matrix.copy()
-            new_matrix[y + 2:y + height + 2, x + 3:x + width + 3] += shape
-            while not _check_collision(new_matrix):
-                y += 1
-                new_matrix = matrix.copy()
-                new_matrix[y + 2:y + height + 2, x + 3:x + width + 3] += shape
-            y -= 1
-            new_matrix = matrix.copy()
-            new_matrix[y + 2:y + height + 2, x + 3:x + width + 3] += shape
-
-            # 找到一个可摆放位置
-            if y >= 0:
-                # 计算评估参数
-                # 方块海拔
-                landing_height = _landing_height(shape, y)
-                # 消除行数
-                eroded_piece_cells_metric = _eroded_piece_cells_metric(
-                    new_matrix, shape, y)
-                # 行变换
-                board_row_transitions = _board_row_transitions(new_matrix)
-                # 列变换
-                board_column_transitions = _board_column_transitions(new_matrix)
-                # 空洞数
-                board_buried_holes = _board_buried_holes(new_matrix)
-                # 井深度
-                board_wells = _board_wells(new_matrix)
-
-                # 评估分数
-                # Origin PD
-                # score = (-landing_height + eroded_piece_cells_metric -
-                #          board_row_transitions - board_column_transitions -
-                #          4 * board_buried_holes - board_wells)
-                # El-Tetris
-                score = (-4.500158825082766 * landing_height +
-                         3.4181268101392694 * eroded_piece_cells_metric -
-                         3.2178882868487753 * board_row_transitions -
-                         9.348695305445199 * board_column_transitions -
-                         7.899265427351652 * board_buried_holes -
-                         3.3855972247263626 * board_wells)
-                # 计算优先级
-                priority = 100 * abs((10 - width) // 2 - x) + index
-
-                results.append(Result(index, x, y, score, priority))
-                logging.debug(
-                    f"\n[.] landing_height: {landing_height}"
-                    f"\n[.] eroded_piece_cells_metric: {eroded_piece_cells_metric}"
-                    f"\n[.] board_row_transitions: {board_row_transitions}"
-                    f"\n[.] board_column_transitions: {board_column_transitions}"
-                    f"\n[.] board_buried_holes: {board_buried_holes}"
-                    f"\n[.] board_wells: {board_wells}")
-                logging.debug(f"\n[i] x: {x}, y: {y}, index: {index}"
-                              f"\n[i] score: {score},  priority: {priority}")
+            y = stats.drop_position(shape, x)
+            if y < 0:
+                continue
+            results.append(placement_result(stats, shape, index, x, y,
+                                            weights))
     return sorted(results, key=lambda x: (x.score, -x.priority), reverse=True)
 
 
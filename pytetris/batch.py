@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 21:12:47
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 21:12:47
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import json
+import time
+import itertools
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import IO, Dict, Iterator, Optional
+
+from .engine import GameState
+from .simulate import MAX_PIECES, autoplay
+from .search import Searcher, searcher_of
+
+METRICS = ("pieces", "lines", "score", "level")
+
+# 小于该值的数值精确计数, 更大的按 2 的幂分桶
+EXACT = 16
+
+# 每个进程构建一次的搜索
+_searcher = None
+
+
+def bucket_of(value: int) -> int:
+    """Histogram bucket of a value, the lower bound of its bucket"""
+    return value if value < EXACT else 1 << (value.bit_length() - 1)
+
+
+class RunningStats(object):
+    """Online mean, variance and histogram of a metric
+
+    Mean and variance are updated with Welford's algorithm. The histogram
+    counts small values exactly and larger ones in power-of-two buckets,
+    so its size is bounded however many values are added.
+
+    Attributes:
+        count (int): Number of values
+        mean (float): Mean of the values
+        m2 (float): Sum of squared differences from the mean
+        min (float): Smallest value
+        max (float): Largest value
+        histogram (Optional[Dict[int, int]]): Count of each bucket, None
+            to skip the histogram
+    """
+
+    def __init__(self, histogram: bool = True):
+        self.count = 0
+        self.mean = 0.
+        self.m2 = 0.
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.histogram: Optional[Dict[int, int]] = {} if histogram else None
+
+    @property
+    def variance(self) -> float:
+        """Sample variance, 0 below two values"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if self.histogram is not None:
+            bucket = bucket_of(int(value))
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def to_dict(self) -> Dict:
+        data = {
+            "mean": self.mean,
+            "variance": self.variance,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+        if self.histogram is not None:
+            data["histogram"] = {
+                str(bucket): self.histogram[bucket]
+                for bucket in sorted(self.histogram)
+            }
+        return data
+
+
+class Aggregate(object):
+    """Streaming statistics of game results
+
+    Attributes:
+        stats (Dict[str, RunningStats]): Statistics of each metric and of
+            the time per game
+        start (float): Clock at the creation
+    """
+
+    def __init__(self):
+        self.stats = {metric: RunningStats() for metric in METRICS}
+        self.stats["time"] = RunningStats(histogram=False)
+        self.start = time.perf_counter()
+
+    @property
+    def games(self) -> int:
+        return self.stats["time"].count
+
+    def add(self, result: Dict):
+        for name, stats in self.stats.items():
+            stats.add(result[name])
+
+    def to_dict(self) -> Dict:
+        elapsed = time.perf_counter() - self.start
+        pieces = self.stats["pieces"].mean * self.games
+        data = {"games": self.games, "elapsed": elapsed}
+        data.update(
+            {name: stats.to_dict() for name, stats in self.stats.items()})
+        data["pieces_per_second"] = pieces / elapsed if elapsed else 0.
+        return data
+
+
+def play_game(searcher: Searcher,
+              seed: int,
+              max_pieces: Optional[int] = MAX_PIECES,
+              start_line: int = 0) -> Dict:
+    """Play a headless game with the rules of the game
+
+    Like ``simulate.play``, with the level reached, whether the game is
+    over and the time as well.
+
+    Args:
+        searcher (Searcher): AI playing the game
+        seed (int): Seed of the tetrises and the start lines
+        max_pieces (Optional[int], optional): Stop after this many
+            tetrises, None plays until game over. Defaults to MAX_PIECES.
+        start_line (int, optional): Number of random start lines. Defaults
+            to 0.
+
+    Returns:
+        Dict: ``seed``, ``pieces``, ``lines``, ``score``, ``level``,
+            ``game_over`` and ``time`` in seconds
+    """
+    start = time.perf_counter()
+    state = GameState(seed)
+    state.new_game(start_line=start_line)
+    autoplay(searcher, state, max_pieces)
+    return {
+        "seed": seed,
+        "pieces": state.pieces,
+        "lines": state.lines,
+        "score": state.score,
+        "level": state.level,
+        "game_over": state.over,
+        "time": time.perf_counter() - start
+    }
+
+
+def _init(spec: str):
+    global _searcher
+    _searcher = searcher_of(spec)
+
+
+def _play(seed: int, max_pieces: Optional[int], start_line: int) -> Dict:
+    return play_game(_searcher, seed, max_pieces, start_line)
+
+
+def run(spec: str,
+        games: int,
+        seed: int = 0,
+        workers: Optional[int] = None,
+        max_pieces: Optional[int] = MAX_PIECES,
+        start_line: int = 0) -> Iterator[Dict]:
+    """Play games in a process pool and yield each result when it finishes
+
+    Game ``i`` is played on seed ``seed + i``. Only a few games per
+    process are submitted ahead, so memory does not grow with ``games``.
+    Results come in the order they finish.
+
+    Args:
+        spec (str): AI as ``<search>[:<weights>]``, see ``searcher_of``
+        games (int): Number of games
+        seed (int, optional): Seed of the first game. Defaults to 0.
+        workers (Optional[int], optional): Number of processes. Defaults
+            to the number of CPUs.
+        max_pieces (Optional[int], optional): Tetrises per game, None plays
+            until game over. Defaults to MAX_PIECES.
+        start_line (int, optional): Number of random start lines. Defaults
+            to 0.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = iter(range(seed, seed + games))
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init,
+                             initargs=(spec,)) as executor:
+        pending = {
+            executor.submit(_play, seed_, max_pieces, start_line)
+            for seed_ in itertools.islice(seeds, 4 * workers)
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                seed_ = next(seeds, None)
+                if seed_ is not None:
+                    pending.add(
+                        executor.submit(_play, seed_, max_pieces, start_line))
+                yield future.result()
+
+
+def simulate(output: IO[str],
+             spec: str,
+             games: int,
+             seed: int = 0,
+             workers: Optional[int] = None,
+             max_pieces: Optional[int] = MAX_PIECES,
+             start_line: int = 0,
+             every: int = 100) -> Aggregate:
+    """Stream game results and aggregate statistics as JSON lines
+
+    Every line has a ``type``: ``game`` lines are the results of
+    ``play_game``, ``stats`` lines are ``Aggregate.to_dict`` after every
+    ``every`` games, 0 for none, and after the last one.
+
+    Raises:
+        ValueError: ``every`` is negative
+
+    Returns:
+        Aggregate: Statistics of all games
+    """
+    if every < 0:
+        raise ValueError(f"every must not be negative, got {every}")
+    aggregate = Aggregate()
+
+    def write(type_: str, data: Dict):
+        output.write(json.dumps(dict(type=type_, **data)) + "\n")
+        output.flush()
+
+    for result in run(spec, games, seed, workers, max_pieces, start_line):
+        aggregate.add(result)
+        write("game", result)
+        if every and aggregate.games % every == 0:
+            write("stats", aggregate.to_dict())
+    if not every or aggregate.games % every or not aggregate.games:
+        write("stats", aggregate.to_dict())
+    return aggregate
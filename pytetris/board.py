@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 10:12:40
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 10:12:40
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import abc
+from typing import List, Optional
+
+import numpy as np
+
+from .tetris import Tetris
+
+# 25x16 棋盘: 上方 2 行隐藏, 下方 3 行与左右各 3 列为墙
+ROWS = 25
+COLUMNS = 16
+FULL_ROW = (1 << COLUMNS) - 1
+WALL_ROW = 0b111 | 0b111 << (COLUMNS - 3)
+FIELD_ROW = FULL_ROW ^ WALL_ROW
+
+
+class Board(abc.ABC):
+    """Base board with a column surface index
+
+    Attributes:
+        tops (List[int]): first filled row of each column (16)
+    """
+
+    tops: List[int]
+
+    @abc.abstractmethod
+    def check_collision(self, tetris: Tetris) -> bool:
+        """Whether the tetris overlaps the wall, the floor or a block"""
+
+    def drop_position(self, tetris: Tetris) -> int:
+        """Get the y where the tetris lands if dropped from where it is
+
+        Above the surface the landing row comes straight from the column
+        index and the bottom profile of the shape. A piece already tucked
+        under an overhang falls back to moving down row by row.
+
+        Args:
+            tetris (Tetris): Tetris to drop
+        """
+        x = tetris.x + 3
+        tops = self.tops
+        y = ROWS
+        for j, bottom in enumerate(tetris.shape.bottoms):
+            if bottom >= 0:
+                y = min(y, tops[x + j] - 3 - bottom)
+        if y >= tetris.y:
+            return y
+
+        original = tetris.y
+        while not self.check_collision(tetris):
+            tetris.y += 1
+        y = tetris.y - 1
+        tetris.y = original
+        return y
+
+
+class ArrayBoard(Board):
+    """Board stored as a numpy array
+
+    Attributes:
+        matrix (numpy.ndarray): matrix (25x16)
+        tops (List[int]): first filled row of each column (16)
+    """
+
+    def __init__(self):
+        self.matrix = np.zeros((ROWS, COLUMNS), dtype=np.int)
+        self.matrix[:, :3] = 1
+        self.matrix[:, -3:] = 1
+        self.matrix[-3:, :] = 1
+        self.update_tops()
+
+    def copy(self) -> "ArrayBoard":
+        board = ArrayBoard.__new__(ArrayBoard)
+        board.matrix = self.matrix.copy()
+        board.tops = self.tops.copy()
+        return board
+
+    def update_tops(self):
+        self.tops = np.argmax(self.matrix != 0, axis=0).tolist()
+
+    def check_collision(self, tetris: Tetris) -> bool:
+        x = tetris.x + 3
+        y = tetris.y + 2
+        return any(self.matrix[y + i, x + j] for i, j in tetris.shape.cells)
+
+    def add_tetris(self, tetris: Tetris):
+        x = tetris.x + 3
+        y = tetris.y + 2
+        tops = self.tops
+        for i, j in tetris.shape.cells:
+            self.matrix[y + i, x + j] += 1
+            tops[x + j] = min(tops[x + j], y + i)
+
+    def full_lines(self) -> np.ndarray:
+        return np.all(self.matrix, axis=1)
+
+    def clear_lines(self, lines: np.ndarray):
+        for index, line in enumerate(lines[2:-3]):
+            if line:
+                tmp = np.delete(self.matrix, index + 2, 0)
+                self.matrix = np.insert(tmp, 0, 1, axis=0)
+                self.matrix[0, 3:-3] = 0
+        self.update_tops()
+
+    def check_gameover(self) -> bool:
+        return np.any(self.matrix[:2, 3:-3] > 0)
+
+    def random_startline(self,
+                         start_line: int = 0,
+                         rng: Optional[np.random.RandomState] = None):
+        self.matrix[-3 - start_line:-3,
+                    3:-3] += (rng or np.random).randint(0, 2, (start_line, 10))
+        self.update_tops()
+
+    def fill_line(self, row: int, filled: bool = True):
+        self.matrix[row, 3:-3] = int(filled)
+        self.update_tops()
+
+
+class BitBoard(Board):
+    """Board stored as one integer bitmask per row
+
+    Column ``j`` of the 25x16 matrix is bit ``j`` of the row mask, so walls
+    and floor are part of every row and pieces collide with them for free.
+    Piece masks come from ``Shape.row_masks``.
+
+    Attributes:
+        rows (List[int]): row masks (25)
+        tops (List[int]): first filled row of each column (16)
+    """
+
+    def __init__(self):
+        self.rows = [WALL_ROW] * (ROWS - 3) + [FULL_ROW] * 3
+        self.update_tops()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        rows = np.array(self.rows, dtype=np.int)
+        return (rows[:, None] >> np.arange(COLUMNS)) & 1
+
+    def copy(self) -> "BitBoard":
+        board = BitBoard.__new__(BitBoard)
+        board.rows = self.rows.copy()
+        board.tops = self.tops.copy()
+        return board
+
+    def update_tops(self):
+        tops = [ROWS] * COLUMNS
+        remaining = FULL_ROW
+        for row, mask in enumerate(self.rows):
+            found = mask & remaining
+            if found:
+                remaining ^= found
+                while found:
+                    bit = found & -found
+                    tops[bit.bit_length() - 1] = row
+                    found ^= bit
+                if not remaining:
+                    break
+        self.tops = tops
+
+    def check_collision(self, tetris: Tetris) -> bool:
+        rows = self.rows
+        shift = tetris.x + 3
+        y = tetris.y + 2
+        for offset, mask in enumerate(tetris.shape.row_masks):
+            if mask:
+                row = y + offset
+                if row >= ROWS or (row >= 0 and rows[row] & (mask << shift)):
+                    return True
+        return False
+
+    def add_tetris(self, tetris: Tetris):
+        rows = self.rows
+        shift = tetris.x + 3
+        y = tetris.y + 2
+        for offset, mask in enumerate(tetris.shape.row_masks):
+            if mask:
+                rows[y + offset] |= mask << shift
+        tops = self.tops
+        for j, top in enumerate(tetris.shape.tops):
+            if top >= 0:
+                tops[tetris.x + 3 + j] = min(tops[tetris.x + 3 + j], y + top)
+
+    def full_lines(self) -> np.ndarray:
+        return np.array([row == FULL_ROW for row in self.rows])
+
+    def clear_lines(self, lines: np.ndarray):
+        kept = [
+            row for index, row in enumerate(self.rows[:-3])
+            if not (index >= 2 and lines[index])
+        ]
+        self.rows = [WALL_ROW] * (ROWS - 3 - len(kept)) + kept + self.rows[-3:]
+        self.update_tops()
+
+    def check_gameover(self) -> bool:
+        return bool((self.rows[0] | self.rows[1]) & FIELD_ROW)
+
+    def random_startline(self,
+                         start_line: int = 0,
+                         rng: Optional[np.random.RandomState] = None):
+        lines = (rng or np.random).randint(0, 2, (start_line, 10))
+        for offset, line in enumerate(lines):
+            row = ROWS - 3 - start_line + offset
+            self.rows[row] |= sum(1 << (j + 3) for j in range(10) if line[j])
+        self.update_tops()
+
+    def fill_line(self, row: int, filled: bool = True):
+        self.rows[row] = FULL_ROW if filled else WALL_ROW
+        self.update_tops()
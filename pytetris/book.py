@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 18:06:17
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 18:06:17
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Type, Tuple, Optional, Sequence
+
+import numpy as np
+
+from .board import BitBoard
+from .ai import Result, placement_priority
+from .features import BoardStats
+from .tetris import REGISTRY, TETRISES, Tetris
+
+if TYPE_CHECKING:
+    from .search import Searcher
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "book.npy")
+
+BOOK_DTYPE = np.dtype([
+    ("hash", np.uint64),
+    ("piece", np.uint8),
+    ("next", np.uint8),
+    # 袋中剩余方块, 第 i 位为 TETRISES[i]
+    ("bag", np.uint8),
+    ("index", np.int8),
+    ("x", np.int8),
+    ("y", np.int8),
+    ("score", np.float32),
+])
+
+# 每个进程构建一次的搜索
+_searcher = None
+
+
+def bag_mask(bag: Sequence[Type[Tetris]]) -> int:
+    """Bitmask of the bag, an empty bag refills to all seven"""
+    mask = sum(1 << TETRISES.index(tetris) for tetris in set(bag))
+    return mask or (1 << len(TETRISES)) - 1
+
+
+class OpeningBook(object):
+    """Best moves of opening positions read from a memory-mapped file
+
+    Entries are keyed by the Zobrist hash of the board, the current and
+    the next tetris and the bag, and sorted by key, so a lookup is a
+    binary search touching a few pages of the file.
+
+    Attributes:
+        path (str): Path of the ``.npy`` file
+        entries (np.ndarray): Entries of ``BOOK_DTYPE``
+    """
+
+    def __init__(self, path: str = BOOK_FILE):
+        self.path = path
+        self.entries = np.load(path, mmap_mode="r")
+        self._hashes = self.entries["hash"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getstate__(self) -> dict:
+        # 只传递路径, 在子进程中重新映射文件
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state["path"])
+
+    def lookup(self, stats: BoardStats, current: Type[Tetris],
+               next_: Type[Tetris],
+               bag: Sequence[Type[Tetris]]) -> Optional[Result]:
+        """Best move of a position, None if the book does not have it"""
+        key = np.uint64(stats.hash)
+        start = int(np.searchsorted(self._hashes, key, "left"))
+        stop = int(np.searchsorted(self._hashes, key, "right"))
+        position = (TETRISES.index(current), TETRISES.index(next_),
+                    bag_mask(bag))
+        for entry in self.entries[start:stop]:
+            if (entry["piece"], entry["next"], entry["bag"]) == position:
+                index, x = int(entry["index"]), int(entry["x"])
+                return Result(
+                    index, x, int(entry["y"]), float(entry["score"]),
+                    placement_priority(current.shapes[index], index, x))
+        return None
+
+
+def save_book(entries: List[Tuple], path: str = BOOK_FILE):
+    """Sort the entries by key and write them atomically"""
+    entries = np.array(entries, dtype=BOOK_DTYPE)
+    entries = entries[np.lexsort(
+        (entries["bag"], entries["next"], entries["piece"], entries["hash"]))]
+    tmp = f"{path}.tmp.npy"
+    np.save(tmp, entries)
+    os.replace(tmp, path)
+
+
+def _init(searcher: "Searcher"):
+    global _searcher
+    _searcher = searcher
+
+
+def _search(rows: Tuple[int, ...], current: str, next_: str,
+            bag: Tuple[str, ...]) -> Optional[Result]:
+    choices = _searcher.decide(BoardStats(list(rows)), [
+        REGISTRY[current].matrixs, REGISTRY[next_].matrixs
+    ], [REGISTRY[name] for name in bag])
+    return choices[0] if choices else None
+
+
+def _openings(roots: Sequence[BoardStats]):
+    """Positions at the first tetris, dealt from a full bag"""
+    for stats in roots:
+        for current in TETRISES:
+            for next_ in TETRISES:
+                if next_ is current:
+                    continue
+                bag = tuple(tetris.name
+                            for tetris in TETRISES
+                            if tetris not in (current, next_))
+                yield tuple(stats.rows), current.name, next_.name, bag
+
+
+def build_book(searcher: "Searcher",
+               plies: int = 4,
+               roots: Optional[Sequence[BoardStats]] = None,
+               path: str = BOOK_FILE,
+               workers: Optional[int] = None) -> int:
+    """Search the openings offline and save the best moves
+
+    Starting from every pair of first tetrises on each root board, the
+    book follows its own best move and every tetris the 7-bag can deal
+    next, for ``plies`` tetrises. Positions reached in several ways are
+    searched once. Searches run in a process pool, level by level.
+
+    Args:
+        searcher (Searcher): Deep search deciding the moves
+        plies (int, optional): Tetrises per opening. Defaults to 4.
+        roots (Optional[Sequence[BoardStats]], optional): Start boards.
+            Defaults to the empty board.
+        path (str, optional): Book file. Defaults to BOOK_FILE.
+        workers (Optional[int], optional): Number of processes
+
+    Returns:
+        int: Number of entries
+    """
+    if roots is None:
+        roots = [BoardStats(BitBoard().rows)]
+    level = list(dict.fromkeys(_openings(roots)))
+    entries: Dict[Tuple, Tuple] = {}
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init,
+                             initargs=(searcher,)) as executor:
+        for ply in range(plies):
+            if not level:
+                break
+            results = list(
+                executor.map(_search, *zip(*level),
+                             chunksize=max(1, len(level) // 64)))
+            children = {}
+            for (rows, current, next_, bag), best in zip(level, results):
+                if best is None:
+                    continue
+                stats = BoardStats(list(rows))
+                key = (stats.hash, TETRISES.index(REGISTRY[current]),
+                       TETRISES.index(REGISTRY[next_]),
+                       bag_mask([REGISTRY[name] for name in bag]))
+                entries[key] = key + (best.index, best.x, best.y, best.score)
+
+                stats.place(REGISTRY[current].shapes[best.index], best.x,
+                            best.y)
+                if stats.check_gameover():
+                    continue
+                # 下一个方块为袋中任意一个, 袋空时重新装满
+                for name in bag:
+                    left = tuple(piece for piece in bag if piece != name)
+                    left = left or tuple(tetris.name for tetris in TETRISES)
+                    children[(tuple(stats.rows), next_, name, left)] = None
+            logging.info(f"[OpeningBook] ply {ply + 1}: {len(level)} "
+                         f"positions, {len(entries)} entries")
+            level = list(children)
+    save_book(list(entries.values()), path)
+    return len(entries)
+
+
+if __name__ == "__main__":
+    from .search import Expectimax
+    from .weights import load_weights
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Build an opening book")
+    parser.add_argument("--plies", type=int, default=4)
+    parser.add_argument("--depth",
+                        type=int,
+                        default=2,
+                        help="depth of the expectimax search")
+    parser.add_argument("--weights", default="el-tetris")
+    parser.add_argument("--path", default=BOOK_FILE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(
+        build_book(
+            Expectimax(depth=args.depth, weights=load_weights(args.weights)),
+            args.plies,
+            path=args.path,
+            workers=args.workers))
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 14:10:37
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 14:10:37
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Hashable
+
+from .tetris import TETRISES
+
+
+class LRUCache(object):
+    """Bounded mapping dropping the least recently used entry
+
+    Attributes:
+        size (int): Max number of entries
+        data (OrderedDict): Entries, least recently used first
+        hits (int): Cache hits
+        misses (int): Cache misses
+    """
+
+    def __init__(self, size: int = 100000):
+        self.size = size
+        self.data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.size:
+            self.data.popitem(last=False)
+
+    def clear(self):
+        self.data.clear()
+
+
+def _normalized(cells) -> frozenset:
+    top = min(i for i, _ in cells)
+    left = min(j for _, j in cells)
+    return frozenset((i - top, j - left) for i, j in cells)
+
+
+def _build_mirrors() -> Dict[str, Tuple[str, Tuple[Tuple[int, int, int],
+                                                    ...]]]:
+    """Map every tetris to its mirror image
+
+    A placement ``(index, x, y)`` of a tetris mirrors to ``(index_, dx - x,
+    y + dy)`` of the mirrored tetris, where ``(index_, dx, dy)`` is the
+    entry of ``index``. I, T and O are their own mirror, L and J, S and Z
+    are each other's.
+    """
+    mirrors = {}
+    for tetris in TETRISES:
+        for other in (tetris, ) + TETRISES:
+            entries = []
+            for shape in tetris.shapes:
+                mirrored = _normalized([(i, -j) for i, j in shape.cells])
+                for index, candidate in enumerate(other.shapes):
+                    if _normalized(candidate.cells) != mirrored:
+                        continue
+                    # 镜像后左端列为 12 - x - 右端列, 行不变
+                    dx = (9 - max(j for _, j in shape.cells) -
+                          min(j for _, j in candidate.cells))
+                    dy = (min(i for i, _ in shape.cells) -
+                          min(i for i, _ in candidate.cells))
+                    entries.append((index, dx, dy))
+                    break
+            if len(entries) == len(tetris.shapes):
+                mirrors[tetris.name] = (other.name, tuple(entries))
+                break
+    return mirrors
+
+
+MIRRORS = _build_mirrors()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 17:35:12
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 17:35:12
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import json
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Callable, Optional
+
+import numpy as np
+
+from .engine import GameState
+from .simulate import MAX_PIECES
+from .features import BoardStats
+from .tetris import REGISTRY, TETRISES
+from .ai import PIERRE_DELLACHERIE_FEATURES, pierre_dellacherie_candidates
+
+# 单个方块最多的落点数
+MAX_CANDIDATES = max(
+    sum(len(shape.xs) for shape in tetris.shapes) for tetris in TETRISES)
+
+RECORD_DTYPE = np.dtype([
+    # 第 0 ~ 21 行的 10 个场地格, 第 j 位为第 j 列
+    ("board", np.uint16, (22,)),
+    ("piece", np.uint8),
+    ("next", np.uint8),
+    ("count", np.uint8),
+    # 按分数降序排列的落点 (index, x, y) 及其特征
+    ("moves", np.int8, (MAX_CANDIDATES, 3)),
+    ("features", np.int16, (MAX_CANDIDATES, 6)),
+    ("scores", np.float32, (MAX_CANDIDATES,)),
+    ("chosen", np.uint8),
+    ("cleared", np.uint8),
+    ("lines_to_go", np.int32),
+    ("pieces_to_go", np.int32),
+    ("game_over", np.bool_),
+    ("game", np.int32),
+    ("ply", np.int32),
+])
+
+MANIFEST = "manifest.json"
+
+# 对局中每隔多少条记录保存一次进度
+CHECKPOINT = 1000
+
+
+def pack_board(rows: List[int]) -> np.ndarray:
+    """Field cells of bitboard rows, one ``uint16`` per row"""
+    return np.array([row >> 3 & 0x3FF for row in rows[:22]], dtype=np.uint16)
+
+
+def unpack_boards(boards: np.ndarray) -> np.ndarray:
+    """Unpack ``board`` fields to cells, ``(..., 22)`` to ``(..., 22, 10)``"""
+    return (boards[..., None] >> np.arange(10, dtype=np.uint16)) & 1 != 0
+
+
+def _shard_path(path: str, shard: int, suffix: str) -> str:
+    return os.path.join(path, f"shard-{shard:05d}.{suffix}")
+
+
+def _write_json(path: str, data: dict):
+    # 先写临时文件再替换, 中断时保留上一版本
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _random_state(state: GameState) -> list:
+    version, internal, gauss = state.random.getstate()
+    return [version, list(internal), gauss]
+
+
+def _resume(state: GameState, resume: Dict):
+    """Restore a game state saved by a checkpoint"""
+    version, internal, gauss = resume["random"]
+    state.random.setstate((version, tuple(internal), gauss))
+    state.bag = [
+        REGISTRY[name](*REGISTRY[name].spawn) for name in resume["bag"]
+    ]
+    state.board.rows = list(resume["rows"])
+    state.board.update_tops()
+    state.stats = BoardStats(list(resume["rows"]))
+    current, next_ = REGISTRY[resume["current"]], REGISTRY[resume["next"]]
+    state.current, state.next = current(*current.spawn), next_(*next_.spawn)
+    state.pieces = resume["ply"]
+
+
+def _play(data: np.ndarray,
+          start: int,
+          seed: str,
+          game: int,
+          max_pieces: int,
+          explore: float,
+          checkpoint: Callable[[Dict], None],
+          resume: Optional[Dict] = None) -> int:
+    """Play one self-play game straight into the shard
+
+    The game runs on ``GameState``, so it ends like in the game. Records
+    are written to ``data[start:]`` as the game goes, the outcomes are
+    filled in at the end. Every ``CHECKPOINT`` records the shard is
+    flushed and ``checkpoint`` gets the state of the game, which can be
+    passed back as ``resume`` to continue the same game.
+
+    Returns:
+        int: Number of records of the game
+    """
+    state = GameState(seed)
+    if resume is not None:
+        _resume(state, resume)
+    ply = state.pieces
+
+    game_over = True
+    while ply < max_pieces:
+        candidates = pierre_dellacherie_candidates(state.stats.matrix,
+                                                   state.current.matrixs)
+        if not len(candidates):
+            break
+        record = np.zeros((), dtype=RECORD_DTYPE)
+        record["board"] = pack_board(state.board.rows)
+        record["piece"] = TETRISES.index(type(state.current))
+        record["next"] = TETRISES.index(type(state.next))
+        record["count"] = len(candidates)
+        record["moves"][:len(candidates)] = np.stack(
+            [candidates["index"], candidates["x"], candidates["y"]], axis=1)
+        record["features"][:len(candidates)] = np.stack(
+            [candidates[name] for name in PIERRE_DELLACHERIE_FEATURES],
+            axis=1)
+        record["scores"][:len(candidates)] = candidates["score"]
+        chosen = 0
+        if explore and state.random.random() < explore:
+            chosen = state.random.randint(0, len(candidates) - 1)
+        record["chosen"] = chosen
+        record["game"] = game
+        record["ply"] = ply
+
+        move = candidates[chosen]
+        record["cleared"] = state.place(int(move["index"]), int(move["x"]),
+                                        int(move["y"]))
+        data[start + ply] = record
+        ply += 1
+        if state.over:
+            break
+        if ply % CHECKPOINT == 0:
+            data.flush()
+            checkpoint({
+                "ply": ply,
+                "rows": state.board.rows,
+                "current": state.current.name,
+                "next": state.next.name,
+                "bag": [tetris.name for tetris in state.bag],
+                "random": _random_state(state)
+            })
+    else:
+        game_over = False
+
+    # 之后消除的行数与剩余方块数, 从终局倒推
+    records = data[start:start + ply]
+    records["lines_to_go"] = np.cumsum(records["cleared"][::-1])[::-1]
+    records["pieces_to_go"] = np.arange(ply, 0, -1)
+    records["game_over"] = game_over
+    return ply
+
+
+def _fill_shard(path: str, shard: int, size: int, seed: int,
+                max_pieces: Optional[int], explore: float) -> Tuple[int, int]:
+    """Play games into one shard until it is full
+
+    The shard is a preallocated ``.npy`` memory map, its progress sits in
+    a ``.json`` next to it. Progress is written after every game and
+    every ``CHECKPOINT`` records within a game, with the state to resume
+    the game from.
+
+    Returns:
+        Tuple[int, int]: Positions and games in the shard
+    """
+    npy = _shard_path(path, shard, "npy")
+    progress_path = _shard_path(path, shard, "json")
+    progress = {"positions": 0, "games": 0}
+    if os.path.exists(npy) and os.path.exists(progress_path):
+        with open(progress_path, "r", encoding="utf-8") as f:
+            progress = json.load(f)
+        data = np.lib.format.open_memmap(npy, mode="r+")
+    else:
+        data = np.lib.format.open_memmap(npy,
+                                         mode="w+",
+                                         dtype=RECORD_DTYPE,
+                                         shape=(size,))
+
+    def checkpoint(state: Dict):
+        _write_json(progress_path, dict(progress, current=state))
+
+    while progress["positions"] < size:
+        # 最后一局只下到分片填满为止
+        left = size - progress["positions"]
+        plies = _play(data, progress["positions"],
+                      f"{seed}:{shard}:{progress['games']}",
+                      progress["games"],
+                      left if max_pieces is None else min(max_pieces, left),
+                      explore, checkpoint, progress.pop("current", None))
+        data.flush()
+        progress["positions"] += plies
+        progress["games"] += 1
+        _write_json(progress_path, progress)
+    del data
+    return progress["positions"], progress["games"]
+
+
+def generate(path: str,
+             shards: int,
+             shard_size: int,
+             seed: int = 0,
+             max_pieces: Optional[int] = MAX_PIECES,
+             explore: float = 0.,
+             workers: Optional[int] = None) -> Dict:
+    """Generate a self-play dataset, resuming an existing one
+
+    Every shard is filled by one process with its own game seeds, so the
+    shards are disjoint and a dataset is reproducible from its manifest.
+    Records go straight to the memory-mapped shards, only the state of
+    the current game is held in memory.
+
+    Args:
+        path (str): Dataset directory
+        shards (int): Number of shards
+        shard_size (int): Positions per shard
+        seed (int, optional): Seed of the dataset. Defaults to 0.
+        max_pieces (Optional[int], optional): Tetrises per game, None plays
+            until game over. Defaults to MAX_PIECES.
+        explore (float, optional): Probability of playing a random
+            candidate instead of the best one. Defaults to 0.
+        workers (Optional[int], optional): Number of processes
+
+    Raises:
+        ValueError: The manifest exists with other parameters
+
+    Returns:
+        Dict: The manifest
+    """
+    os.makedirs(path, exist_ok=True)
+    params = {
+        "shard_size": shard_size,
+        "seed": seed,
+        "max_pieces": max_pieces,
+        "explore": explore,
+        "dtype": RECORD_DTYPE.descr
+    }
+    manifest_path = os.path.join(path, MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        saved = {key: manifest[key] for key in params}
+        if json.loads(json.dumps(params)) != saved:
+            raise ValueError(f"Dataset {path!r} has other parameters")
+    manifest = dict(params, shards=shards, positions=0, games=0)
+    _write_json(manifest_path, manifest)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_fill_shard, path, shard, shard_size, seed,
+                            max_pieces, explore) for shard in range(shards)
+        ]
+        for shard, future in enumerate(futures):
+            positions, games = future.result()
+            manifest["positions"] += positions
+            manifest["games"] += games
+            logging.info(f"[Dataset] shard {shard}: {positions} positions, "
+                         f"{games} games")
+    _write_json(manifest_path, manifest)
+    return manifest
+
+
+def load(path: str) -> List[np.ndarray]:
+    """Open the shards of a dataset as read-only memory maps"""
+    with open(os.path.join(path, MANIFEST), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return [
+        np.load(_shard_path(path, shard, "npy"), mmap_mode="r")
+        for shard in range(manifest["shards"])
+    ]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="Generate a self-play dataset")
+    parser.add_argument("path", help="dataset directory")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--shard-size", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-pieces",
+                        type=int,
+                        default=MAX_PIECES,
+                        help="0 plays until game over")
+    parser.add_argument("--explore", type=float, default=0.)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(
+        generate(args.path, args.shards, args.shard_size, args.seed,
+                 args.max_pieces or None, args.explore, args.workers))
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 15:48:03
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 15:48:03
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import json
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass, asdict
+from typing import Set, Dict, List, Tuple, Optional
+
+from .search import Greedy
+from .simulate import MAX_PIECES, GameResult, play
+from .weights import Weights, load_weights
+
+# worker 运行对局时发送心跳的间隔秒数
+HEARTBEAT = 5.
+
+# 超过该秒数没有任何消息的 worker 视为丢失
+TIMEOUT = 30.
+
+
+@dataclass
+class Job(object):
+    """Games of one weight vector over a seed range
+
+    Attributes:
+        id (int): Job id, results are grouped by it
+        weights (Weights): Feature weights
+        start (int): First seed
+        stop (int): Seed after the last one
+        max_pieces (Optional[int]): Tetrises per game, None until game over
+        name (str): Name of the weights
+    """
+
+    id: int
+    weights: Weights
+    start: int
+    stop: int
+    max_pieces: Optional[int] = MAX_PIECES
+    name: str = ""
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+
+
+class Coordinator(object):
+    """Hand out jobs to workers over TCP and collect the game results
+
+    The protocol is one JSON object per line. A worker sends ``ready``,
+    gets a ``job``, streams one ``result`` per game and sends ``finished``
+    when it wants the next job. While a game runs it sends a ``heartbeat``
+    every ``HEARTBEAT`` seconds. Workers get ``done`` once every game has a
+    result. When a worker disconnects or stays silent longer than
+    ``timeout``, the seeds of its job without a result are queued again.
+    Thanks to the heartbeats the timeout only has to exceed the heartbeat
+    interval, not the length of a game, so it works with any
+    ``max_pieces``.
+
+    Attributes:
+        jobs (List[Job]): Jobs to run
+        host (str): Host to listen on
+        port (int): Port to listen on, 0 picks a free one
+        timeout (Optional[float]): Seconds without a message, heartbeats
+            included, before a worker is considered lost. None waits
+            forever.
+        results (Dict[int, Dict[int, GameResult]]): Results by job and seed
+        handlers (Set[asyncio.Task]): Tasks of the connected workers
+    """
+
+    def __init__(self,
+                 jobs: List[Job],
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 timeout: Optional[float] = TIMEOUT):
+        self.jobs = jobs
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.results: Dict[int, Dict[int, GameResult]] = {
+            job.id: {} for job in jobs
+        }
+        self.remaining = sum(job.stop - job.start for job in jobs)
+        self.queue: Optional[asyncio.Queue] = None
+        self.finished: Optional[asyncio.Event] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.handlers: Set[asyncio.Task] = set()
+
+    async def start(self) -> int:
+        """Start listening
+
+        Returns:
+            int: The port listened on
+        """
+        self.queue = asyncio.Queue()
+        self.finished = asyncio.Event()
+        for job in self.jobs:
+            self.queue.put_nowait(job)
+        if not self.remaining:
+            self.finished.set()
+        self.server = await asyncio.start_server(self._handle, self.host,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def join(self) -> Dict[int, List[GameResult]]:
+        """Wait for every game, then stop listening
+
+        Connected workers get their ``done`` reply before it returns, so
+        no connection is left open.
+
+        Returns:
+            Dict[int, List[GameResult]]: Results of each job by seed
+        """
+        await self.finished.wait()
+        self.server.close()
+        # 等待每个 worker 收到 done 并断开
+        await asyncio.gather(*self.handlers)
+        await self.server.wait_closed()
+        return {
+            job: [results[seed] for seed in sorted(results)]
+            for job, results in self.results.items()
+        }
+
+    async def _next_job(self) -> Optional[Job]:
+        """Next job, None once every game has a result"""
+        getter = asyncio.ensure_future(self.queue.get())
+        waiter = asyncio.ensure_future(self.finished.wait())
+        await asyncio.wait((getter, waiter),
+                           return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        if getter.done():
+            return getter.result()
+        getter.cancel()
+        return None
+
+    def _record(self, message: dict):
+        results = self.results.get(message["job"])
+        if results is None or message["seed"] in results:
+            return
+        results[message["seed"]] = GameResult(message["seed"],
+                                              message["pieces"],
+                                              message["lines"],
+                                              message["score"])
+        self.remaining -= 1
+        if not self.remaining:
+            self.finished.set()
+
+    def _requeue(self, job: Job):
+        # 已收到的结果按种子连续, 只重新分配其余种子
+        results = self.results[job.id]
+        left = [seed for seed in range(job.start, job.stop)
+                if seed not in results]
+        if left:
+            logging.warning(f"[Coordinator] requeue job {job.id}: "
+                            f"{len(left)} games")
+            self.queue.put_nowait(
+                Job(job.id, job.weights, left[0], job.stop, job.max_pieces,
+                    job.name))
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        job: Optional[Job] = None
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(),
+                                              self.timeout)
+                if not line:
+                    break
+                message = json.loads(line)
+                # 心跳只用于重置超时
+                if message["type"] == "result":
+                    self._record(message)
+                elif message["type"] in ("ready", "finished"):
+                    if job is not None:
+                        self._requeue(job)
+                    job = await self._next_job()
+                    if job is None:
+                        await _send(writer, {"type": "done"})
+                        break
+                    await _send(writer, dict(asdict(job), type="job"))
+        except (asyncio.TimeoutError, ConnectionError, ValueError) as e:
+            logging.warning(f"[Coordinator] worker {peer} lost: {e!r}")
+        finally:
+            if job is not None:
+                self._requeue(job)
+            writer.close()
+            self.handlers.discard(task)
+
+
+async def _heartbeat(writer: asyncio.StreamWriter, interval: float):
+    while True:
+        await asyncio.sleep(interval)
+        # 不等待 drain, 避免与结果消息同时等待
+        writer.write(json.dumps({"type": "heartbeat"}).encode() + b"\n")
+
+
+async def work(host: str, port: int, heartbeat: float = HEARTBEAT) -> int:
+    """Run jobs of a coordinator until it is done
+
+    Games run with the greedy Pierre Dellacherie player on board
+    statistics, the same path as the weight tuner. They run in a thread,
+    so heartbeats keep going during long games.
+
+    Args:
+        host (str): Host of the coordinator
+        port (int): Port of the coordinator
+        heartbeat (float, optional): Seconds between heartbeats. Defaults
+            to HEARTBEAT.
+
+    Returns:
+        int: Number of games played
+    """
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection(host, port)
+    games = 0
+    try:
+        await _send(writer, {"type": "ready"})
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if message["type"] == "done":
+                break
+            searcher = Greedy(tuple(message["weights"]))
+            beat = asyncio.ensure_future(_heartbeat(writer, heartbeat))
+            try:
+                for seed in range(message["start"], message["stop"]):
+                    result = await loop.run_in_executor(
+                        None, play, searcher, seed, message["max_pieces"])
+                    await _send(
+                        writer,
+                        dict(asdict(result), type="result", job=message["id"]))
+                    games += 1
+            finally:
+                beat.cancel()
+            await _send(writer, {"type": "finished", "job": message["id"]})
+    finally:
+        writer.close()
+    return games
+
+
+def run_worker(host: str, port: int, heartbeat: float = HEARTBEAT) -> int:
+    return asyncio.run(work(host, port, heartbeat))
+
+
+def run_coordinator(jobs: List[Job],
+                    host: str = "127.0.0.1",
+                    port: int = 0,
+                    timeout: Optional[float] = TIMEOUT
+                   ) -> Dict[int, List[GameResult]]:
+
+    async def main():
+        coordinator = Coordinator(jobs, host, port, timeout)
+        port_ = await coordinator.start()
+        logging.info(f"[Coordinator] listening on {host}:{port_}")
+        return await coordinator.join()
+
+    return asyncio.run(main())
+
+
+def split_jobs(weights: List[Tuple[str, Weights]], seed: int, games: int,
+               size: int,
+               max_pieces: Optional[int] = MAX_PIECES) -> List[Job]:
+    """Split the games of every named weight vector into jobs of ``size``"""
+    jobs = []
+    for name, vector in weights:
+        for start in range(seed, seed + games, size):
+            jobs.append(
+                Job(len(jobs), vector, start, min(start + size, seed + games),
+                    max_pieces, name))
+    return jobs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="Distributed headless games over TCP")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+    coordinator_parser = subparsers.add_parser("coordinator")
+    coordinator_parser.add_argument("weights",
+                                    nargs="+",
+                                    help="names of the weights to play")
+    coordinator_parser.add_argument("--host", default="0.0.0.0")
+    coordinator_parser.add_argument("--port", type=int, default=7015)
+    coordinator_parser.add_argument("--games", type=int, default=100)
+    coordinator_parser.add_argument("--seed", type=int, default=0)
+    coordinator_parser.add_argument("--job-size", type=int, default=10)
+    coordinator_parser.add_argument("--max-pieces",
+                                    type=int,
+                                    default=MAX_PIECES,
+                                    help="0 plays until game over")
+    coordinator_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=TIMEOUT,
+        help="seconds without a message or heartbeat from a worker")
+    worker_parser = subparsers.add_parser("worker")
+    worker_parser.add_argument("--host", default="127.0.0.1")
+    worker_parser.add_argument("--port", type=int, default=7015)
+    args = parser.parse_args()
+
+    if args.mode == "worker":
+        run_worker(args.host, args.port)
+    else:
+        jobs = split_jobs([(name, load_weights(name)) for name in args.weights],
+                          args.seed, args.games, args.job_size,
+                          args.max_pieces or None)
+        results = run_coordinator(jobs, args.host, args.port, args.timeout)
+        for job in jobs:
+            for result in results[job.id]:
+                print(json.dumps(dict(asdict(result), weights=job.name)))
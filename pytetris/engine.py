@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 19:41:26
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 19:41:26
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import time
+import random
+from typing import Dict, List, Callable, Optional
+
+import numpy as np
+
+from .features import BoardStats
+from .tetris import Tetris, TETRISES
+from .board import ROWS, ArrayBoard, BitBoard
+
+# 消除行数对应的得分
+SCORES: Dict[int, int] = {0: 0, 1: 10, 2: 30, 3: 60, 4: 100}
+
+# 每秒的逻辑帧数, 所有计时都以逻辑帧计
+TICK_RATE = 30
+
+# 每个等级下落一格的逻辑帧数
+SPEEDS: Dict[int, int] = {1: 20, 2: 15, 3: 12, 4: 9, 5: 6, 6: 4}
+
+# 分数超过时升到下一级
+LEVEL_SCORES: Dict[int, int] = {1: 500, 2: 1000, 3: 1500, 4: 2000, 5: 2500}
+
+
+class GameState(object):
+    """Rules of a game without any rendering
+
+    The 7-bag, moves and rotations undone on collision, gravity counted in
+    logic frames, locking, line clears, scores and levels. Lines are only
+    marked on lock when ``defer_clear`` is set, so that a renderer can
+    animate them before calling ``clear``.
+
+    Attributes:
+        random (random.Random): Random generator of the bag
+        board (Union[ArrayBoard, BitBoard]): board backend
+        stats (BoardStats): feature statistics of the board
+        bag (List[Tetris]): 7bag
+        current (Tetris): current tetris
+        next (Tetris): next tetris
+        defer_clear (bool): Leave the full lines to ``clear``
+        clearing (bool): whether there are lines to clear
+        clear_lines (numpy.ndarray): array of lines whether to clear or not
+        drop_delay (int): Frames since the last gravity step
+        score (int): Game score
+        lines (int): Cleared lines
+        level (int): Level number
+        pieces (int): Locked tetrises
+        over (bool): Whether the game is over
+    """
+
+    def __init__(self,
+                 seed: Optional[int] = None,
+                 bitboard: bool = True,
+                 defer_clear: bool = False):
+        """
+        Args:
+            seed (Optional[int], optional): Seed of the bag. Defaults to
+                system randomness.
+            bitboard (bool, optional): Use the bitboard backend. Defaults
+                to True.
+            defer_clear (bool, optional): Leave the full lines to ``clear``.
+                Defaults to False.
+        """
+        self.random = random.Random(seed)
+        self.board = BitBoard() if bitboard else ArrayBoard()
+        self.stats = BoardStats.from_matrix(self.board.matrix)
+        self.defer_clear = defer_clear
+        self.bag = self.fill_bag()
+        self.current = self.deal()
+        self.next = self.deal()
+        self.clearing = False
+        self.clear_lines = np.zeros((ROWS,), dtype=bool)
+        self.new_game()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.board.matrix
+
+    @property
+    def speed(self) -> int:
+        """Frames per gravity step of the current level"""
+        return SPEEDS[self.level]
+
+    def new_game(self, level: int = 1, start_line: int = 0):
+        """Reset the counters and add random start lines"""
+        self.drop_delay = 0
+        self.score = 0
+        self.lines = 0
+        self.level = level
+        self.pieces = 0
+        self.over = False
+        if start_line:
+            self.random_startline(start_line)
+
+    def fill_bag(self) -> List[Tetris]:
+        """7bag"""
+        return [tetris(*tetris.spawn) for tetris in TETRISES]
+
+    def deal(self) -> Tetris:
+        tetris = self.bag.pop(self.random.randint(0, len(self.bag) - 1))
+        if not self.bag:
+            self.bag = self.fill_bag()
+        return tetris
+
+    def spawn(self):
+        """Make the next tetris current and deal a new next one"""
+        self.current = self.next
+        self.next = self.deal()
+
+    def random_startline(self, start_line: int = 0):
+        # 由种子决定, 与方块序列一样可复现
+        self.board.random_startline(
+            start_line, np.random.RandomState(self.random.getrandbits(32)))
+        self.stats = BoardStats.from_matrix(self.board.matrix)
+
+    def fill_line(self, row: int, filled: bool = True):
+        self.board.fill_line(row, filled)
+        self.stats = BoardStats.from_matrix(self.board.matrix)
+
+    def check_collision(self) -> bool:
+        return self.board.check_collision(self.current)
+
+    def drop_position(self) -> int:
+        """Get the y where the current tetris lands after a hard drop"""
+        return self.board.drop_position(self.current)
+
+    def check_gameover(self) -> bool:
+        return self.board.check_gameover()
+
+    def move(self, direction: bool = False) -> bool:
+        """Move the current tetris, undone on collision
+
+        Args:
+            direction (bool, optional): True to move right. Defaults to False.
+
+        Returns:
+            bool: Whether the tetris moved
+        """
+        self.current.move(direction)
+        if self.check_collision():
+            self.current.move(not direction)
+            return False
+        return True
+
+    def rotate(self, direction: bool = False) -> bool:
+        """Rotate the current tetris, undone on collision
+
+        Args:
+            direction (bool, optional): True to rotate counterclockwise.
+                Defaults to False.
+
+        Returns:
+            bool: Whether the tetris rotated
+        """
+        self.current.rotate(direction)
+        if self.check_collision():
+            self.current.rotate(not direction)
+            return False
+        return True
+
+    def gravity(self) -> bool:
+        """Count one logic frame, True when gravity moves the tetris"""
+        due = self.drop_delay % self.speed == 0
+        self.drop_delay = (self.drop_delay + 1) % self.speed
+        return due and not self.over
+
+    def soft_drop(self) -> Optional[int]:
+        """Move the current tetris one row down, lock it on collision
+
+        Returns:
+            Optional[int]: None if it moved, else the lines cleared by
+                locking it
+        """
+        self.current.y += 1
+        if self.check_collision():
+            self.current.y -= 1
+            return self.lock()
+        return None
+
+    def hard_drop(self) -> int:
+        """Drop and lock the current tetris
+
+        Returns:
+            int: Number of cleared lines
+        """
+        self.current.y = self.drop_position()
+        return self.lock()
+
+    def place(self, index: int, x: int, y: int) -> int:
+        """Lock the current tetris at a placement, e.g. an AI decision"""
+        self.current.index = index
+        self.current.x = x
+        self.current.y = y
+        return self.lock()
+
+    def lock(self) -> int:
+        """Add the current tetris to the board and score its lines
+
+        The next tetris spawns unless the game is over.
+
+        Returns:
+            int: Number of cleared lines
+        """
+        self.board.add_tetris(self.current)
+        self.stats.add_tetris(self.current.shape, self.current.x,
+                              self.current.y)
+        self.clear_lines = self.board.full_lines()
+        cleared = int(np.count_nonzero(self.clear_lines[2:-3]))
+        self.clearing = cleared > 0
+        self.pieces += 1
+        self.score += SCORES.get(cleared, 100)
+        self.lines += cleared
+        self.level = max(
+            self.level,
+            1 + sum(self.score > score for score in LEVEL_SCORES.values()))
+        if self.check_gameover():
+            self.over = True
+        else:
+            self.spawn()
+        if self.clearing and not self.defer_clear:
+            self.clear()
+        return cleared
+
+    def clear(self):
+        """Remove the lines marked by the last lock"""
+        self.clearing = False
+        self.board.clear_lines(self.clear_lines)
+        self.stats.clear_lines(self.clear_lines)
+
+
+class Timestep(object):
+    """Fixed logic ticks in a loop with a variable frame rate
+
+    ``advance`` adds the real time since its last call to the lag, then
+    ``due`` is True once per tick of ``1 / (rate * multiplier)`` seconds in
+    the lag. The lag is capped at ``max_lag``, so a machine too slow for
+    the ticks slows the game down instead of piling them up.
+
+    Attributes:
+        rate (int): Ticks per second at multiplier 1
+        max_lag (float): Most seconds of ticks to catch up
+        clock (Callable[[], float]): Clock in seconds
+        last (float): Clock at the last ``advance``
+        lag (float): Seconds not run as ticks yet
+    """
+
+    def __init__(self,
+                 rate: int = TICK_RATE,
+                 max_lag: float = 0.25,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.rate = rate
+        self.max_lag = max_lag
+        self.clock = clock
+        self.last = clock()
+        self.lag = 0.
+
+    def advance(self):
+        now = self.clock()
+        self.lag = min(self.lag + now - self.last, self.max_lag)
+        self.last = now
+
+    def due(self, multiplier: int = 1) -> bool:
+        """Take one tick from the lag if there is time for it
+
+        Args:
+            multiplier (int, optional): Turbo multiplier, ticks are this
+                many times shorter. Defaults to 1.
+        """
+        step = 1 / (self.rate * multiplier)
+        if self.lag < step:
+            return False
+        self.lag -= step
+        return True
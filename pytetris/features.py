@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 11:05:26
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 11:05:26
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import random
+from typing import List, Tuple
+
+import numpy as np
+
+from .tetris import Shape
+from .board import ROWS, COLUMNS, FULL_ROW, WALL_ROW, FIELD_ROW
+
+FIELD_COLUMNS = range(3, COLUMNS - 3)
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count("1")
+
+
+def _build_tables():
+    """Build the lookup tables of 10 bit patterns
+
+    A row pattern is the 10 field cells of a row, bit j is column j + 3. A
+    column pattern is 10 consecutive rows of a column, bit i is the i-th
+    row from the top.
+    """
+    row_transitions_ = []
+    transitions = []
+    holes = []
+    pops = []
+    wells_ = []
+    leads = []
+    trails = []
+    for pattern in range(1 << 10):
+        # 两侧墙视为已填充
+        row = 1 | pattern << 1 | 1 << 11
+        row_transitions_.append(_popcount((row ^ (row >> 1)) & 0x7FF))
+        transitions.append(_popcount((pattern ^ (pattern >> 1)) & 0x1FF))
+        pops.append(_popcount(pattern))
+        top = (pattern & -pattern).bit_length() - 1
+        holes.append(10 - top - pops[-1] if pattern else 0)
+
+        score = 0
+        runs = []
+        cells = pattern
+        while cells:
+            rest = (cells + (cells & -cells)) & cells
+            runs.append(_popcount(cells ^ rest))
+            score += runs[-1] * (runs[-1] + 1) // 2
+            cells = rest
+        wells_.append(score)
+        leads.append(runs[0] if pattern & 1 else 0)
+        trails.append(runs[-1] if pattern >> 9 & 1 else 0)
+    return (row_transitions_, transitions, holes, pops, wells_, leads,
+            trails)
+
+
+(ROW_TRANSITIONS, COLUMN_TRANSITIONS, HOLES, POPCOUNT, WELLS, WELL_LEADS,
+ WELL_TRAILS) = _build_tables()
+
+
+def _build_zobrist():
+    """Build the Zobrist keys of the cells above the floor
+
+    Walls and floor never change and get no key. The mirrored table gives
+    every cell the key of the cell mirrored left to right, so the mirror
+    hash of a board is the hash of its mirror image.
+    """
+    # 固定种子, 各进程中同一棋盘的哈希相同
+    rng = random.Random(0x7E7215)
+    keys = [[rng.getrandbits(64) if j in FIELD_COLUMNS else 0
+             for j in range(COLUMNS)]
+            for _ in range(ROWS - 3)]
+    mirrored = [row[::-1] for row in keys]
+    return keys, mirrored
+
+
+ZOBRIST, MIRROR_ZOBRIST = _build_zobrist()
+
+
+def row_transitions(row: int) -> int:
+    return ROW_TRANSITIONS[row >> 3 & 0x3FF]
+
+
+def column_transitions(column: int) -> int:
+    # 可见区分为第 2 ~ 11 行与第 12 ~ 21 行两段, 另计三处分段边界
+    return (COLUMN_TRANSITIONS[column >> 2 & 0x3FF] +
+            COLUMN_TRANSITIONS[column >> 12 & 0x3FF] +
+            ((column >> 1 ^ column >> 2) & 1) +
+            ((column >> 11 ^ column >> 12) & 1) +
+            ((column >> 21 ^ column >> 22) & 1))
+
+
+def buried_holes(column: int) -> int:
+    upper = column >> 2 & 0x3FF
+    lower = column >> 12 & 0x3FF
+    if column & 0b11:
+        hidden = 1 if column & 0b11 == 0b01 else 0
+        return hidden + 20 - POPCOUNT[upper] - POPCOUNT[lower]
+    elif upper:
+        return HOLES[upper] + 10 - POPCOUNT[lower]
+    return HOLES[lower]
+
+
+def wells(left: int, column: int, right: int) -> int:
+    cells = left & right & ~column
+    upper = cells >> 2 & 0x3FF
+    lower = cells >> 12 & 0x3FF
+    # 跨段的井深 a + b 计 T(a + b) = T(a) + T(b) + a * b
+    return (WELLS[upper] + WELLS[lower] +
+            WELL_TRAILS[upper] * WELL_LEADS[lower])
+
+
+class BoardStats(object):
+    """Per row and per column feature contributions of a board
+
+    Features are the board ones of the Pierre Dellacherie algorithm. A
+    placement only changes the rows and columns the piece touches (plus
+    the neighbours of those columns for wells), so a candidate can be
+    scored without walking the whole board.
+
+    Attributes:
+        rows (List[int]): row masks (25), column j is bit j
+        columns (List[int]): column masks (16), row i is bit i
+        row_transitions (List[int]): row transitions of each row
+        column_transitions (List[int]): column transitions of each column
+        buried_holes (List[int]): buried holes of each column
+        wells (List[int]): wells of each column
+        full (int): number of full rows in the visible area
+        hash (int): Zobrist hash of the board
+        mirror_hash (int): Zobrist hash of the board mirrored left to right
+    """
+
+    def __init__(self, rows: List[int]):
+        self.rebuild(rows)
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "BoardStats":
+        return cls([
+            sum(1 << j for j in range(COLUMNS) if line[j]) for line in matrix
+        ])
+
+    def rebuild(self, rows: List[int]):
+        self.rows = list(rows)
+        self.columns = [
+            sum(1 << i for i in range(ROWS) if self.rows[i] >> j & 1)
+            for j in range(COLUMNS)
+        ]
+        self.row_transitions = [row_transitions(row) for row in self.rows]
+        self.column_transitions = [0] * COLUMNS
+        self.buried_holes = [0] * COLUMNS
+        self.wells = [0] * COLUMNS
+        for j in FIELD_COLUMNS:
+            self._update_column(j)
+        self.full = sum(row == FULL_ROW for row in self.rows[2:-3])
+        self.hash = 0
+        self.mirror_hash = 0
+        for i, row in enumerate(self.rows[:-3]):
+            cells = row & FIELD_ROW
+            while cells:
+                j = (cells & -cells).bit_length() - 1
+                self.hash ^= ZOBRIST[i][j]
+                self.mirror_hash ^= MIRROR_ZOBRIST[i][j]
+                cells &= cells - 1
+
+    @property
+    def matrix(self) -> np.ndarray:
+        rows = np.array(self.rows, dtype=np.int)
+        return (rows[:, None] >> np.arange(COLUMNS)) & 1
+
+    def copy(self) -> "BoardStats":
+        stats = BoardStats.__new__(BoardStats)
+        stats.rows = self.rows.copy()
+        stats.columns = self.columns.copy()
+        stats.row_transitions = self.row_transitions.copy()
+        stats.column_transitions = self.column_transitions.copy()
+        stats.buried_holes = self.buried_holes.copy()
+        stats.wells = self.wells.copy()
+        stats.full = self.full
+        stats.hash = self.hash
+        stats.mirror_hash = self.mirror_hash
+        return stats
+
+    def _update_column(self, j: int):
+        columns = self.columns
+        self.column_transitions[j] = column_transitions(columns[j])
+        self.buried_holes[j] = buried_holes(columns[j])
+        self.wells[j] = wells(columns[j - 1], columns[j], columns[j + 1])
+
+    @property
+    def totals(self) -> Tuple[int, int, int, int]:
+        """Row transitions, column transitions, buried holes and wells"""
+        return (sum(self.row_transitions[2:22]), sum(self.column_transitions),
+                sum(self.buried_holes), sum(self.wells))
+
+    def top(self, j: int) -> int:
+        column = self.columns[j]
+        return (column & -column).bit_length() - 1
+
+    def drop_position(self, shape: Shape, x: int) -> int:
+        y = ROWS
+        for j, bottom in enumerate(shape.bottoms):
+            if bottom >= 0:
+                y = min(y, self.top(x + 3 + j) - 3 - bottom)
+        return y
+
+    def _placed(self, shape: Shape, x: int, y: int):
+        rows = {}
+        columns = {}
+        for i, j in shape.cells:
+            row, column = y + 2 + i, x + 3 + j
+            rows[row] = rows.get(row, self.rows[row]) | 1 << column
+            columns[column] = columns.get(column,
+                                          self.columns[column]) | 1 << row
+        return rows, columns
+
+    def delta(self, shape: Shape, x: int,
+              y: int) -> Tuple[int, int, int, int, int]:
+        """Board features after placing a shape, without clearing lines
+
+        Args:
+            shape (Shape): Placement table of the shape
+            x (int): X coordinate
+            y (int): Y coordinate
+
+        Returns:
+            Tuple[int, int, int, int, int]: eroded piece cells metric, row
+                transitions, column transitions, buried holes and wells
+        """
+        rows, columns = self._placed(shape, x, y)
+        row_total, column_total, holes_total, wells_total = self.totals
+
+        cleared_num = self.full
+        contributed = 0
+        for row, mask in rows.items():
+            if 2 <= row < ROWS - 3:
+                row_total += row_transitions(mask) - self.row_transitions[row]
+            if mask == FULL_ROW and 2 <= row < ROWS - 3:
+                cleared_num += 1
+                contributed += _popcount(mask ^ self.rows[row])
+
+        old = self.columns
+        neighbours = set()
+        for j, column in columns.items():
+            column_total += column_transitions(
+                column) - self.column_transitions[j]
+            holes_total += buried_holes(column) - self.buried_holes[j]
+            neighbours.update((j - 1, j, j + 1))
+        for j in neighbours:
+            if j in FIELD_COLUMNS:
+                wells_total += wells(columns.get(j - 1, old[j - 1]),
+                                     columns.get(j, old[j]),
+                                     columns.get(j + 1,
+                                                 old[j + 1])) - self.wells[j]
+        return (contributed * cleared_num, row_total, column_total,
+                holes_total, wells_total)
+
+    def add_tetris(self, shape: Shape, x: int, y: int):
+        rows, columns = self._placed(shape, x, y)
+        for i, j in shape.cells:
+            self.hash ^= ZOBRIST[y + 2 + i][x + 3 + j]
+            self.mirror_hash ^= MIRROR_ZOBRIST[y + 2 + i][x + 3 + j]
+        for row, mask in rows.items():
+            if mask == FULL_ROW and 2 <= row < ROWS - 3:
+                self.full += 1
+            self.rows[row] = mask
+            self.row_transitions[row] = row_transitions(mask)
+        neighbours = set()
+        for j, column in columns.items():
+            self.columns[j] = column
+            neighbours.update((j - 1, j, j + 1))
+        for j in neighbours:
+            if j in FIELD_COLUMNS:
+                self._update_column(j)
+
+    def clear_lines(self, lines: np.ndarray):
+        kept = [
+            row for index, row in enumerate(self.rows[:-3])
+            if not (index >= 2 and lines[index])
+        ]
+        self.rebuild([WALL_ROW] * (ROWS - 3 - len(kept)) + kept +
+                     self.rows[-3:])
+
+    def place(self, shape: Shape, x: int, y: int) -> int:
+        """Lock a shape and clear the full lines at once
+
+        Returns:
+            int: number of cleared lines
+        """
+        self.add_tetris(shape, x, y)
+        if not self.full:
+            return 0
+        lines = [2 <= index < ROWS - 3 and row == FULL_ROW
+                 for index, row in enumerate(self.rows)]
+        cleared = self.full
+        self.clear_lines(lines)
+        return cleared
+
+    def check_gameover(self) -> bool:
+        return bool((self.rows[0] | self.rows[1]) & FIELD_ROW)
@@ -21,7 +21,16 @@ import pygame.locals as gloc
 from .typing import Scene
 from .matrix import Matrix
 from .store import Database
-from .ai import pierre_dellacherie
+from .worker import AIWorker
+from .engine import SCORES, SPEEDS, TICK_RATE, Timestep
+from .book import BOOK_FILE, OpeningBook
+from .search import Greedy, Lookahead, BookSearch, CachedSearch
+
+# 画面帧率上限, 常见显示器的刷新率
+FRAME_RATE = 60
+
+# 游戏中每个画面帧运行的逻辑帧倍数, T 键切换
+TURBOS = (1, 10, 100)
 
 
 class Game(object):
@@ -49,21 +58,27 @@ class Game(object):
         speeds (Dict[int, int]): Speeds for each level
         
         metrix (Matrix): Matrix Sprite
+        state (GameState): Rules of the game drawn by the matrix
         
-        delay (int): Delay
-        drop_delay (int): Delay of dropping the tetris
+        delay (int): Logic ticks modulo 30
         drop_tetris (int): Whether to drop the tetris
-        score (int): Game score
-        lines (int): Cleared lines
+        score (int): Game score of the state
+        lines (int): Cleared lines of the state
         best_score (int): Best score
         last_score (int): Last score
         sound (bool): Sound on or off
         start_line (int): Start line number
-        level (int): Level number
+        level (int): Level number shown, follows the state after the upgrade
+            animation
         level_upgrading (bool): Whether level is upgrading
         level_upgrade_delay (int): Delay of level upgrade animation
         pause (bool): Pause game
         ai (bool): Whether to play the game with AI
+        lookahead (bool): Whether AI looks ahead to the next tetris
+        turbo (int): Turbo multiplier of the logic ticks in game, one of
+            TURBOS
+        ai_worker (AIWorker): AI decisions off the render loop
+        ai_tetris (Optional[Tetris]): Tetris the AI is deciding for
         left_button (bool): Whether left button is pressed or not
         left_button_delay (bool): Delay of left button
         right_button (bool): Whether right button is pressed or not
@@ -72,7 +87,7 @@ class Game(object):
         up_button_delay (bool): Delay of up button
         down_button (bool): Whether down button is pressed or not
         down_button_delay (bool): Delay of down button
-        time (bool): Show time colon or not
+        time (bool): Show time colon or not, every other real second
         logo (List[int]): List of logo animation
         logo_flip (bool): Whether to flip logo or not
         logo_index (int): Index of logo animation
@@ -181,7 +196,21 @@ class Game(object):
         self.end = False
 
         # Init Matrix
-        self.matrix = Matrix()
+        self.matrix = Matrix(bitboard=True)
+        self.state = self.matrix.state
+        searchers = {
+            "greedy": CachedSearch(Greedy(), mirror=True),
+            "lookahead": CachedSearch(Lookahead())
+        }
+        # 存在开局库时先查库再搜索
+        if os.path.exists(BOOK_FILE):
+            book = OpeningBook(BOOK_FILE)
+            searchers = {
+                name: BookSearch(searcher, book)
+                for name, searcher in searchers.items()
+            }
+        # 搜索在单独的进程中运行, 不占用渲染循环的 GIL
+        self.ai_worker = AIWorker(searchers)
 
         # Logo settings
         self.logo = [
@@ -191,10 +220,10 @@ class Game(object):
         ]
 
         # Score setting
-        self.scores = {0: 0, 1: 10, 2: 30, 3: 60, 4: 100}
+        self.scores = SCORES
 
         # Speed setting
-        self.speeds = {1: 20, 2: 15, 3: 12, 4: 9, 5: 6, 6: 4}
+        self.speeds = SPEEDS
 
         # Refresh setting
         self.refresh_fill = True
@@ -311,16 +340,16 @@ class Game(object):
     def init_vars(self):
         """Initialize the variables."""
         self.delay = 0
-        self.drop_delay = 0
         self.drop_tetris = False
-        self.score = 0
-        self.lines = 0
         data = Database.restore_data()
         self.best_score, self.last_score = data[0], data[1]
         self.start_line, self.level = data[2], data[3]
         self.pause = False
         self.sound = True
         self.ai = False
+        self.lookahead = False
+        self.turbo = 1
+        self.ai_tetris = None
         self.level_upgrading = False
         self.level_upgrade_delay = 0
 
@@ -352,12 +381,21 @@ class Game(object):
         # 结算
         self.end_score = 0
 
+    @property
+    def score(self) -> int:
+        return self.state.score
+
+    @property
+    def lines(self) -> int:
+        return self.state.lines
+
     def switch_scene(self, scene: Scene):
         """Switch current scene
 
         Args:
             scene (Scene): Target scene
         """
+        self.matrix.ghost = scene == Scene.GAME
         if scene == Scene.HOME:
             self.home = True
             self.refresh = False
@@ -397,505 +435,527 @@ class Game(object):
     def store_setting(self):
         Database.update_data(start_line=self.start_line, level=self.level)
 
-    def start(self):
-        """Main game loop."""
-        while True:
-            # 事件响应
-            for event in pygame.event.get():
-                # 退出事件
-                if event.type == gloc.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # 键盘事件
-                elif event.type == gloc.KEYDOWN:
-                    if event.key == gloc.K_p:
+    def after_lock(self, cleared: int):
+        """Sounds and scene after the state locked a tetris"""
+        if cleared:
+            self.sounds["clear"].play()
+        if self.state.over:
+            logging.info("Game Over")
+            self.sounds["end"].play()
+            self.store_score()
+            self.switch_scene(Scene.END)
+        else:
+            logging.info("Next")
+
+    def handle_events(self):
+        """Respond to the keyboard and mouse events"""
+        # 事件响应
+        for event in pygame.event.get():
+            # 退出事件
+            if event.type == gloc.QUIT:
+                pygame.quit()
+                sys.exit()
+
+            # 键盘事件
+            elif event.type == gloc.KEYDOWN:
+                if event.key == gloc.K_p:
+                    self.pause_button = True
+                elif event.key == gloc.K_s:
+                    self.sound_button = True
+                elif event.key == gloc.K_r:
+                    self.reset_button = True
+                elif event.key == gloc.K_SPACE:
+                    self.space_button = True
+                    if self.game and not self.pause:
+                        self.drop_tetris = True
+                elif event.key == gloc.K_LEFT:
+                    self.left_button = True
+                    self.left_button_delay = 0
+                elif event.key == gloc.K_UP:
+                    self.up_button = True
+                    self.up_button_delay = 0
+                elif event.key == gloc.K_RIGHT:
+                    self.right_button = True
+                    self.right_button_delay = 0
+                elif event.key == gloc.K_DOWN:
+                    self.down_button = True
+                    self.down_button_delay = 0
+
+            elif event.type == gloc.KEYUP:
+                if event.key == gloc.K_p:
+                    self.pause_button = False
+                    if self.game:
+                        self.pause = not self.pause
+                elif event.key == gloc.K_s:
+                    self.sound_button = False
+                    self.switch_sound()
+                elif event.key == gloc.K_r:
+                    self.reset_button = False
+                    self.switch_scene(Scene.REFRESH)
+                elif event.key == gloc.K_a:
+                    self.ai = not self.ai
+                elif event.key == gloc.K_l:
+                    self.lookahead = not self.lookahead
+                elif event.key == gloc.K_t:
+                    self.turbo = TURBOS[(TURBOS.index(self.turbo) + 1) %
+                                        len(TURBOS)]
+                elif event.key == gloc.K_SPACE:
+                    self.space_button = False
+                    if self.home:
+                        self.sounds["start"].play()
+                        self.store_setting()
+                        self.state.new_game(self.level, self.start_line)
+                        self.switch_scene(Scene.GAME)
+                    elif self.game:
+                        self.drop_tetris = False
+                    elif self.end:
+                        self.switch_scene(Scene.REFRESH)
+                elif event.key == gloc.K_LEFT:
+                    self.left_button = False
+                elif event.key == gloc.K_UP:
+                    self.up_button = False
+                elif event.key == gloc.K_RIGHT:
+                    self.right_button = False
+                elif event.key == gloc.K_DOWN:
+                    self.down_button = False
+
+            # 鼠标点击
+            elif event.type == gloc.MOUSEBUTTONDOWN:
+                pos = event.pos
+                if event.button == 1:
+                    if self.rects["pause"].collidepoint(pos):
                         self.pause_button = True
-                    elif event.key == gloc.K_s:
+                    elif self.rects["sound"].collidepoint(pos):
                         self.sound_button = True
-                    elif event.key == gloc.K_r:
+                    elif self.rects["reset"].collidepoint(pos):
                         self.reset_button = True
-                    elif event.key == gloc.K_SPACE:
+                    elif self.rects["space"].collidepoint(pos):
                         self.space_button = True
                         if self.game and not self.pause:
                             self.drop_tetris = True
-                    elif event.key == gloc.K_LEFT:
+                    elif self.rects["left"].collidepoint(pos):
                         self.left_button = True
                         self.left_button_delay = 0
-                    elif event.key == gloc.K_UP:
+                    elif self.rects["up"].collidepoint(pos):
                         self.up_button = True
                         self.up_button_delay = 0
-                    elif event.key == gloc.K_RIGHT:
+                    elif self.rects["right"].collidepoint(pos):
                         self.right_button = True
                         self.right_button_delay = 0
-                    elif event.key == gloc.K_DOWN:
+                    elif self.rects["down"].collidepoint(pos):
                         self.down_button = True
                         self.down_button_delay = 0
 
-                elif event.type == gloc.KEYUP:
-                    if event.key == gloc.K_p:
-                        self.pause_button = False
+            # 鼠标点击释放
+            elif event.type == gloc.MOUSEBUTTONUP:
+                pos = event.pos
+                if event.button == 1:
+                    if self.pause_button and self.rects[
+                            "pause"].collidepoint(pos):
                         if self.game:
                             self.pause = not self.pause
-                    elif event.key == gloc.K_s:
-                        self.sound_button = False
+                    elif self.sound_button and self.rects[
+                            "sound"].collidepoint(pos):
                         self.switch_sound()
-                    elif event.key == gloc.K_r:
-                        self.reset_button = False
+                    elif self.reset_button and self.rects[
+                            "reset"].collidepoint(pos):
                         self.switch_scene(Scene.REFRESH)
-                    elif event.key == gloc.K_a:
-                        self.ai = not self.ai
-                    elif event.key == gloc.K_SPACE:
-                        self.space_button = False
+                    elif self.space_button and self.rects[
+                            "space"].collidepoint(pos):
                         if self.home:
                             self.sounds["start"].play()
                             self.store_setting()
-                            self.matrix.random_startline(self.start_line)
+                            self.state.new_game(self.level, self.start_line)
                             self.switch_scene(Scene.GAME)
                         elif self.game:
                             self.drop_tetris = False
                         elif self.end:
                             self.switch_scene(Scene.REFRESH)
-                    elif event.key == gloc.K_LEFT:
-                        self.left_button = False
-                    elif event.key == gloc.K_UP:
-                        self.up_button = False
-                    elif event.key == gloc.K_RIGHT:
-                        self.right_button = False
-                    elif event.key == gloc.K_DOWN:
-                        self.down_button = False
-
-                # 鼠标点击
-                elif event.type == gloc.MOUSEBUTTONDOWN:
-                    pos = event.pos
-                    if event.button == 1:
-                        if self.rects["pause"].collidepoint(pos):
-                            self.pause_button = True
-                        elif self.rects["sound"].collidepoint(pos):
-                            self.sound_button = True
-                        elif self.rects["reset"].collidepoint(pos):
-                            self.reset_button = True
-                        elif self.rects["space"].collidepoint(pos):
-                            self.space_button = True
-                            if self.game and not self.pause:
-                                self.drop_tetris = True
-                        elif self.rects["left"].collidepoint(pos):
-                            self.left_button = True
-                            self.left_button_delay = 0
-                        elif self.rects["up"].collidepoint(pos):
-                            self.up_button = True
-                            self.up_button_delay = 0
-                        elif self.rects["right"].collidepoint(pos):
-                            self.right_button = True
-                            self.right_button_delay = 0
-                        elif self.rects["down"].collidepoint(pos):
-                            self.down_button = True
-                            self.down_button_delay = 0
-
-                # 鼠标点击释放
-                elif event.type == gloc.MOUSEBUTTONUP:
-                    pos = event.pos
-                    if event.button == 1:
-                        if self.pause_button and self.rects[
-                                "pause"].collidepoint(pos):
-                            if self.game:
-                                self.pause = not self.pause
-                        elif self.sound_button and self.rects[
-                                "sound"].collidepoint(pos):
-                            self.switch_sound()
-                        elif self.reset_button and self.rects[
-                                "reset"].collidepoint(pos):
-                            self.switch_scene(Scene.REFRESH)
-                        elif self.space_button and self.rects[
-                                "space"].collidepoint(pos):
-                            if self.home:
-                                self.sounds["start"].play()
-                                self.store_setting()
-                                self.matrix.random_startline(self.start_line)
-                                self.switch_scene(Scene.GAME)
-                            elif self.game:
-                                self.drop_tetris = False
-                            elif self.end:
-                                self.switch_scene(Scene.REFRESH)
-                        elif self.left_button and self.rects[
-                                "left"].collidepoint(pos):
-                            ...
-                        elif self.up_button and self.rects["up"].collidepoint(
-                                pos):
-                            ...
-                        elif self.right_button and self.rects[
-                                "right"].collidepoint(pos):
-                            ...
-                        elif self.down_button and self.rects[
-                                "down"].collidepoint(pos):
-                            ...
-                        self.pause_button = False
-                        self.sound_button = False
-                        self.reset_button = False
-                        self.space_button = False
-                        self.left_button = False
-                        self.right_button = False
-                        self.up_button = False
-                        self.down_button = False
-
-            # 基础背景绘制
-            self.screen.blit(self.images["backgrounds"][self.level - 1], (0, 0))
-            self.screen.fill((158, 173, 134), (126, 90, 360, 445))
-            pygame.draw.rect(self.screen, (0, 0, 0), (140, 104, 210, 410), 2)
-            self.matrix.update()
-            self.screen.blit(self.matrix.image, (146, 110))
-
-            # 绘制按钮
-            self.screen.blit(
-                self.images["green_pushed"] if self.pause_button else
-                self.images["green"], self.rects["pause"])
-            self.screen.blit(
-                self.images["green_pushed"] if self.sound_button else
-                self.images["green"], self.rects["sound"])
-            self.screen.blit(
-                self.images["red_pushed"] if self.reset_button else
-                self.images["red"], self.rects["reset"])
-            self.screen.blit(
-                self.images["blue_lg_pushed"] if self.space_button else
-                self.images["blue_lg"], self.rects["space"])
-            self.screen.blit(
-                self.images["blue_sm_pushed"] if self.left_button else
-                self.images["blue_sm"], self.rects["left"])
-            self.screen.blit(
-                self.images["blue_sm_pushed"]
-                if self.up_button else self.images["blue_sm"], self.rects["up"])
-            self.screen.blit(
-                self.images["blue_sm_pushed"] if self.right_button else
-                self.images["blue_sm"], self.rects["right"])
-            self.screen.blit(
-                self.images["blue_sm_pushed"] if self.down_button else
-                self.images["blue_sm"], self.rects["down"])
-            self.screen.blit(self.words["pause"], (40, 665))
-            self.screen.blit(self.words["sound"], (130, 665))
-            self.screen.blit(self.words["refresh"], (220, 665))
-            self.screen.blit(self.words["space"], (105, 868))
-            self.screen.blit(self.words["left"], (346, 800))
-            self.screen.blit(self.words["up"], (504, 630))
-            self.screen.blit(self.words["right"], (520, 800))
-            self.screen.blit(self.words["down"], (429, 886))
-            self.screen.blit(self.words["left_arrow"], (420, 738))
-            self.screen.blit(self.words["up_arrow"], (445, 713))
-            self.screen.blit(self.words["right_arrow"], (470, 738))
-            self.screen.blit(self.words["down_arrow"], (445, 763))
-
-            # 绘制图标
-            if self.sound:
-                self.screen.blit(self.images["sound"], (360, 499))
-            else:
-                self.screen.blit(self.images["unsound"], (360, 499))
-            if self.pause:
-                self.screen.blit(self.images["pause"], (389, 500))
-            else:
-                self.screen.blit(self.images["unpause"], (389, 500))
-
-            now = datetime.now()
-            self.screen.blit(
-                self.images["colon"]
-                if self.time else self.images["colon_none"], (437, 497))
-            self.screen.blit(
-                self.images["numbers"][now.hour // 10] if now.hour //
-                10 else self.images["number_none"], (412, 497))
-            self.screen.blit(self.images["numbers"][now.hour % 10], (426, 497))
-            self.screen.blit(self.images["numbers"][now.minute // 10],
-                             (451, 497))
-            self.screen.blit(self.images["numbers"][now.minute % 10],
-                             (465, 497))
+                    elif self.left_button and self.rects[
+                            "left"].collidepoint(pos):
+                        ...
+                    elif self.up_button and self.rects["up"].collidepoint(
+                            pos):
+                        ...
+                    elif self.right_button and self.rects[
+                            "right"].collidepoint(pos):
+                        ...
+                    elif self.down_button and self.rects[
+                            "down"].collidepoint(pos):
+                        ...
+                    self.pause_button = False
+                    self.sound_button = False
+                    self.reset_button = False
+                    self.space_button = False
+                    self.left_button = False
+                    self.right_button = False
+                    self.up_button = False
+                    self.down_button = False
+
+    def tick(self):
+        """Advance the game by one logic tick
+
+        All timing of the game is counted in ticks: gravity, button
+        repeats, clear, refresh and level upgrade animations.
+        """
+        self.matrix.tick()
+
+        # 首页
+        if self.home:
+            # logo 动画
+            if self.delay % 5 == 0:
+                self.logo_index = (self.logo_index + 1) % len(self.logo)
+            if self.logo_index < 6 and self.delay == 0:
+                self.logo_flip = not self.logo_flip
 
+            # 分数切换
             if self.delay == 0:
-                self.time = not self.time
-
-            # 首页
-            if self.home:
-                # 绘制logo
-                if self.logo_flip:
-                    self.screen.blit(
-                        pygame.transform.flip(
-                            self.images["logos"][self.logo[self.logo_index]],
-                            True, False), (200, 230))
-                else:
-                    self.screen.blit(
-                        self.images["logos"][self.logo[self.logo_index]],
-                        (200, 230))
-                if self.delay % 5 == 0:
-                    self.logo_index = (self.logo_index + 1) % len(self.logo)
-                if self.logo_index < 6 and self.delay == 0:
-                    self.logo_flip = not self.logo_flip
-
-                self.screen.blit(self.words["tetris"], (205, 330))
-                if self.time:
-                    self.screen.blit(self.words["start"], (155, 370))
-
-                # 绘制分数
-                if self.best_or_last:
-                    self.screen.blit(self.words["best"], (370, 110))
-                    scores = f"{self.best_score: >6}"[::-1]
-                    for index, score in enumerate(scores):
-                        self.screen.blit(
-                            self.images["numbers"][int(score)]
-                            if score != " " else self.images["number_none"],
-                            (460 - index * 14, 140))
-                else:
-                    self.screen.blit(self.words["last"], (370, 110))
-                    scores = f"{self.last_score: >6}"[::-1]
-                    for index, score in enumerate(scores):
-                        self.screen.blit(
-                            self.images["numbers"][int(score)]
-                            if score != " " else self.images["number_none"],
-                            (460 - index * 14, 140))
-                if self.delay == 0:
-                    self.best_or_last_index = (self.best_or_last_index + 1) % 5
-                if self.best_or_last_index == 0 and self.delay == 0:
-                    self.best_or_last = not self.best_or_last
-
-                # 绘制初始行数
-                self.screen.blit(self.words["start_line"], (370, 185))
-                start_line = f"{self.start_line: >6}"[::-1]
-                for index, line in enumerate(start_line):
-                    self.screen.blit(
-                        self.images["numbers"][int(line)] if line != " " else
-                        self.images["number_none"], (460 - index * 14, 215))
-                if self.up_button:
-                    if self.up_button_delay == 0:
-                        self.sounds["biu2"].play()
-                        self.start_line = (self.start_line + 1) % 11
-                    self.up_button_delay = (self.up_button_delay + 1) % 4
-                elif self.down_button:
-                    if self.down_button_delay == 0:
-                        self.sounds["biu2"].play()
-                        self.start_line = (self.start_line - 1) % 11
-                    self.down_button_delay = (self.down_button_delay + 1) % 4
-
-                # 绘制level
-                self.screen.blit(self.words["level"], (370, 260))
-                self.screen.blit(self.images["numbers"][self.level], (460, 290))
-                for index in range(5):
-                    self.screen.blit(self.images["number_none"],
-                                     (446 - index * 14, 290))
+                self.best_or_last_index = (self.best_or_last_index + 1) % 5
+            if self.best_or_last_index == 0 and self.delay == 0:
+                self.best_or_last = not self.best_or_last
+
+            # 初始行数
+            if self.up_button:
+                if self.up_button_delay == 0:
+                    self.sounds["biu2"].play()
+                    self.start_line = (self.start_line + 1) % 11
+                self.up_button_delay = (self.up_button_delay + 1) % 4
+            elif self.down_button:
+                if self.down_button_delay == 0:
+                    self.sounds["biu2"].play()
+                    self.start_line = (self.start_line - 1) % 11
+                self.down_button_delay = (self.down_button_delay + 1) % 4
+
+            # level
+            if self.left_button:
+                if self.left_button_delay == 0:
+                    self.sounds["biu2"].play()
+                    self.level = (self.level - 2) % 6 + 1
+                self.left_button_delay = (self.left_button_delay + 1) % 4
+            elif self.right_button:
+                if self.right_button_delay == 0:
+                    self.sounds["biu2"].play()
+                    self.level = self.level % 6 + 1
+                self.right_button_delay = (self.right_button_delay + 1) % 4
+        # 游戏界面
+        elif self.game:
+            if self.state.level > self.level:
+                self.level_upgrading = True
+
+            # 控制
+            if not self.pause and not self.state.clearing:
+                # 下落
+                if self.drop_tetris:
+                    self.sounds["drop"].play()
+                    self.drop_tetris = False
+                    self.after_lock(self.state.hard_drop())
+                # 新方块出现时把局面交给 AI
+                if self.ai and self.ai_tetris is not self.state.current:
+                    self.ai_tetris = self.state.current
+                    self.ai_worker.submit(
+                        "lookahead" if self.lookahead else "greedy",
+                        self.state.stats,
+                        [type(self.state.current),
+                         type(self.state.next)],
+                        [type(tetris) for tetris in self.state.bag])
+                if self.state.gravity() or (self.delay % 3 == 0 and
+                                            self.down_button):
+                    if self.ai:
+                        best_choice = self.ai_worker.poll()
+                        if best_choice:
+                            self.state.current.x = best_choice.x
+                            self.state.current.y = best_choice.y
+                            self.state.current.index = best_choice.index
+                            logging.info(f"[AI Choice] x: {best_choice.x} | "
+                                         f"y: {best_choice.y} | "
+                                         f"score: {best_choice.score}")
+
+                    cleared = self.state.soft_drop()
+                    if cleared is not None:
+                        self.after_lock(cleared)
+
+                # 左右移动
                 if self.left_button:
                     if self.left_button_delay == 0:
                         self.sounds["biu2"].play()
-                        self.level = (self.level - 2) % 6 + 1
-                    self.left_button_delay = (self.left_button_delay + 1) % 4
+                        self.state.move(False)
+                    self.left_button_delay = (self.left_button_delay + 1) % 5
                 elif self.right_button:
                     if self.right_button_delay == 0:
                         self.sounds["biu2"].play()
-                        self.level = self.level % 6 + 1
-                    self.right_button_delay = (self.right_button_delay + 1) % 4
-            # 游戏界面
-            elif self.game:
-                # 绘制分数
-                self.screen.blit(self.words["score"], (370, 110))
-                scores = f"{self.score: >6}"[::-1]
-                for index, score in enumerate(scores):
-                    self.screen.blit(
-                        self.images["numbers"][int(score)] if score != " " else
-                        self.images["number_none"], (460 - index * 14, 140))
-
-                # 绘制行数
-                self.screen.blit(self.words["clean"], (370, 185))
-                lines = f"{self.lines: >6}"[::-1]
-                for index, line in enumerate(lines):
-                    self.screen.blit(
-                        self.images["numbers"][int(line)] if line != " " else
-                        self.images["number_none"], (460 - index * 14, 215))
-
-                # 绘制level
-                self.screen.blit(self.words["level"], (370, 260))
-                self.screen.blit(self.images["numbers"][self.level], (460, 290))
-                for index in range(5):
-                    self.screen.blit(self.images["number_none"],
-                                     (446 - index * 14, 290))
-
-                # 绘制next
-                self.screen.blit(self.words["next"], (370, 335))
-                next_ = pygame.Surface((78, 38)).convert_alpha()
-                next_.fill((158, 173, 134, 0))
-                for i in range(4):
-                    for j in range(2):
-                        if i >= self.matrix.next.matrix.shape[1]:
-                            next_.blit(self.matrix.unfilled_rect,
-                                       (i * 20, j * 20))
-                        else:
-                            next_.blit(
-                                self.matrix.filled_rect
-                                if self.matrix.next.matrix[j, i] else
-                                self.matrix.unfilled_rect, (i * 20, j * 20))
-                self.screen.blit(next_, (380, 365))
-
-                if (self.score > 2500 and self.level < 6) or (
-                        self.score > 2000 and self.level < 5) or (
-                            self.score > 1500 and self.level < 4) or (
-                                self.score > 1000 and
-                                self.level < 3) or (self.score > 500 and
-                                                    self.level < 2):
-                    self.level_upgrading = True
-
-                # 控制
-                if not self.pause and not self.matrix.clearing:
-                    # 下落
-                    if self.drop_tetris:
-                        self.sounds["drop"].play()
-                        while not self.matrix.check_collision():
-                            self.matrix.current.y += 1
-                        self.matrix.current.y -= 1
-                        self.drop_tetris = False
-                        self.matrix.add_tetris()
-                        cleared = self.matrix.check_clear()
-                        if cleared:
-                            self.sounds["clear"].play()
-                        self.score += self.scores.get(cleared, 100)
-                        self.lines += cleared
-                        if self.matrix.check_gameover():
-                            logging.info("Game Over")
-                            self.sounds["end"].play()
-                            self.store_score()
-                            self.switch_scene(Scene.END)
-                        else:
-                            logging.info("Next")
-                            self.matrix.next_tetris()
-                    if self.drop_delay % self.speeds[self.level] == 0 or (
-                            self.delay % 3 == 0 and self.down_button):
-                        if self.ai:
-                            ai_results = pierre_dellacherie(
-                                self.matrix.matrix, self.matrix.current.matrixs)
-                            if ai_results:
-                                best_choice = ai_results[0]
-                                self.matrix.current.x = best_choice.x
-                                self.matrix.current.y = best_choice.y
-                                self.matrix.current.index = best_choice.index
-                                logging.info(
-                                    f"[AI Choice] x: {best_choice.x} | "
-                                    f"y: {best_choice.y} | "
-                                    f"score: {best_choice.score}")
-
-                        self.matrix.current.y += 1
-                        # 检测碰撞
-                        if self.matrix.check_collision():
-                            self.matrix.current.y -= 1
-                            self.matrix.add_tetris()
-                            cleared = self.matrix.check_clear()
-                            if cleared:
-                                self.sounds["clear"].play()
-                            self.score += self.scores.get(cleared, 100)
-                            self.lines += cleared
-                            if self.matrix.check_gameover():
-                                logging.info("Game Over")
-                                self.sounds["end"].play()
-                                self.store_score()
-                                self.switch_scene(Scene.END)
-                            else:
-                                logging.info("Next")
-                                self.matrix.next_tetris()
-                    self.drop_delay = (self.drop_delay +
-                                       1) % self.speeds[self.level]
-
-                    # 左右移动
-                    if self.left_button:
-                        if self.left_button_delay == 0:
-                            self.matrix.current.x -= 1
-                            self.sounds["biu2"].play()
-                            if self.matrix.check_collision():
-                                self.matrix.current.x += 1
-                        self.left_button_delay = (self.left_button_delay +
-                                                  1) % 5
-                    elif self.right_button:
-                        if self.right_button_delay == 0:
-                            self.matrix.current.x += 1
-                            self.sounds["biu2"].play()
-                            if self.matrix.check_collision():
-                                self.matrix.current.x -= 1
-                        self.right_button_delay = (self.right_button_delay +
-                                                   1) % 5
-
-                    # 旋转
-                    if self.up_button:
-                        if self.up_button_delay == 0:
-                            self.matrix.current.rotate(False)
-                            self.sounds["biu1"].play()
-                            if self.matrix.check_collision():
-                                self.matrix.current.rotate(True)
-                        self.up_button_delay = (self.up_button_delay + 1) % 5
-            # 游戏结束画面
-            elif self.end:
-                self.screen.blit(self.words["end"], (375, 110))
-
-                self.screen.blit(self.words["score"], (370, 140))
-                scores = self.score if self.end_score > self.score else self.end_score
-                scores = f"{scores: >6}"[::-1]
-                for index, score in enumerate(scores):
-                    self.screen.blit(
-                        self.images["numbers"][int(score)] if score != " " else
-                        self.images["number_none"], (460 - index * 14, 170))
-
-                self.screen.blit(self.words["clean"], (370, 215))
-                lines = self.lines if self.end_score > self.lines else self.end_score
-                lines = f"{lines: >6}"[::-1]
-                for index, line in enumerate(lines):
-                    self.screen.blit(
-                        self.images["numbers"][int(line)] if line != " " else
-                        self.images["number_none"], (460 - index * 14, 245))
-
-                self.screen.blit(self.words["best"], (370, 290))
-                scores = self.best_score if self.end_score > self.best_score else self.end_score
-                scores = f"{scores: >6}"[::-1]
-                for index, score in enumerate(scores):
-                    self.screen.blit(
-                        self.images["numbers"][int(score)] if score != " " else
-                        self.images["number_none"], (460 - index * 14, 320))
-
-                self.screen.blit(self.words["continue"], (360, 400))
-
-                if self.end_score <= max(self.score, self.lines,
-                                         self.best_score):
-                    self.end_score += max(self.score, self.lines,
-                                          self.best_score) // 150
-            # Refresh画面
-            elif self.refresh:
-                self.screen.blit(self.words["reset"], (385, 110))
-                if self.delay % 2 == 0:
-                    if self.refresh_fill:
-                        self.matrix.matrix[21 - self.refresh_index, 3:-3] = 1
-                        self.refresh_index += 1
-                        if self.refresh_index == 22:
-                            self.refresh_fill = False
-                            self.matrix.fill_bag()
-                            self.matrix.next_tetris()
+                        self.state.move(True)
+                    self.right_button_delay = (self.right_button_delay + 1) % 5
+
+                # 旋转
+                if self.up_button:
+                    if self.up_button_delay == 0:
+                        self.sounds["biu1"].play()
+                        self.state.rotate(False)
+                    self.up_button_delay = (self.up_button_delay + 1) % 5
+        # 游戏结束画面
+        elif self.end:
+            if self.end_score <= max(self.score, self.lines, self.best_score):
+                self.end_score += max(self.score, self.lines,
+                                      self.best_score) // 150
+        # Refresh画面
+        elif self.refresh:
+            if self.delay % 2 == 0:
+                if self.refresh_fill:
+                    self.state.fill_line(21 - self.refresh_index, True)
+                    self.refresh_index += 1
+                    if self.refresh_index == 22:
+                        self.refresh_fill = False
+                        self.state.spawn()
+                else:
+                    self.refresh_index -= 1
+                    self.state.fill_line(21 - self.refresh_index, False)
+                    if self.refresh_index == 0:
+                        self.refresh_fill = True
+                        self.init_vars()
+                        self.switch_scene(Scene.HOME)
+
+        # 升级动画
+        if self.level_upgrading:
+            self.level_upgrade_delay = (self.level_upgrade_delay + 1) % 16
+            if self.level_upgrade_delay == 0:
+                # 退出过渡
+                self.level_upgrading = False
+            elif self.level_upgrade_delay == 8:
+                # 更换背景
+                self.level += 1
+
+        # 记录当前帧数
+        self.delay = (self.delay + 1) % 30
+
+    def draw(self):
+        """Draw one frame of the current state"""
+        # 基础背景绘制
+        self.screen.blit(self.images["backgrounds"][self.level - 1], (0, 0))
+        self.screen.fill((158, 173, 134), (126, 90, 360, 445))
+        pygame.draw.rect(self.screen, (0, 0, 0), (140, 104, 210, 410), 2)
+        self.matrix.update()
+        self.screen.blit(self.matrix.image, (146, 110))
+
+        # 绘制按钮
+        self.screen.blit(
+            self.images["green_pushed"]
+            if self.pause_button else self.images["green"], self.rects["pause"])
+        self.screen.blit(
+            self.images["green_pushed"]
+            if self.sound_button else self.images["green"], self.rects["sound"])
+        self.screen.blit(
+            self.images["red_pushed"]
+            if self.reset_button else self.images["red"], self.rects["reset"])
+        self.screen.blit(
+            self.images["blue_lg_pushed"] if self.space_button else
+            self.images["blue_lg"], self.rects["space"])
+        self.screen.blit(
+            self.images["blue_sm_pushed"] if self.left_button else
+            self.images["blue_sm"], self.rects["left"])
+        self.screen.blit(
+            self.images["blue_sm_pushed"]
+            if self.up_button else self.images["blue_sm"], self.rects["up"])
+        self.screen.blit(
+            self.images["blue_sm_pushed"] if self.right_button else
+            self.images["blue_sm"], self.rects["right"])
+        self.screen.blit(
+            self.images["blue_sm_pushed"] if self.down_button else
+            self.images["blue_sm"], self.rects["down"])
+        self.screen.blit(self.words["pause"], (40, 665))
+        self.screen.blit(self.words["sound"], (130, 665))
+        self.screen.blit(self.words["refresh"], (220, 665))
+        self.screen.blit(self.words["space"], (105, 868))
+        self.screen.blit(self.words["left"], (346, 800))
+        self.screen.blit(self.words["up"], (504, 630))
+        self.screen.blit(self.words["right"], (520, 800))
+        self.screen.blit(self.words["down"], (429, 886))
+        self.screen.blit(self.words["left_arrow"], (420, 738))
+        self.screen.blit(self.words["up_arrow"], (445, 713))
+        self.screen.blit(self.words["right_arrow"], (470, 738))
+        self.screen.blit(self.words["down_arrow"], (445, 763))
+
+        # 绘制图标
+        if self.sound:
+            self.screen.blit(self.images["sound"], (360, 499))
+        else:
+            self.screen.blit(self.images["unsound"], (360, 499))
+        if self.pause:
+            self.screen.blit(self.images["pause"], (389, 500))
+        else:
+            self.screen.blit(self.images["unpause"], (389, 500))
+
+        # 时钟按真实时间闪烁, 不受加速影响
+        now = datetime.now()
+        self.time = now.second % 2 == 0
+        self.screen.blit(
+            self.images["colon"] if self.time else self.images["colon_none"],
+            (437, 497))
+        self.screen.blit(
+            self.images["numbers"][now.hour //
+                                   10] if now.hour // 10 else
+            self.images["number_none"], (412, 497))
+        self.screen.blit(self.images["numbers"][now.hour % 10], (426, 497))
+        self.screen.blit(self.images["numbers"][now.minute // 10], (451, 497))
+        self.screen.blit(self.images["numbers"][now.minute % 10], (465, 497))
+
+        # 首页
+        if self.home:
+            # 绘制logo
+            if self.logo_flip:
+                self.screen.blit(
+                    pygame.transform.flip(
+                        self.images["logos"][self.logo[self.logo_index]], True,
+                        False), (200, 230))
+            else:
+                self.screen.blit(
+                    self.images["logos"][self.logo[self.logo_index]],
+                    (200, 230))
+
+            self.screen.blit(self.words["tetris"], (205, 330))
+            if self.time:
+                self.screen.blit(self.words["start"], (155, 370))
+
+            # 绘制分数
+            if self.best_or_last:
+                self.screen.blit(self.words["best"], (370, 110))
+                scores = f"{self.best_score: >6}"[::-1]
+            else:
+                self.screen.blit(self.words["last"], (370, 110))
+                scores = f"{self.last_score: >6}"[::-1]
+            for index, score in enumerate(scores):
+                self.screen.blit(
+                    self.images["numbers"][int(score)]
+                    if score != " " else self.images["number_none"],
+                    (460 - index * 14, 140))
+
+            # 绘制初始行数
+            self.screen.blit(self.words["start_line"], (370, 185))
+            start_line = f"{self.start_line: >6}"[::-1]
+            for index, line in enumerate(start_line):
+                self.screen.blit(
+                    self.images["numbers"][int(line)]
+                    if line != " " else self.images["number_none"],
+                    (460 - index * 14, 215))
+
+            # 绘制level
+            self.screen.blit(self.words["level"], (370, 260))
+            self.screen.blit(self.images["numbers"][self.level], (460, 290))
+            for index in range(5):
+                self.screen.blit(self.images["number_none"],
+                                 (446 - index * 14, 290))
+        # 游戏界面
+        elif self.game:
+            # 绘制分数
+            self.screen.blit(self.words["score"], (370, 110))
+            scores = f"{self.score: >6}"[::-1]
+            for index, score in enumerate(scores):
+                self.screen.blit(
+                    self.images["numbers"][int(score)]
+                    if score != " " else self.images["number_none"],
+                    (460 - index * 14, 140))
+
+            # 绘制行数
+            self.screen.blit(self.words["clean"], (370, 185))
+            lines = f"{self.lines: >6}"[::-1]
+            for index, line in enumerate(lines):
+                self.screen.blit(
+                    self.images["numbers"][int(line)]
+                    if line != " " else self.images["number_none"],
+                    (460 - index * 14, 215))
+
+            # 绘制level
+            self.screen.blit(self.words["level"], (370, 260))
+            self.screen.blit(self.images["numbers"][self.level], (460, 290))
+            for index in range(5):
+                self.screen.blit(self.images["number_none"],
+                                 (446 - index * 14, 290))
+
+            # 绘制next
+            self.screen.blit(self.words["next"], (370, 335))
+            next_ = pygame.Surface((78, 38)).convert_alpha()
+            next_.fill((158, 173, 134, 0))
+            for i in range(4):
+                for j in range(2):
+                    if i >= self.matrix.next.matrix.shape[1]:
+                        next_.blit(self.matrix.unfilled_rect, (i * 20, j * 20))
                     else:
-                        self.refresh_index -= 1
-                        self.matrix.matrix[21 - self.refresh_index, 3:-3] = 0
-                        if self.refresh_index == 0:
-                            self.refresh_fill = True
-                            self.init_vars()
-                            self.switch_scene(Scene.HOME)
-
-            # 升级动画
-            if self.level_upgrading:
-                self.level_upgrade_delay = (self.level_upgrade_delay + 1) % 16
-
-                # 过渡遮罩层
-                alpha = 256 - abs(256 - 32 * self.level_upgrade_delay)
-                mask = pygame.Surface(self.screen_size)
-                mask.fill((0, 0, 0))
-                mask.set_alpha(alpha if alpha < 256 else 255)
-                self.screen.blit(mask, (0, 0))
-
-                if self.level_upgrade_delay == 0:
-                    # 退出过渡
-                    self.level_upgrading = False
-                elif self.level_upgrade_delay == 8:
-                    # 更换背景
-                    self.level += 1
-
-            # 记录当前帧数
-            self.delay = (self.delay + 1) % 30
-
-            # 设置帧率为30
-            self.clock.tick(30)
+                        next_.blit(
+                            self.matrix.filled_rect if self.matrix.next.matrix[
+                                j, i] else self.matrix.unfilled_rect,
+                            (i * 20, j * 20))
+            self.screen.blit(next_, (380, 365))
+
+            # 绘制加速倍数
+            if self.turbo > 1:
+                self.screen.blit(
+                    self.font.render(f"Turbo x{self.turbo}", True, (0, 0, 0)),
+                    (370, 420))
+        # 游戏结束画面
+        elif self.end:
+            self.screen.blit(self.words["end"], (375, 110))
+
+            self.screen.blit(self.words["score"], (370, 140))
+            scores = self.score if self.end_score > self.score else self.end_score
+            scores = f"{scores: >6}"[::-1]
+            for index, score in enumerate(scores):
+                self.screen.blit(
+                    self.images["numbers"][int(score)]
+                    if score != " " else self.images["number_none"],
+                    (460 - index * 14, 170))
+
+            self.screen.blit(self.words["clean"], (370, 215))
+            lines = self.lines if self.end_score > self.lines else self.end_score
+            lines = f"{lines: >6}"[::-1]
+            for index, line in enumerate(lines):
+                self.screen.blit(
+                    self.images["numbers"][int(line)]
+                    if line != " " else self.images["number_none"],
+                    (460 - index * 14, 245))
+
+            self.screen.blit(self.words["best"], (370, 290))
+            scores = self.best_score if self.end_score > self.best_score else self.end_score
+            scores = f"{scores: >6}"[::-1]
+            for index, score in enumerate(scores):
+                self.screen.blit(
+                    self.images["numbers"][int(score)]
+                    if score != " " else self.images["number_none"],
+                    (460 - index * 14, 320))
+
+            self.screen.blit(self.words["continue"], (360, 400))
+        # Refresh画面
+        elif self.refresh:
+            self.screen.blit(self.words["reset"], (385, 110))
+
+        # 升级动画的过渡遮罩层
+        if self.level_upgrading:
+            alpha = 256 - abs(256 - 32 * self.level_upgrade_delay)
+            mask = pygame.Surface(self.screen_size)
+            mask.fill((0, 0, 0))
+            mask.set_alpha(alpha if alpha < 256 else 255)
+            self.screen.blit(mask, (0, 0))
+
+    def start(self):
+        """Main game loop
+
+        Every loop handles the events, runs the logic ticks due since the
+        last frame and draws one frame. Ticks are ``1 / TICK_RATE`` seconds,
+        divided by the turbo multiplier in game, so the rules are the same
+        at any frame rate. Frames are capped at ``FRAME_RATE``, the refresh
+        rate of common displays.
+        """
+        timestep = Timestep(TICK_RATE)
+        while True:
+            self.handle_events()
+
+            # 按固定时间步长运行逻辑, 画面卡顿时追赶
+            timestep.advance()
+            while timestep.due(self.turbo if self.game else 1):
+                self.tick()
+
+            self.draw()
+
+            # 限制画面帧率
+            self.clock.tick(FRAME_RATE)
 
             # 刷新画面
             pygame.display.update()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 18:52:09
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 18:52:09
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+from collections import deque
+from typing import Dict, List, Type, Tuple, Optional
+
+import numpy as np
+
+from .typing import Move
+from .ai import Result, placement_result
+from .features import BoardStats
+from .board import ROWS, COLUMNS
+from .weights import EL_TETRIS, Weights
+from .tetris import TETRISES, Shape, Tetris, shapes_of, tetris_of
+
+# 超出底部的行视为已填充
+_BELOW = ((1 << 8) - 1) << ROWS
+
+Placement = Tuple[int, int, int]
+
+
+def _shape_columns(shape: Shape) -> Tuple[Tuple[int, Tuple[int, ...]], ...]:
+    """Filled rows of every non-empty column of a shape"""
+    return tuple((j, tuple(i for i, j_ in shape.cells if j_ == j))
+                 for j in range(shape.width)
+                 if any(j_ == j for _, j_ in shape.cells))
+
+
+# 每种方块每个旋转的列, 预先计算
+SHAPE_COLUMNS: Dict[Type[Tetris], Tuple] = {
+    tetris: tuple(_shape_columns(shape) for shape in tetris.shapes)
+    for tetris in TETRISES
+}
+
+
+def column_masks(rows: List[int]) -> List[int]:
+    """Transpose row masks, bit ``r`` of column ``c`` is cell ``(r, c)``"""
+    columns = [_BELOW] * COLUMNS
+    for r, row in enumerate(rows):
+        bit = 1 << r
+        c = 0
+        while row:
+            if row & 1:
+                columns[c] |= bit
+            row >>= 1
+            c += 1
+    return columns
+
+
+class MoveGenerator(object):
+    """Placements reachable with the game moves instead of straight drops
+
+    A state is ``(index, x, y)`` of the current tetris. The moves are the
+    game controls: one column left or right and the up key rotation,
+    each undone on collision like ``Matrix.check_collision``, and one row
+    down, which locks the tetris when it collides. Unlike straight drops
+    from the top, this finds tucks under overhangs and spins into slots.
+
+    Collisions of one rotation at one column are a bitmask over ``y + 2``,
+    built from the transposed board and the precomputed shape columns.
+    The visited table holds such a bitmask per ``(index, x)``, so falling
+    down a column is a few shifts and the flood fill only revisits a
+    column when a side move or rotation reaches new rows of it. Paths come
+    from a breadth-first search over the visited states.
+
+    Attributes:
+        tetris (Type[Tetris]): Tetris to place
+        spawn (Placement): Start state
+        columns (List[int]): Column masks of the board
+        visited (Dict[Tuple[int, int], int]): Reachable ``y + 2`` bits of
+            each ``(index, x)``
+    """
+
+    def __init__(self,
+                 rows: List[int],
+                 tetris: Type[Tetris],
+                 spawn: Optional[Placement] = None):
+        self.tetris = tetris
+        self.spawn = (0,) + tetris.spawn if spawn is None else spawn
+        self.columns = column_masks(rows)
+        self._shape_columns = SHAPE_COLUMNS[tetris]
+        self._collisions: Dict[Tuple[int, int], int] = {}
+        self.visited: Dict[Tuple[int, int], int] = {}
+        self._parents: Optional[Dict] = None
+
+    def collisions(self, index: int, x: int) -> int:
+        """Bit ``y + 2`` is set where the rotation collides at column x"""
+        key = (index, x)
+        mask = self._collisions.get(key)
+        if mask is None:
+            mask = 0
+            for j, rows in self._shape_columns[index]:
+                c = x + 3 + j
+                # 场外的列全部视为碰撞
+                column = self.columns[c] if 0 <= c < COLUMNS else -1
+                for i in rows:
+                    mask |= column >> i
+            self._collisions[key] = mask
+        return mask
+
+    def search(self) -> List[Placement]:
+        """Flood fill the reachable states
+
+        Returns:
+            List[Placement]: ``(index, x, y)`` of the lock placements
+        """
+        index, x, y = self.spawn
+        self.visited = {}
+        self._parents = None
+        if self.collisions(index, x) >> (y + 2) & 1:
+            return []
+        rotations = len(self.tetris.shapes)
+        self.visited[(index, x)] = 1 << (y + 2)
+        pending = [(index, x)]
+        while pending:
+            index, x = key = pending.pop()
+            # 向下落到碰撞为止, 倍增移位填充
+            free = ~self.collisions(index, x)
+            reached = self.visited[key]
+            reached |= free & (reached << 1)
+            free &= free << 1
+            reached |= free & (reached << 2)
+            free &= free << 2
+            reached |= free & (reached << 4)
+            free &= free << 4
+            reached |= free & (reached << 8)
+            free &= free << 8
+            reached |= free & (reached << 16)
+            self.visited[key] = reached
+            # 与游戏的上键一致, rotate(False)
+            for neighbor in ((index, x - 1), (index, x + 1),
+                             ((index - 1) % rotations, x)):
+                old = self.visited.get(neighbor, 0)
+                new = reached & ~self.collisions(*neighbor) & ~old
+                if new:
+                    self.visited[neighbor] = old | new
+                    pending.append(neighbor)
+
+        placements = []
+        for (index, x), reached in self.visited.items():
+            locks = reached & (self.collisions(index, x) >> 1)
+            while locks:
+                bit = locks & -locks
+                placements.append((index, x, bit.bit_length() - 3))
+                locks ^= bit
+        return sorted(placements)
+
+    def path(self, placement: Placement) -> Optional[List[Move]]:
+        """Fewest moves from the spawn to a state, None if unreachable
+
+        The first call runs the breadth-first search over the states of
+        ``search``, later calls reuse its tree.
+        """
+        if self._parents is None:
+            self._parents = self._tree()
+        if placement not in self._parents:
+            return None
+        moves = []
+        while self._parents[placement] is not None:
+            placement, move = self._parents[placement]
+            moves.append(move)
+        return moves[::-1]
+
+    def _tree(self) -> Dict[Placement, Optional[Tuple[Placement, Move]]]:
+        """Previous state and move of every reachable state"""
+        rotations = len(self.tetris.shapes)
+        parents = {self.spawn: None}
+        queue = deque([self.spawn])
+        while queue:
+            state = queue.popleft()
+            index, x, y = state
+            # 同样步数时优先在上方横移和旋转
+            for child, move in (((index, x - 1, y), Move.LEFT),
+                                ((index, x + 1, y), Move.RIGHT),
+                                (((index - 1) % rotations, x, y),
+                                 Move.ROTATE), ((index, x, y + 1), Move.DOWN)):
+                # 只走填充得到的可达状态
+                if (child in parents or not self.visited.get(child[:2], 0) >>
+                    (child[2] + 2) & 1):
+                    continue
+                parents[child] = (state, move)
+                queue.append(child)
+        return parents
+
+
+def reachable(rows: List[int],
+              tetris: Type[Tetris]) -> Dict[Placement, List[Move]]:
+    """Every reachable lock placement of a tetris with its shortest path"""
+    generator = MoveGenerator(rows, tetris)
+    return {
+        placement: generator.path(placement)
+        for placement in generator.search()
+    }
+
+
+def reachable_pierre_dellacherie(
+        stats: BoardStats,
+        current: List[np.ndarray],
+        weights: Weights = EL_TETRIS) -> List[Result]:
+    """Pierre Dellacherie ranking of the reachable placements
+
+    Same scoring as ``incremental_pierre_dellacherie``, but over the lock
+    placements of the move generator instead of straight drops.
+    """
+    shapes = shapes_of(current)
+    placements = MoveGenerator(stats.rows, tetris_of(current)).search()
+    results = [
+        placement_result(stats, shapes[index], index, x, y, weights)
+        for index, x, y in placements
+    ]
+    return sorted(results, key=lambda x: (x.score, -x.priority), reverse=True)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 17:02:36
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 17:02:36
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .ai import Batch
+
+
+class MLP(object):
+    """Multilayer perceptron value function in NumPy
+
+    Inputs are registered batch features, flattened and concatenated, so
+    either hand made features or the board cells (``cells``) can be used.
+    Hidden layers use ReLU and the output layer has one linear unit.
+
+    The ``.npz`` file holds ``features`` (names), ``mean`` and ``std`` of
+    the inputs and ``weight_<i>``, ``bias_<i>`` of every layer.
+
+    Attributes:
+        name (str): Name used for the candidate arrays
+        features (Tuple[str, ...]): Input features
+        weights (List[np.ndarray]): Weight matrix of each layer
+        biases (List[np.ndarray]): Bias of each layer
+        mean (np.ndarray): Mean subtracted from the inputs
+        std (np.ndarray): Standard deviation dividing the inputs
+    """
+
+    def __init__(self,
+                 features: Sequence[str],
+                 weights: List[np.ndarray],
+                 biases: List[np.ndarray],
+                 mean: Optional[np.ndarray] = None,
+                 std: Optional[np.ndarray] = None,
+                 name: str = "mlp"):
+        self.name = name
+        self.features = tuple(features)
+        self.weights = [np.asarray(weight, np.float64) for weight in weights]
+        self.biases = [np.asarray(bias, np.float64) for bias in biases]
+        size = self.weights[0].shape[0]
+        self.mean = (np.zeros(size) if mean is None else np.asarray(
+            mean, np.float64))
+        self.std = np.ones(size) if std is None else np.asarray(
+            std, np.float64)
+
+    @classmethod
+    def random(cls,
+               features: Sequence[str],
+               inputs: int,
+               hidden: Sequence[int] = (32,),
+               seed: int = 0) -> "MLP":
+        """He-initialized network, e.g. as a starting point for training"""
+        rng = np.random.RandomState(seed)
+        sizes = [inputs] + list(hidden) + [1]
+        weights = [
+            rng.randn(a, b) * np.sqrt(2. / a)
+            for a, b in zip(sizes[:-1], sizes[1:])
+        ]
+        biases = [np.zeros(b) for b in sizes[1:]]
+        return cls(features, weights, biases)
+
+    @classmethod
+    def load(cls, path: str) -> "MLP":
+        with np.load(path) as data:
+            layers = sum(key.startswith("weight_") for key in data.files)
+            return cls([str(name) for name in data["features"]],
+                       [data[f"weight_{i}"] for i in range(layers)],
+                       [data[f"bias_{i}"] for i in range(layers)],
+                       data["mean"], data["std"])
+
+    def save(self, path: str):
+        layers = {}
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            layers[f"weight_{i}"] = weight
+            layers[f"bias_{i}"] = bias
+        np.savez(path,
+                 features=np.array(self.features),
+                 mean=self.mean,
+                 std=self.std,
+                 **layers)
+
+    def inputs(self, batch: Batch) -> np.ndarray:
+        """Input matrix of a batch, one row per placement"""
+        if not len(batch):
+            # 无处可放时没有行, 不能按行重排特征
+            return np.zeros((0, self.weights[0].shape[0]))
+        return np.concatenate([
+            batch[feature].reshape(len(batch), -1) for feature in self.features
+        ],
+                              axis=1).astype(np.float64)
+
+    def __call__(self, inputs: np.ndarray) -> np.ndarray:
+        """Values of a matrix of inputs, ``(N, D)`` to ``(N,)``"""
+        hidden = (inputs - self.mean) / self.std
+        for weight, bias in zip(self.weights[:-1], self.biases[:-1]):
+            hidden = np.maximum(hidden @ weight + bias, 0.)
+        return (hidden @ self.weights[-1] + self.biases[-1])[:, 0]
+
+    def score(self, batch: Batch) -> np.ndarray:
+        """Evaluator interface, see ``ai.Evaluator``"""
+        return self(self.inputs(batch))
+
+    def score_many(self, batches: Sequence[Batch]) -> List[np.ndarray]:
+        """Score several batches with one pass through the network"""
+        if not batches:
+            return []
+        values = self(np.concatenate([self.inputs(batch) for batch in batches]))
+        bounds = np.cumsum([len(batch) for batch in batches])[:-1]
+        return np.split(values, bounds)
+
+
+def linear(features: Sequence[str], weights: Sequence[float]) -> MLP:
+    """Network without hidden layers equal to a linear evaluator"""
+    return MLP(features, [np.array(weights, np.float64)[:, None]],
+               [np.zeros(1)])
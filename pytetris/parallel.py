@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 13:01:15
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 13:01:15
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Type, Tuple, Optional, Sequence
+
+import numpy as np
+
+from .features import BoardStats
+from .tetris import REGISTRY, Tetris, shapes_of, tetris_of
+from .search import Searcher
+from .ai import Result, incremental_pierre_dellacherie
+
+_searcher: Optional[Searcher] = None
+
+
+def _init_worker(searcher: Searcher):
+    global _searcher
+    _searcher = searcher
+
+
+def _evaluate(rows: Tuple[int, ...], pieces: Tuple[str, ...],
+              bag: Tuple[str, ...]) -> float:
+    """Value of a board in a worker process
+
+    Boards travel as row bitmasks and tetrises as registry names.
+    """
+    return _searcher.value(BoardStats(list(rows)),
+                           [REGISTRY[name].matrixs for name in pieces],
+                           [REGISTRY[name] for name in bag])
+
+
+class Decision(object):
+    """Pending parallel decision
+
+    Attributes:
+        results (List[Result]): First ply placements
+        futures (List[Future]): Values of the boards after each placement
+    """
+
+    def __init__(self, results: List[Result], futures: List[Future]):
+        self.results = results
+        self.futures = futures
+
+    def cancel(self):
+        """Drop the work not started yet, running work is ignored"""
+        for future in self.futures:
+            future.cancel()
+
+    def done(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+    def result(self, timeout: Optional[float] = None) -> List[Result]:
+        results = []
+        for result, future in zip(self.results, self.futures):
+            value = future.result(timeout)
+            results.append(
+                Result(result.index, result.x, result.y, result.score + value,
+                       result.priority))
+        return sorted(results,
+                      key=lambda x: (x.score, -x.priority),
+                      reverse=True)
+
+
+class ParallelSearch(object):
+    """Evaluate the first ply placements of a search in a process pool
+
+    The pool is persistent and every worker holds its own copy of the
+    searcher, so memoized values survive between decisions.
+
+    Attributes:
+        searcher (Searcher): Search evaluating the board of each placement
+        width (Optional[int]): Number of first ply placements, None for all
+        executor (ProcessPoolExecutor): Process pool
+        pending (Optional[Decision]): Last submitted decision
+    """
+
+    def __init__(self,
+                 searcher: Searcher,
+                 workers: Optional[int] = None,
+                 width: Optional[int] = None):
+        self.searcher = searcher
+        self.width = width
+        self.executor = ProcessPoolExecutor(max_workers=workers,
+                                            initializer=_init_worker,
+                                            initargs=(searcher,))
+        self.pending: Optional[Decision] = None
+
+    def submit(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> Decision:
+        """Start a decision, the previous one is cancelled
+
+        Args:
+            stats (BoardStats): Statistics of the game board
+            pieces (List[List[np.ndarray]]): Shapes of the known registered
+                tetrises, current first
+            bag (Sequence[Type[Tetris]], optional): Tetrises left in the bag
+        """
+        self.cancel()
+        shapes = shapes_of(pieces[0])
+        rest = tuple(tetris_of(piece).name for piece in pieces[1:])
+        bag = tuple(tetris.name for tetris in bag)
+        results = []
+        futures = []
+        for result in incremental_pierre_dellacherie(
+                stats, pieces[0], self.searcher.weights)[:self.width]:
+            child = stats.copy()
+            child.place(shapes[result.index], result.x, result.y)
+            if child.check_gameover():
+                continue
+            results.append(result)
+            futures.append(
+                self.executor.submit(_evaluate, tuple(child.rows), rest, bag))
+        self.pending = Decision(results, futures)
+        return self.pending
+
+    def search(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        return self.submit(stats, pieces, bag).result()
+
+    def cancel(self):
+        """Drop the pending decision, e.g. when the tetris locks"""
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown()
@@ -0,0 +1,684 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 12:02:51
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 12:02:51
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Type, Tuple, Union, Optional, FrozenSet, Sequence
+
+import numpy as np
+
+from .features import BoardStats
+from .book import OpeningBook
+from .cache import MIRRORS, LRUCache
+from .tetris import REGISTRY, TETRISES, Tetris, shapes_of, tetris_of
+from .weights import EL_TETRIS, Weights, load_weights
+from .neural import MLP
+from .moves import reachable_pierre_dellacherie
+from .ai import (EVALUATORS, Batch, Result, Evaluator, evaluate, results_of,
+                 placement_priority, incremental_pierre_dellacherie)
+
+
+class Greedy(object):
+    """One-piece Pierre Dellacherie player
+
+    Attributes:
+        weights (Weights): Feature weights
+    """
+
+    def __init__(self, weights: Weights = EL_TETRIS):
+        self.weights = weights
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        return 0.
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        return incremental_pierre_dellacherie(stats, pieces[0], self.weights)
+
+
+class Reachable(object):
+    """One-piece Pierre Dellacherie player over the reachable placements
+
+    Tucks and spins found by ``moves.MoveGenerator`` are ranked along with
+    the straight drops, and drops the game moves cannot reach are left out.
+
+    Attributes:
+        weights (Weights): Feature weights
+    """
+
+    def __init__(self, weights: Weights = EL_TETRIS):
+        self.weights = weights
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        return 0.
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        return reachable_pierre_dellacherie(stats, pieces[0], self.weights)
+
+
+class EvaluatorSearch(object):
+    """One-piece player ranking placements with a registered evaluator
+
+    Placements are scored on a stack of candidate boards, so evaluators
+    with features the board statistics do not track can play as well.
+
+    Attributes:
+        evaluator (Evaluator): Evaluator ranking the placements
+    """
+
+    def __init__(self, evaluator: Union[str, Evaluator] = "el-tetris"):
+        self.evaluator = (EVALUATORS[evaluator]
+                          if isinstance(evaluator, str) else evaluator)
+
+    @classmethod
+    def from_spec(cls, name: str) -> "EvaluatorSearch":
+        return cls(name or "el-tetris")
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        return 0.
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        candidates = evaluate(stats.matrix, pieces[0], [self.evaluator])
+        return results_of(candidates[self.evaluator.name])
+
+
+class NeuralSearch(object):
+    """Player ranking placements with a neural value function
+
+    With a next tetris, the ``width`` best placements are expanded and the
+    follow-ups on every expanded board go through the network in a single
+    pass, so the lookahead costs one matrix multiply per layer.
+
+    Attributes:
+        network (MLP): Value function
+        width (int): Number of first ply placements to expand
+    """
+
+    def __init__(self, network: MLP, width: int = 8):
+        self.network = network
+        self.width = width
+
+    @classmethod
+    def from_spec(cls, path: str) -> "NeuralSearch":
+        return cls(MLP.load(path))
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        if not pieces:
+            return 0.
+        if stats.check_gameover():
+            return float("-inf")
+        values = self.network.score(Batch(stats.matrix, pieces[0]))
+        return float(values.max()) if len(values) else float("-inf")
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        candidates = evaluate(stats.matrix, pieces[0], [self.network])
+        results = results_of(candidates[self.network.name])
+        if len(pieces) < 2:
+            return results
+
+        shapes = shapes_of(pieces[0])
+        expanded = []
+        batches = []
+        for result in results[:self.width]:
+            child = stats.copy()
+            child.place(shapes[result.index], result.x, result.y)
+            expanded.append(result)
+            batches.append(None if child.check_gameover() else Batch(
+                child.matrix, pieces[1]))
+        values = iter(
+            self.network.score_many(
+                [batch for batch in batches if batch is not None]))
+
+        ranked = []
+        for result, batch in zip(expanded, batches):
+            follow_up = next(values) if batch is not None else []
+            score = result.score + (float(follow_up.max())
+                                    if len(follow_up) else float("-inf"))
+            ranked.append(
+                Result(result.index, result.x, result.y, score,
+                       result.priority))
+        return sorted(ranked,
+                      key=lambda x: (x.score, -x.priority),
+                      reverse=True)
+
+
+class Lookahead(object):
+    """Two-piece lookahead over the current and the next tetris
+
+    Each placement of the current tetris is scored by its own evaluation
+    plus the best placement of the next tetris on the resulting board.
+    Only the ``width`` best placements of the first ply are expanded, and
+    the best follow-up of every board is cached by its Zobrist hash, so
+    duplicate boards in one decision and repeated decisions during a fall
+    cost a dict lookup.
+
+    Attributes:
+        width (int): Number of first ply placements to expand
+        cache_size (int): Max number of cached boards
+        cache (LRUCache): Best follow-up score of each board
+        weights (Weights): Feature weights
+    """
+
+    def __init__(self,
+                 width: int = 8,
+                 cache_size: int = 100000,
+                 weights: Weights = EL_TETRIS):
+        self.width = width
+        self.cache_size = cache_size
+        self.cache = LRUCache(cache_size)
+        self.weights = weights
+
+    @property
+    def hits(self) -> int:
+        return self.cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self.cache.misses
+
+    def follow_up(self, stats: BoardStats, next_: List[np.ndarray]) -> float:
+        """Best score of the next tetris on a board
+
+        Args:
+            stats (BoardStats): Statistics of the board after clearing
+            next_ (List[np.ndarray]): Shapes of the next tetris
+        """
+        key = (stats.hash, shapes_of(next_))
+        score = self.cache.get(key)
+        if score is not None:
+            return score
+
+        if stats.check_gameover():
+            score = float("-inf")
+        else:
+            results = incremental_pierre_dellacherie(stats, next_,
+                                                     self.weights)
+            score = results[0].score if results else float("-inf")
+        self.cache.put(key, score)
+        return score
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        return self.follow_up(stats, pieces[0]) if pieces else 0.
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        if len(pieces) < 2:
+            return incremental_pierre_dellacherie(stats, pieces[0],
+                                                  self.weights)
+        return self.search(stats, pieces[0], pieces[1])
+
+    def search(self, stats: BoardStats, current: List[np.ndarray],
+               next_: List[np.ndarray]) -> List[Result]:
+        """Rank placements of the current tetris with the next one in mind
+
+        Args:
+            stats (BoardStats): Statistics of the game board
+            current (List[np.ndarray]): Shapes of the current tetris
+            next_ (List[np.ndarray]): Shapes of the next tetris
+
+        Returns:
+            List[Result]: The expanded placements, best first
+        """
+        shapes = shapes_of(current)
+        results = []
+        for result in incremental_pierre_dellacherie(
+                stats, current, self.weights)[:self.width]:
+            child = stats.copy()
+            child.place(shapes[result.index], result.x, result.y)
+            score = result.score + self.follow_up(child, next_)
+            results.append(
+                Result(result.index, result.x, result.y, score,
+                       result.priority))
+        logging.debug(f"[Lookahead] hits: {self.hits}, misses: {self.misses}")
+        return sorted(results,
+                      key=lambda x: (x.score, -x.priority),
+                      reverse=True)
+
+
+@dataclass
+class SearchInfo(object):
+    depth: int
+    nodes: int
+    elapsed: float
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed else 0.
+
+
+@dataclass
+class Node(object):
+    stats: BoardStats
+    score: float
+    root: Optional[Result]
+
+
+class BeamSearch(object):
+    """Anytime beam search over the known tetris queue
+
+    Every depth expands the ``width`` best boards of the previous depth
+    with the next tetris of the queue. The search stops when the queue is
+    exhausted or the time budget runs out, and ranks first moves by the
+    best board reached from them at the deepest finished depth.
+
+    Attributes:
+        width (int): Number of boards kept per depth
+        budget (Optional[float]): Default time budget in seconds
+        info (Optional[SearchInfo]): Information of the last search
+        weights (Weights): Feature weights
+    """
+
+    def __init__(self,
+                 width: int = 16,
+                 budget: Optional[float] = None,
+                 weights: Weights = EL_TETRIS):
+        self.width = width
+        self.budget = budget
+        self.info: Optional[SearchInfo] = None
+        self.weights = weights
+
+    def search(self,
+               stats: BoardStats,
+               pieces: List[List[np.ndarray]],
+               budget: Optional[float] = None) -> List[Result]:
+        """Search the best placement of the first tetris in the queue
+
+        Args:
+            stats (BoardStats): Statistics of the game board
+            pieces (List[List[np.ndarray]]): Shapes of the known tetrises,
+                current first
+            budget (Optional[float], optional): Time budget in seconds.
+                Defaults to the budget of the search.
+
+        Returns:
+            List[Result]: First moves ranked by their best board
+        """
+        budget = self.budget if budget is None else budget
+        start = time.perf_counter()
+        deadline = start + budget if budget is not None else float("inf")
+
+        root = Node(stats, 0., None)
+        beam, nodes = self._expand([root], pieces[0], float("inf"))
+        depth = 1
+        for piece in pieces[1:]:
+            layer, expanded = self._expand(beam, piece, deadline)
+            nodes += expanded
+            # 超时或全部失败时保留上一层的结果
+            if not layer:
+                break
+            beam = layer
+            depth += 1
+
+        roots: Dict[Tuple[int, int, int], Result] = {}
+        for node in beam:
+            key = (node.root.index, node.root.x, node.root.y)
+            if key not in roots:
+                roots[key] = Result(node.root.index, node.root.x, node.root.y,
+                                    node.score, node.root.priority)
+
+        self.info = SearchInfo(depth, nodes, time.perf_counter() - start)
+        logging.debug(f"[BeamSearch] depth: {depth}, nodes: {nodes}, "
+                      f"nodes/s: {self.info.nodes_per_second:.0f}")
+        return sorted(roots.values(),
+                      key=lambda x: (x.score, -x.priority),
+                      reverse=True)
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        if not pieces:
+            return 0.
+        results = self.search(stats, pieces)
+        return results[0].score if results else float("-inf")
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        return self.search(stats, pieces)
+
+    def _expand(self, beam: List[Node], piece: List[np.ndarray],
+                deadline: float) -> Tuple[Optional[List[Node]], int]:
+        """Expand every board of the beam with a tetris
+
+        Returns:
+            Tuple[Optional[List[Node]], int]: The next beam, None if the
+                deadline passed, and the number of evaluated nodes
+        """
+        shapes = shapes_of(piece)
+        layer: Dict[Tuple[int, ...], Node] = {}
+        nodes = 0
+        for node in beam:
+            if time.perf_counter() > deadline:
+                return None, nodes
+            for result in incremental_pierre_dellacherie(
+                    node.stats, piece, self.weights):
+                nodes += 1
+                child = node.stats.copy()
+                child.place(shapes[result.index], result.x, result.y)
+                if child.check_gameover():
+                    continue
+                score = node.score + result.score
+                key = tuple(child.rows)
+                if key not in layer or layer[key].score < score:
+                    layer[key] = Node(child, score, node.root or result)
+        return sorted(layer.values(), key=lambda x: x.score,
+                      reverse=True)[:self.width], nodes
+
+
+class Expectimax(object):
+    """Expectimax search over the pieces the 7-bag can still deal
+
+    Known tetrises are max nodes. After them every chance node averages
+    over the tetrises left in the bag only, and the bag refills with all
+    seven once it is empty. Chance nodes are memoized on the board, the
+    bag and the remaining depth.
+
+    Attributes:
+        depth (int): Number of unknown tetrises to search
+        width (int): Number of placements expanded at each max node
+        loss (float): Value of a lost game
+        cache_size (int): Max number of memoized chance nodes
+        cache (LRUCache): Value of each chance node
+        weights (Weights): Feature weights
+    """
+
+    def __init__(self,
+                 depth: int = 1,
+                 width: int = 4,
+                 loss: float = -1e6,
+                 cache_size: int = 100000,
+                 weights: Weights = EL_TETRIS):
+        self.depth = depth
+        self.width = width
+        self.loss = loss
+        self.cache_size = cache_size
+        self.cache = LRUCache(cache_size)
+        self.weights = weights
+
+    @property
+    def hits(self) -> int:
+        return self.cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self.cache.misses
+
+    def search(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]]) -> List[Result]:
+        """Rank placements of the current tetris by their expected value
+
+        Args:
+            stats (BoardStats): Statistics of the game board
+            pieces (List[List[np.ndarray]]): Shapes of the known tetrises,
+                current first
+            bag (Sequence[Type[Tetris]]): Tetrises left in the bag
+
+        Returns:
+            List[Result]: The expanded placements, best first
+        """
+        bag = frozenset(bag)
+        results = []
+        for result, child in self._children(stats, pieces[0]):
+            score = result.score + self._value(child, pieces[1:], bag,
+                                               self.depth)
+            results.append(
+                Result(result.index, result.x, result.y, score,
+                       result.priority))
+        logging.debug(f"[Expectimax] hits: {self.hits}, misses: {self.misses}")
+        return sorted(results,
+                      key=lambda x: (x.score, -x.priority),
+                      reverse=True)
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]]) -> float:
+        """Value of a board before the given tetrises are placed"""
+        return self._value(stats, pieces, frozenset(bag), self.depth)
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        return self.search(stats, pieces, bag)
+
+    def _children(self, stats: BoardStats, piece: List[np.ndarray]):
+        shapes = shapes_of(piece)
+        for result in incremental_pierre_dellacherie(
+                stats, piece, self.weights)[:self.width]:
+            child = stats.copy()
+            child.place(shapes[result.index], result.x, result.y)
+            if not child.check_gameover():
+                yield result, child
+
+    def _max_value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+                   bag: FrozenSet[Type[Tetris]], depth: int) -> float:
+        best = self.loss
+        for result, child in self._children(stats, pieces[0]):
+            best = max(best,
+                       result.score + self._value(child, pieces[1:], bag, depth))
+        return best
+
+    def _value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: FrozenSet[Type[Tetris]], depth: int) -> float:
+        if pieces:
+            return self._max_value(stats, pieces, bag, depth)
+        if depth == 0:
+            return 0.
+
+        key = (stats.hash, bag, depth)
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        # 空袋时重新装满 7 种方块
+        possible = bag or frozenset(TETRISES)
+        value = sum(
+            self._max_value(stats, [tetris.matrixs], possible - {tetris},
+                            depth - 1) for tetris in possible) / len(possible)
+        self.cache.put(key, value)
+        return value
+
+
+class CachedSearch(object):
+    """Memoize the decisions and values of a search
+
+    Entries are keyed by the Zobrist hash of the board, the known tetrises
+    and the bag. With ``mirror`` a board and its mirror image share one
+    entry, since every feature is symmetric. Mirrored answers get their
+    tie break priority recomputed, so a cached ranking may order tied
+    placements differently from a fresh search of searches that truncate
+    ties, hence it is off by default.
+
+    Attributes:
+        searcher (Searcher): Memoized search
+        mirror (bool): Whether to share entries between mirror images
+        cache (LRUCache): Cached rankings and values
+    """
+
+    def __init__(self,
+                 searcher: "Searcher",
+                 size: int = 100000,
+                 mirror: bool = False):
+        self.searcher = searcher
+        self.mirror = mirror
+        self.cache = LRUCache(size)
+
+    @property
+    def weights(self) -> Weights:
+        return self.searcher.weights
+
+    @property
+    def hits(self) -> int:
+        return self.cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self.cache.misses
+
+    def _key(self, kind: str, stats: BoardStats,
+             pieces: List[List[np.ndarray]],
+             bag: Sequence[Type[Tetris]]) -> Tuple[Tuple, bool]:
+        """Canonical key of a query and whether it is the mirrored one"""
+        names = tuple(tetris_of(piece).name for piece in pieces)
+        left = tuple(sorted(tetris.name for tetris in bag))
+        key = (kind, stats.hash, names, left)
+        if not self.mirror:
+            return key, False
+        mirrored = (kind, stats.mirror_hash,
+                    tuple(MIRRORS[name][0] for name in names),
+                    tuple(sorted(MIRRORS[name][0] for name in left)))
+        return (mirrored, True) if mirrored < key else (key, False)
+
+    @staticmethod
+    def _flip(name: str, results: List[Result]) -> List[Result]:
+        """Mirror the placements of a tetris"""
+        other, entries = MIRRORS[name]
+        shapes = REGISTRY[other].shapes
+        flipped = []
+        for result in results:
+            index, dx, dy = entries[result.index]
+            x = dx - result.x
+            flipped.append(
+                Result(index, x, result.y + dy, result.score,
+                       placement_priority(shapes[index], index, x)))
+        # 先按生成顺序排列, 使完全相同的平局与新搜索的顺序一致
+        flipped.sort(key=lambda x: (x.index, x.x))
+        return sorted(flipped,
+                      key=lambda x: (x.score, -x.priority),
+                      reverse=True)
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        key, _ = self._key("value", stats, pieces, bag)
+        value = self.cache.get(key)
+        if value is None:
+            value = self.searcher.value(stats, pieces, bag)
+            self.cache.put(key, value)
+        return value
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        key, flipped = self._key("decide", stats, pieces, bag)
+        name = tetris_of(pieces[0]).name
+        results = self.cache.get(key)
+        if results is None:
+            results = self.searcher.decide(stats, pieces, bag)
+            # 以镜像方向存储
+            self.cache.put(key,
+                           self._flip(name, results) if flipped else results)
+        elif flipped:
+            results = self._flip(MIRRORS[name][0], results)
+        logging.debug(f"[CachedSearch] hits: {self.hits}, "
+                      f"misses: {self.misses}, "
+                      f"hit rate: {self.cache.hit_rate:.2%}")
+        return list(results)
+
+
+class BookSearch(object):
+    """Play from an opening book, searching positions it does not have
+
+    The book only holds the best move, so a hit ranks that one placement.
+
+    Attributes:
+        searcher (Searcher): Search used outside the book
+        book (OpeningBook): Memory-mapped opening book
+        hits (int): Decisions answered by the book
+        misses (int): Decisions left to the search
+    """
+
+    def __init__(self, searcher: "Searcher", book: OpeningBook):
+        self.searcher = searcher
+        self.book = book
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "BookSearch":
+        """``<path>[:<search>[:<weights>]]``, the search defaults to greedy"""
+        path, _, fallback = spec.partition(":")
+        return cls(searcher_of(fallback or "greedy"), OpeningBook(path))
+
+    @property
+    def weights(self) -> Weights:
+        return self.searcher.weights
+
+    def value(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+              bag: Sequence[Type[Tetris]] = ()) -> float:
+        """Value of a board before the given tetrises are placed"""
+        return self.searcher.value(stats, pieces, bag)
+
+    def decide(self, stats: BoardStats, pieces: List[List[np.ndarray]],
+               bag: Sequence[Type[Tetris]] = ()) -> List[Result]:
+        """Rank placements of the current tetris, ``pieces[0]``"""
+        if len(pieces) > 1:
+            result = self.book.lookup(stats, tetris_of(pieces[0]),
+                                      tetris_of(pieces[1]), bag)
+            if result is not None:
+                self.hits += 1
+                return [result]
+        self.misses += 1
+        return self.searcher.decide(stats, pieces, bag)
+
+
+Searcher = Union[Greedy, Reachable, EvaluatorSearch, NeuralSearch,
+                 Lookahead, BeamSearch, Expectimax, CachedSearch, BookSearch]
+
+SEARCHES: Dict[str, Type[Searcher]] = {
+    "greedy": Greedy,
+    "reachable": Reachable,
+    "evaluator": EvaluatorSearch,
+    "neural": NeuralSearch,
+    "lookahead": Lookahead,
+    "beam": BeamSearch,
+    "expectimax": Expectimax,
+    "book": BookSearch
+}
+
+
+def searcher_of(spec: str) -> Searcher:
+    """Build a search from ``<search>[:<weights>]``, e.g. ``lookahead:tuned``
+
+    Searches with a ``from_spec`` classmethod read the part after the
+    colon themselves, e.g. ``evaluator:yiyuan-lee``,
+    ``neural:model.npz`` or ``book:book.npy:lookahead``.
+
+    Args:
+        spec (str): Name in SEARCHES and optional name of the weights.
+            Weights default to El-Tetris.
+
+    Raises:
+        KeyError: Unknown search, weights or evaluator
+    """
+    name, _, arg = spec.partition(":")
+    search = SEARCHES[name]
+    if hasattr(search, "from_spec"):
+        return search.from_spec(arg)
+    return search(weights=load_weights(arg or "el-tetris"))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 15:06:44
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 15:06:44
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+from dataclasses import dataclass
+from typing import Optional
+
+from .search import Searcher
+from .engine import GameState
+
+# 默认每局的方块数上限, 贪心 AI 几乎不会结束游戏
+MAX_PIECES = 1000
+
+
+@dataclass
+class GameResult(object):
+    seed: int
+    pieces: int
+    lines: int
+    score: int
+
+
+def autoplay(searcher: Searcher,
+             state: GameState,
+             max_pieces: Optional[int] = MAX_PIECES) -> GameState:
+    """Let the AI place the tetrises of a game state
+
+    The AI sees the current and the next tetris and the bag, like in the
+    game. Tetrises drop straight from above, there is no gravity. The
+    rules are those of ``GameState``, the same as in the game.
+
+    Args:
+        searcher (Searcher): AI playing the game
+        state (GameState): Game to play, changed in place
+        max_pieces (Optional[int], optional): Stop once this many
+            tetrises are locked, None plays until game over. Defaults to
+            MAX_PIECES.
+
+    Returns:
+        GameState: The state, ``over`` unless stopped by ``max_pieces``
+    """
+    while not state.over and (max_pieces is None or
+                              state.pieces < max_pieces):
+        choices = searcher.decide(
+            state.stats, [state.current.matrixs, state.next.matrixs],
+            [type(tetris) for tetris in state.bag])
+        if not choices:
+            # 无处可放, 视为结束
+            state.over = True
+            break
+        best = choices[0]
+        state.place(best.index, best.x, best.y)
+    return state
+
+
+def play(searcher: Searcher,
+         seed: int,
+         max_pieces: Optional[int] = MAX_PIECES,
+         start_line: int = 0) -> GameResult:
+    """Play a headless game with the rules of the game
+
+    Args:
+        searcher (Searcher): AI playing the game
+        seed (int): Seed of the tetrises and the start lines
+        max_pieces (Optional[int], optional): Stop after this many
+            tetrises, None plays until game over. Defaults to MAX_PIECES.
+        start_line (int, optional): Number of random start lines.
+            Defaults to 0.
+    """
+    state = GameState(seed)
+    state.new_game(start_line=start_line)
+    autoplay(searcher, state, max_pieces)
+    return GameResult(seed, state.pieces, state.lines, state.score)
@@ -10,30 +10,98 @@
 """
 __author__ = "yanyongyu"
 
-from typing import List
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
 
 import numpy as np
 
 
+@dataclass(frozen=True, eq=False)
+class Shape(object):
+    """Precomputed placement table of one rotation
+
+    Attributes:
+        matrix (numpy.ndarray): shape matrix
+        height (int): matrix height
+        width (int): matrix width
+        cells (Tuple[Tuple[int, int], ...]): (row, column) of filled cells
+        bottoms (Tuple[int, ...]): lowest filled row of each column, -1 if empty
+        tops (Tuple[int, ...]): highest filled row of each column, -1 if empty
+        first_row (int): first filled row
+        row_masks (Tuple[int, ...]): bitmask of each row, column j is bit j
+        min_x (int): min x keeping the piece inside the 10 columns
+        max_x (int): max x keeping the piece inside the 10 columns
+    """
+
+    matrix: np.ndarray
+    height: int
+    width: int
+    cells: Tuple[Tuple[int, int], ...]
+    bottoms: Tuple[int, ...]
+    tops: Tuple[int, ...]
+    first_row: int
+    row_masks: Tuple[int, ...]
+    min_x: int
+    max_x: int
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray) -> "Shape":
+        height, width = matrix.shape
+        cells = tuple(
+            (i, j) for i in range(height) for j in range(width) if matrix[i, j])
+        columns = [[i for i, j_ in cells if j_ == j] for j in range(width)]
+        filled = [j for j in range(width) if columns[j]]
+        return cls(matrix=matrix,
+                   height=height,
+                   width=width,
+                   cells=cells,
+                   bottoms=tuple(max(rows) if rows else -1 for rows in columns),
+                   tops=tuple(min(rows) if rows else -1 for rows in columns),
+                   first_row=min(i for i, _ in cells),
+                   row_masks=tuple(
+                       sum(1 << j for j in range(width) if matrix[i, j])
+                       for i in range(height)),
+                   min_x=-filled[0],
+                   max_x=9 - filled[-1])
+
+    @property
+    def xs(self) -> range:
+        return range(self.min_x, self.max_x + 1)
+
+
 class Tetris(object):
     """Base Tetris object
 
+    Shape tables live on the class, instances only carry the position.
+
     Attributes:
+        name (str): piece name
+        spawn (Tuple[int, int]): spawn x and y
         matrix (numpy.ndarray): base shape of tetris
         matrixs (List[numpy.ndarray]): List of shapes
+        shapes (Tuple[Shape, ...]): placement tables of shapes
         x (int): X coordinate
         y (int): Y coordinate
         index (int): Index of the shape
     """
 
+    __slots__ = ("x", "y", "index")
+
+    name: str = ""
+    spawn: Tuple[int, int] = (3, -2)
     matrix: np.ndarray = None
     matrixs: List[np.ndarray] = []
+    shapes: Tuple[Shape, ...] = ()
 
     def __init__(self, x: int, y: int, index: int = 0):
         self.x = x
         self.y = y
         self.index = index
 
+    @property
+    def shape(self) -> Shape:
+        return self.shapes[self.index]
+
     def rotate(self, direction: bool = False):
         """Rotate the tetris
 
@@ -66,6 +134,9 @@ class ITetris(Tetris):
         0 0 0 0  0 1 0 0
     """
 
+    __slots__ = ()
+
+    name = "I"
     matrix = np.zeros((4, 4), dtype=np.int)
     matrix[1, :] = 1
     matrixs = [matrix, np.rot90(matrix)]
@@ -79,6 +150,9 @@ class TTetris(Tetris):
         0 0 0  0 1 0  0 1 0  0 1 0
     """
 
+    __slots__ = ()
+
+    name = "T"
     matrix = np.zeros((3, 3), dtype=np.int)
     matrix[0, 1] = 1
     matrix[1, :] = 1
@@ -98,6 +172,9 @@ class LTetris(Tetris):
         0 0 0  0 1 0  1 0 0  0 1 1
     """
 
+    __slots__ = ()
+
+    name = "L"
     matrix = np.zeros((3, 3), dtype=np.int)
     matrix[1, :] = 1
     matrix[0, 2] = 1
@@ -117,6 +194,9 @@ class JTetris(Tetris):
         0 0 0  1 1 0  0 0 1  0 1 0
     """
 
+    __slots__ = ()
+
+    name = "J"
     matrix = np.zeros((3, 3), dtype=np.int)
     matrix[1, :] = 1
     matrix[0, 0] = 1
@@ -135,6 +215,10 @@ class OTetris(Tetris):
         1 1
     """
 
+    __slots__ = ()
+
+    name = "O"
+    spawn = (4, -2)
     matrix = np.ones((2, 2), dtype=np.int)
     matrixs = [matrix]
 
@@ -147,6 +231,9 @@ class ZTetris1(Tetris):
         0 0 0  1 0 0  0 1 1  0 1 0
     """
 
+    __slots__ = ()
+
+    name = "Z"
     matrix = np.zeros((3, 3), dtype=np.int)
     matrix[0, :2] = 1
     matrix[1, 1:] = 1
@@ -161,7 +248,50 @@ class ZTetris2(Tetris):
         0 0 0  0 1 0  1 1 0  0 0 1
     """
 
+    __slots__ = ()
+
+    name = "S"
     matrix = np.zeros((3, 3), dtype=np.int)
     matrix[0, 1:] = 1
     matrix[1, :2] = 1
     matrixs = [matrix, np.rot90(matrix)]
+
+
+TETRISES: Tuple[Type[Tetris], ...] = (ITetris, TTetris, LTetris, JTetris,
+                                      OTetris, ZTetris1, ZTetris2)
+REGISTRY: Dict[str, Type[Tetris]] = {}
+_SHAPES: Dict[int, Tuple[Shape, ...]] = {}
+_TETRISES: Dict[int, Type[Tetris]] = {}
+
+for _tetris in TETRISES:
+    _tetris.shapes = tuple(Shape.from_matrix(shape) for shape in _tetris.matrixs)
+    REGISTRY[_tetris.name] = _tetris
+    _SHAPES[id(_tetris.matrixs)] = _tetris.shapes
+    _TETRISES[id(_tetris.matrixs)] = _tetris
+del _tetris
+
+
+def shapes_of(matrixs: List[np.ndarray]) -> Tuple[Shape, ...]:
+    """Get the placement tables of a list of shapes
+
+    Registered piece shapes are looked up, others are computed.
+
+    Args:
+        matrixs (List[np.ndarray]): List of shapes
+    """
+    shapes = _SHAPES.get(id(matrixs))
+    if shapes is None:
+        shapes = tuple(Shape.from_matrix(shape) for shape in matrixs)
+    return shapes
+
+
+def tetris_of(matrixs: List[np.ndarray]) -> Type[Tetris]:
+    """Get the registered tetris of a list of shapes
+
+    Args:
+        matrixs (List[np.ndarray]): List of shapes
+
+    Raises:
+        KeyError: The shapes are not a registered tetris
+    """
+    return _TETRISES[id(matrixs)]
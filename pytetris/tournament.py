@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 16:21:40
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 16:21:40
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import math
+import logging
+import argparse
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .simulate import MAX_PIECES, GameResult, play
+from .search import Searcher, searcher_of
+
+METRICS = ("lines", "score", "pieces")
+
+# 自由度较小时展开式误差大, 使用精确值
+T_TABLE = (12.706205, 4.302653, 3.182446, 2.776445, 2.570582)
+
+# 每个进程复用同名的搜索及其缓存
+_searchers: Dict[str, Searcher] = {}
+
+
+def _play(spec: str, seed: int, max_pieces: Optional[int]) -> GameResult:
+    searcher = _searchers.get(spec)
+    if searcher is None:
+        searcher = _searchers[spec] = searcher_of(spec)
+    return play(searcher, seed, max_pieces)
+
+
+def t_critical(df: int) -> float:
+    """Two-sided 95% critical value of Student's t distribution
+
+    Exact values up to 5 degrees of freedom, above that the Cornish-Fisher
+    expansion around the normal quantile, within 0.003 of the exact value.
+    """
+    z = 1.959963984540054
+    if df <= 0:
+        return float("inf")
+    if df <= len(T_TABLE):
+        return T_TABLE[df - 1]
+    return (z + (z**3 + z) / (4 * df) + (5 * z**5 + 16 * z**3 + 3 * z) /
+            (96 * df**2) + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) /
+            (384 * df**3))
+
+
+@dataclass
+class Summary(object):
+    """Mean with its 95% confidence interval and median of a metric"""
+
+    mean: float
+    low: float
+    high: float
+    median: float
+
+
+@dataclass
+class Comparison(object):
+    """Paired difference of a metric against the baseline
+
+    Attributes:
+        mean (float): Mean difference per seed
+        low (float): Lower bound of the 95% confidence interval
+        high (float): Upper bound of the 95% confidence interval
+        t (float): Paired t statistic
+        significant (bool): Whether the interval excludes zero
+    """
+
+    mean: float
+    low: float
+    high: float
+    t: float
+    significant: bool
+
+
+def summarize(values: Sequence[float]) -> Summary:
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(values.mean())
+    if len(values) < 2:
+        return Summary(mean, mean, mean, float(np.median(values)))
+    margin = t_critical(len(values) - 1) * float(
+        values.std(ddof=1)) / math.sqrt(len(values))
+    return Summary(mean, mean - margin, mean + margin,
+                   float(np.median(values)))
+
+
+def compare(values: Sequence[float], baseline: Sequence[float]) -> Comparison:
+    """Paired t-test of the games played on the same seeds"""
+    diff = np.asarray(values, dtype=np.float64) - np.asarray(baseline,
+                                                             dtype=np.float64)
+    mean = float(diff.mean())
+    error = (float(diff.std(ddof=1)) / math.sqrt(len(diff))
+             if len(diff) > 1 else 0.)
+    if error == 0.:
+        # 全部相同时无方差, 仅当差值非零时视为显著
+        t = 0. if mean == 0. else math.copysign(float("inf"), mean)
+        return Comparison(mean, mean, mean, t, mean != 0. and len(diff) > 1)
+    margin = t_critical(len(diff) - 1) * error
+    return Comparison(mean, mean - margin, mean + margin, mean / error,
+                      abs(mean) > margin)
+
+
+class Tournament(object):
+    """Paired games of AI contenders on identical seeds
+
+    Every contender plays the same seeds, so the 7-bag sequence and the
+    start lines are shared and the differences per seed only come from
+    the AI. Games run in a process pool.
+
+    Attributes:
+        contenders (List[str]): Searches as ``<search>[:<weights>]``, the
+            first one is the baseline, duplicates are dropped
+        games (int): Games per contender
+        seed (int): Seed of the first game
+        max_pieces (Optional[int]): Tetrises per game, None until game over
+        workers (Optional[int]): Number of processes
+    """
+
+    def __init__(self,
+                 contenders: List[str],
+                 games: int,
+                 seed: int = 0,
+                 max_pieces: Optional[int] = MAX_PIECES,
+                 workers: Optional[int] = None):
+        self.contenders = list(dict.fromkeys(contenders))
+        self.games = games
+        self.seed = seed
+        self.max_pieces = max_pieces
+        self.workers = workers
+
+    def run(self) -> Dict[str, List[GameResult]]:
+        """Play every game
+
+        Returns:
+            Dict[str, List[GameResult]]: Results of each contender by seed
+        """
+        seeds = range(self.seed, self.seed + self.games)
+        jobs = [(spec, seed) for spec in self.contenders for seed in seeds]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = list(
+                executor.map(_play, [spec for spec, _ in jobs],
+                             [seed for _, seed in jobs],
+                             [self.max_pieces] * len(jobs),
+                             chunksize=max(1, len(jobs) // 64)))
+        return {
+            spec: results[index * self.games:(index + 1) * self.games]
+            for index, spec in enumerate(self.contenders)
+        }
+
+    def report(self, results: Dict[str, List[GameResult]]) -> str:
+        """Summaries of every contender and paired comparisons
+
+        Differences against the baseline whose 95% interval excludes zero
+        are flagged with ``*``.
+        """
+        baseline = self.contenders[0]
+        lines = [f"{self.games} games per contender, seeds "
+                 f"{self.seed}..{self.seed + self.games - 1}"]
+        for metric in METRICS:
+            lines.append("")
+            lines.append(f"{metric}:")
+            base = [getattr(result, metric) for result in results[baseline]]
+            for spec in self.contenders:
+                values = [getattr(result, metric) for result in results[spec]]
+                summary = summarize(values)
+                line = (f"  {spec:<32} mean {summary.mean:>10.1f} "
+                        f"[{summary.low:.1f}, {summary.high:.1f}] "
+                        f"median {summary.median:.1f}")
+                if spec != baseline:
+                    comparison = compare(values, base)
+                    line += (f"  diff {comparison.mean:+.1f} "
+                             f"[{comparison.low:+.1f}, {comparison.high:+.1f}]"
+                             f"{' *' if comparison.significant else ''}")
+                lines.append(line)
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="Compare AI contenders on paired seeded games")
+    parser.add_argument("contenders",
+                        nargs="+",
+                        help="<search>[:<weights>], the first is the baseline")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-pieces",
+                        type=int,
+                        default=MAX_PIECES,
+                        help="0 plays until game over")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    tournament = Tournament(args.contenders, args.games, args.seed,
+                            args.max_pieces or None, args.workers)
+    print(tournament.report(tournament.run()))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 15:21:17
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 15:21:17
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional, Sequence
+
+import numpy as np
+
+from .search import Greedy
+from .simulate import MAX_PIECES, play
+from .weights import EL_TETRIS, WEIGHTS_FILE, Weights, save_weights
+
+
+def evaluate(weights: Weights, seed: int, max_pieces: Optional[int]) -> int:
+    """Lines cleared by a greedy player in one seeded game"""
+    return play(Greedy(tuple(weights)), seed, max_pieces).lines
+
+
+class CrossEntropyTuner(object):
+    """Cross-entropy method over the six feature weights
+
+    Every generation samples weight vectors from a diagonal gaussian, plays
+    the same seeded games with each of them in a process pool and refits
+    the gaussian to the elite vectors. Games use the incremental evaluator
+    on board statistics, the fastest path of the AI.
+
+    Attributes:
+        population (int): Weight vectors per generation
+        elite (int): Vectors the gaussian is refitted to
+        games (int): Games per vector
+        max_pieces (Optional[int]): Tetrises per game, None until game over
+        noise (float): Extra standard deviation against early convergence
+        random (np.random.RandomState): Random generator of the vectors
+        seed (int): Seed of the first game
+        workers (Optional[int]): Number of processes
+        best (Optional[Tuple[float, Weights]]): Best mean lines and weights
+    """
+
+    def __init__(self,
+                 population: int = 50,
+                 elite: int = 10,
+                 games: int = 10,
+                 max_pieces: Optional[int] = MAX_PIECES,
+                 noise: float = 0.5,
+                 seed: int = 0,
+                 workers: Optional[int] = None):
+        self.population = population
+        self.elite = elite
+        self.games = games
+        self.max_pieces = max_pieces
+        self.noise = noise
+        self.random = np.random.RandomState(seed)
+        self.seed = seed
+        self.workers = workers
+        self.best: Optional[Tuple[float, Weights]] = None
+
+    def fitness(self, executor: ProcessPoolExecutor,
+                samples: Sequence[Weights], seeds: List[int]) -> np.ndarray:
+        """Mean lines of every weight vector over the same games"""
+        jobs = [(weights, seed) for weights in samples for seed in seeds]
+        lines = list(
+            executor.map(evaluate, [weights for weights, _ in jobs],
+                         [seed for _, seed in jobs],
+                         [self.max_pieces] * len(jobs),
+                         chunksize=max(1, len(jobs) // 64)))
+        return np.array(lines, dtype=np.float64).reshape(
+            len(samples), len(seeds)).mean(axis=1)
+
+    def tune(self,
+             generations: int,
+             mean: Sequence[float] = EL_TETRIS,
+             std: Optional[Sequence[float]] = None,
+             name: Optional[str] = None,
+             path: str = WEIGHTS_FILE) -> Weights:
+        """Run the optimizer
+
+        Args:
+            generations (int): Number of generations
+            mean (Sequence[float], optional): Initial mean. Defaults to
+                EL_TETRIS.
+            std (Optional[Sequence[float]], optional): Initial standard
+                deviation. Defaults to the magnitude of the mean.
+            name (Optional[str], optional): Save the best weights under this
+                name after every generation. Defaults to not saving.
+            path (str, optional): Weights file. Defaults to WEIGHTS_FILE.
+
+        Returns:
+            Weights: Best weights found
+        """
+        mean = np.array(mean, dtype=np.float64)
+        std = np.abs(mean) if std is None else np.array(std, dtype=np.float64)
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for generation in range(generations):
+                start = time.perf_counter()
+                samples = self.random.normal(mean, std,
+                                             (self.population, len(mean)))
+                # 同一代的候选使用相同的对局, 减小方差
+                seeds = [
+                    self.seed + generation * self.games + index
+                    for index in range(self.games)
+                ]
+                vectors = [tuple(sample.tolist()) for sample in samples]
+                scores = self.fitness(executor, vectors, seeds)
+
+                order = np.argsort(-scores)[:self.elite]
+                mean = samples[order].mean(axis=0)
+                std = samples[order].std(axis=0) + self.noise / (generation +
+                                                                 1)
+                best = int(order[0])
+                if self.best is None or scores[best] > self.best[0]:
+                    self.best = (float(scores[best]), vectors[best])
+                    if name is not None:
+                        save_weights(name, vectors[best], path)
+                logging.info(
+                    f"[CrossEntropyTuner] generation: {generation}, "
+                    f"best: {scores[best]:.1f}, "
+                    f"elite mean: {scores[order].mean():.1f}, "
+                    f"elapsed: {time.perf_counter() - start:.1f}s")
+        return self.best[1]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(
+        description="Tune the feature weights of the AI")
+    parser.add_argument("name", help="name to save the best weights as")
+    parser.add_argument("--generations", type=int, default=20)
+    parser.add_argument("--population", type=int, default=50)
+    parser.add_argument("--elite", type=int, default=10)
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--max-pieces",
+                        type=int,
+                        default=MAX_PIECES,
+                        help="0 plays until game over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    tuner = CrossEntropyTuner(population=args.population,
+                              elite=args.elite,
+                              games=args.games,
+                              max_pieces=args.max_pieces or None,
+                              seed=args.seed,
+                              workers=args.workers)
+    tuner.tune(args.generations, name=args.name)
+    print(tuner.best)
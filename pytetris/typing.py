@@ -18,3 +18,10 @@ class Scene(Enum):
     REFRESH = auto()
     GAME = auto()
     END = auto()
+
+
+class Move(Enum):
+    LEFT = auto()
+    RIGHT = auto()
+    ROTATE = auto()
+    DOWN = auto()
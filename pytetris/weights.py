@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 14:52:08
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 14:52:08
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import json
+from typing import Dict, Tuple, Sequence
+
+# 评估参数顺序: 方块海拔, 消除行数, 行变换, 列变换, 空洞数, 井深度
+Weights = Tuple[float, float, float, float, float, float]
+
+# Origin PD
+PIERRE_DELLACHERIE: Weights = (-1., 1., -1., -1., -4., -1.)
+# El-Tetris
+# https://imake.ninja/el-tetris-an-improvement-on-pierre-dellacheries-algorithm/
+EL_TETRIS: Weights = (-4.500158825082766, 3.4181268101392694,
+                      -3.2178882868487753, -9.348695305445199,
+                      -7.899265427351652, -3.3855972247263626)
+
+BUILTIN_WEIGHTS: Dict[str, Weights] = {
+    "pierre-dellacherie": PIERRE_DELLACHERIE,
+    "el-tetris": EL_TETRIS
+}
+WEIGHTS_FILE = os.path.join(os.path.dirname(__file__), "weights.json")
+
+
+def read_weights(path: str = WEIGHTS_FILE) -> Dict[str, Weights]:
+    """Read the named weights of a weights file, empty if it is missing"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return {name: tuple(weights) for name, weights in json.load(f).items()}
+
+
+def load_weights(name: str, path: str = WEIGHTS_FILE) -> Weights:
+    """Get weights by name, built-in ones first
+
+    Args:
+        name (str): Name of the weights
+        path (str, optional): Weights file. Defaults to WEIGHTS_FILE.
+
+    Raises:
+        KeyError: No weights of the name
+    """
+    if name in BUILTIN_WEIGHTS:
+        return BUILTIN_WEIGHTS[name]
+    return read_weights(path)[name]
+
+
+def save_weights(name: str, weights: Sequence[float],
+                 path: str = WEIGHTS_FILE):
+    """Add or replace weights in a weights file
+
+    Args:
+        name (str): Name of the weights
+        weights (Sequence[float]): Six feature weights
+        path (str, optional): Weights file. Defaults to WEIGHTS_FILE.
+
+    Raises:
+        ValueError: Not six weights or a built-in name
+    """
+    if len(weights) != 6:
+        raise ValueError(f"Expected 6 weights, got {len(weights)}")
+    if name in BUILTIN_WEIGHTS:
+        raise ValueError(f"Cannot overwrite built-in weights {name!r}")
+    saved = read_weights(path)
+    saved[name] = tuple(float(weight) for weight in weights)
+    # 先写临时文件再替换, 避免中断时损坏
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(saved, f, indent=2)
+    os.replace(tmp, path)
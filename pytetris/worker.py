@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 13:40:22
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 13:40:22
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import queue
+import logging
+import threading
+import multiprocessing
+from typing import Dict, Type, Tuple, Optional, Sequence
+
+from .ai import Result
+from .search import Searcher
+from .features import BoardStats
+from .tetris import REGISTRY, Tetris
+
+
+def _decide(searchers: Dict[str, Searcher], name: str, rows: Tuple[int, ...],
+            pieces: Tuple[str, ...], bag: Tuple[str, ...]) -> Optional[Tuple]:
+    try:
+        choices = searchers[name].decide(
+            BoardStats(list(rows)),
+            [REGISTRY[piece].matrixs for piece in pieces],
+            [REGISTRY[piece] for piece in bag])
+    except Exception as e:
+        logging.exception(e)
+        return None
+    if not choices:
+        return None
+    best = choices[0]
+    return best.index, best.x, best.y, best.score, best.priority
+
+
+def _speculations(rows: Tuple[int, ...], pieces: Tuple[str, ...],
+                  bag: Tuple[str, ...], choice: Tuple):
+    """Requests expected at the next spawn if the choice is played
+
+    The board is the scratch board after the choice and its line clears.
+    The tetris after the known ones is any tetris left in the bag, and the
+    bag refills once it is empty like ``Matrix.next_tetris`` does.
+    """
+    stats = BoardStats(list(rows))
+    stats.place(REGISTRY[pieces[0]].shapes[choice[0]], choice[1], choice[2])
+    if stats.check_gameover():
+        return
+    rows = tuple(stats.rows)
+    for name in sorted(set(bag)):
+        left = tuple(sorted(piece for piece in bag if piece != name))
+        yield rows, pieces[1:] + (name,), left or tuple(sorted(REGISTRY))
+
+
+def _serve(searchers: Dict[str, Searcher], requests, results):
+    """Worker loop, answers requests until it gets None
+
+    Requests are ``(ticket, name, rows, pieces, bag)`` with boards as row
+    bitmasks and tetrises as registry names. Answers are ``(ticket,
+    result, speculated)`` where result is a tuple of ``Result`` fields or
+    None.
+
+    While idle after an answer, the worker speculates on the decisions of
+    the next spawn, so a request matching one is answered at once.
+    """
+    speculated = {}
+    while True:
+        request = requests.get()
+        # 只回答最新的请求
+        while request is not None:
+            try:
+                request = requests.get_nowait()
+            except queue.Empty:
+                break
+        if request is None:
+            break
+
+        ticket, name, rows, pieces, bag = request
+        key = (name, rows, pieces, tuple(sorted(bag)))
+        hit = key in speculated
+        choice = speculated[key] if hit else _decide(searchers, name, rows,
+                                                     pieces, bag)
+        results.put((ticket, choice, hit))
+
+        speculated = {}
+        if choice is None:
+            continue
+        for rows_, pieces_, bag_ in _speculations(rows, pieces, bag, choice):
+            # 有新请求时放弃推测
+            if not requests.empty():
+                break
+            speculated[(name, rows_, pieces_, bag_)] = _decide(
+                searchers, name, rows_, pieces_, bag_)
+
+
+class AIWorker(object):
+    """Run AI decisions off the render loop
+
+    The game submits a board snapshot when a tetris spawns and polls for
+    the answer every frame. Answers to older snapshots are dropped. The
+    worker precomputes the decisions of the next spawn after every answer,
+    so sustained AI play rarely waits for a search.
+
+    Attributes:
+        searchers (Dict[str, Searcher]): Searches by name
+        process (bool): Whether the worker is a process or a thread
+        ticket (int): Ticket of the latest request
+        result (Optional[Result]): Answer to the latest request
+        speculated (int): Number of answers taken from speculation
+    """
+
+    def __init__(self, searchers: Dict[str, Searcher], process: bool = True):
+        """
+        Args:
+            searchers (Dict[str, Searcher]): Searches by name
+            process (bool, optional): Run in a process so that expensive
+                searches do not hold the GIL of the game. The process is
+                spawned, not forked, so it does not inherit the window and
+                audio state. Defaults to True.
+        """
+        self.searchers = searchers
+        self.process = process
+        if process:
+            context = multiprocessing.get_context("spawn")
+            self.requests = context.Queue()
+            self.results = context.Queue()
+            self.worker = context.Process(target=_serve,
+                                          args=(searchers, self.requests,
+                                                self.results),
+                                          daemon=True)
+        else:
+            self.requests = queue.Queue()
+            self.results = queue.Queue()
+            self.worker = threading.Thread(target=_serve,
+                                           args=(searchers, self.requests,
+                                                 self.results),
+                                           daemon=True)
+        self.worker.start()
+        self.ticket = 0
+        self.result: Optional[Result] = None
+        self.speculated = 0
+
+    def submit(self,
+               name: str,
+               stats: BoardStats,
+               pieces: Sequence[Type[Tetris]],
+               bag: Sequence[Type[Tetris]] = ()) -> int:
+        """Ask for a decision, previous requests become stale
+
+        Args:
+            name (str): Name of the search
+            stats (BoardStats): Statistics of the game board
+            pieces (Sequence[Type[Tetris]]): Known tetrises, current first
+            bag (Sequence[Type[Tetris]], optional): Tetrises left in the bag
+
+        Returns:
+            int: Ticket of the request
+        """
+        self.ticket += 1
+        self.result = None
+        self.requests.put(
+            (self.ticket, name, tuple(stats.rows),
+             tuple(tetris.name for tetris in pieces),
+             tuple(tetris.name for tetris in bag)))
+        return self.ticket
+
+    def poll(self, ticket: Optional[int] = None) -> Optional[Result]:
+        """Get the answer to a request without blocking
+
+        Args:
+            ticket (Optional[int], optional): Ticket of the request.
+                Defaults to the latest one.
+        """
+        ticket = self.ticket if ticket is None else ticket
+        while True:
+            try:
+                answer, fields, hit = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.speculated += hit
+            if answer == self.ticket and fields is not None:
+                self.result = Result(*fields)
+        return self.result if ticket == self.ticket else None
+
+    def stop(self):
+        self.requests.put(None)
+        self.worker.join(1)
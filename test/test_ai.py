@@ -11,10 +11,14 @@
 __author__ = "yanyongyu"
 
 import unittest
+from unittest import mock
 
 import numpy as np
-from tetris.ai import pierre_dellacherie
-from tetris.tetris import ITetris, TTetris, LTetris, JTetris, OTetris, ZTetris1, ZTetris2
+from pytetris import ai
+from pytetris.ai import (pierre_dellacherie, pierre_dellacherie_candidates,
+                         incremental_pierre_dellacherie)
+from pytetris.features import BoardStats
+from pytetris.tetris import ITetris, TTetris, LTetris, JTetris, OTetris, ZTetris1, ZTetris2
 
 
 class TestAI(unittest.TestCase):
@@ -115,7 +119,7 @@ class TestAI(unittest.TestCase):
                           [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]],
                          dtype=np.int),
             "current":
-                TTetris(-1, 16, 1)
+                TTetris(-1, 16, 3)
         }]
         for index, test in enumerate(tests):
             with self.subTest(i=index):
@@ -125,6 +129,121 @@ class TestAI(unittest.TestCase):
                 self.assertEqual(results[0].y, test["current"].y)
                 self.assertEqual(results[0].index, test["current"].index)
 
+    def test_batch_features(self):
+        matrix = np.zeros((25, 16), dtype=np.int)
+        matrix[:, :3] = 1
+        matrix[:, -3:] = 1
+        matrix[-3:, :] = 1
+        matrix[-4, 3:12] = 1
+        matrix[-5, [3, 5, 6, 9]] = 1
+        matrix[-6, [3, 6]] = 1
+        matrix[-8, 6] = 1
+        for tetris in (ITetris, TTetris, LTetris, JTetris, OTetris, ZTetris1,
+                       ZTetris2):
+            indexes, xs, ys = ai._drop_placements(matrix, tetris.shapes)
+            boards, _ = ai._stack_boards(matrix, tetris.shapes, indexes, xs,
+                                         ys)
+            with self.subTest(tetris=tetris.__name__):
+                np.testing.assert_array_equal(
+                    ai._batch_board_row_transitions(boards),
+                    [ai._board_row_transitions(board) for board in boards])
+                np.testing.assert_array_equal(
+                    ai._batch_board_column_transitions(boards),
+                    [ai._board_column_transitions(board) for board in boards])
+                np.testing.assert_array_equal(
+                    ai._batch_board_buried_holes(boards),
+                    [ai._board_buried_holes(board) for board in boards])
+                np.testing.assert_array_equal(
+                    ai._batch_board_wells(boards),
+                    [ai._board_wells(board) for board in boards])
+
+    def test_incremental(self):
+        matrix = np.zeros((25, 16), dtype=np.int)
+        matrix[:, :3] = 1
+        matrix[:, -3:] = 1
+        matrix[-3:, :] = 1
+        matrix[-4, 3:12] = 1
+        matrix[-5, [3, 5, 6, 9]] = 1
+        matrix[-6, [3, 6]] = 1
+        matrix[-8, 6] = 1
+        stats = BoardStats.from_matrix(matrix)
+        for tetris in (ITetris, TTetris, LTetris, JTetris, OTetris, ZTetris1,
+                       ZTetris2):
+            with self.subTest(tetris=tetris.__name__):
+                expected = pierre_dellacherie(matrix, tetris.matrixs)
+                results = incremental_pierre_dellacherie(stats, tetris.matrixs)
+                self.assertEqual([(r.index, r.x, r.y) for r in results],
+                                 [(r.index, r.x, r.y) for r in expected])
+                for result, expected_result in zip(results, expected):
+                    self.assertAlmostEqual(result.score, expected_result.score)
+
+        best = results[0]
+        stats.add_tetris(ZTetris2.shapes[best.index], best.x, best.y)
+        self.assertEqual(stats.totals, BoardStats(stats.rows).totals)
+
+    def test_candidates(self):
+        matrix = np.zeros((25, 16), dtype=np.int)
+        matrix[:, :3] = 1
+        matrix[:, -3:] = 1
+        matrix[-3:, :] = 1
+        matrix[-4, 3:12] = 1
+        matrix[-5, [3, 5, 6, 9]] = 1
+        for tetris in (ITetris, TTetris, OTetris, ZTetris2):
+            expected = pierre_dellacherie(matrix, tetris.matrixs)
+            for k in (1, 2, 5, None):
+                with self.subTest(tetris=tetris.__name__, k=k):
+                    candidates = pierre_dellacherie_candidates(
+                        matrix, tetris.matrixs, k)
+                    self.assertEqual(len(candidates), len(expected[:k]))
+                    self.assertEqual(
+                        list(zip(candidates["index"], candidates["x"],
+                                 candidates["y"], candidates["priority"])),
+                        [(r.index, r.x, r.y, r.priority)
+                         for r in expected[:k]])
+        # 特征与逐个计算的结果一致
+        best = candidates[0]
+        board = matrix.copy()
+        for i, j in ZTetris2.shapes[best["index"]].cells:
+            board[best["y"] + 2 + i, best["x"] + 3 + j] = 1
+        self.assertEqual(best["board_buried_holes"],
+                         ai._board_buried_holes(board))
+        self.assertEqual(best["board_wells"], ai._board_wells(board))
+
+    def test_evaluators(self):
+        matrix = np.zeros((25, 16), dtype=np.int)
+        matrix[:, :3] = 1
+        matrix[:, -3:] = 1
+        matrix[-3:, :] = 1
+        matrix[-4, 3:12] = 1
+        matrix[-5, [3, 4, 7]] = 1
+        results = ai.evaluate(matrix, TTetris.matrixs, list(ai.EVALUATORS))
+        expected = pierre_dellacherie(matrix, TTetris.matrixs)
+        self.assertEqual(ai.results_of(results["el-tetris"]), expected)
+
+        best = results["yiyuan-lee"][0]
+        board = matrix.copy()
+        for i, j in TTetris.shapes[best["index"]].cells:
+            board[best["y"] + 2 + i, best["x"] + 3 + j] = 1
+        heights = [20 - np.argmax(board[2:, j]) for j in range(3, 13)]
+        self.assertEqual(best["aggregate_height"], sum(heights))
+        self.assertEqual(best["bumpiness"],
+                         sum(abs(a - b) for a, b in zip(heights, heights[1:])))
+
+        # 共享的特征每批只计算一次
+        calls = []
+        heights = ai.FEATURES["column_heights"]
+        with mock.patch.dict(
+                ai.FEATURES,
+                column_heights=lambda batch: calls.append(1) or heights(batch)):
+            batch = ai.Batch(matrix, TTetris.matrixs)
+            for name in ai.EVALUATORS:
+                ai.EVALUATORS[name].score(batch)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(set(batch.values),
+                         {feature for evaluator in ai.EVALUATORS.values()
+                          for feature in evaluator.features} |
+                         {"column_heights"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 21:30:05
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 21:30:05
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import io
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+import numpy as np
+
+from pytetris.search import Greedy
+from pytetris.simulate import MAX_PIECES, play
+from pytetris.batch import RunningStats, bucket_of, play_game, simulate
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_running_stats(self):
+        values = np.random.RandomState(0).randint(0, 1000, size=200)
+        stats = RunningStats()
+        for value in values:
+            stats.add(int(value))
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.variance, values.var(ddof=1), places=6)
+        self.assertEqual((stats.min, stats.max), (values.min(), values.max()))
+        self.assertEqual(sum(stats.histogram.values()), len(values))
+        self.assertLessEqual(len(stats.histogram), 16 + 10)
+
+        self.assertEqual([bucket_of(value) for value in (0, 15, 16, 31, 32)],
+                         [0, 15, 16, 16, 32])
+
+    def test_play_game(self):
+        result = play_game(Greedy(), 3, 200)
+        expected = play(Greedy(), 3, 200)
+        self.assertEqual(
+            (result["pieces"], result["lines"], result["score"]),
+            (expected.pieces, expected.lines, expected.score))
+        self.assertFalse(result["game_over"])
+        self.assertGreaterEqual(result["level"], 1)
+
+        # 默认有方块数上限, 达到上限的对局未结束
+        result = play_game(Greedy(), 3)
+        self.assertEqual(result["pieces"], MAX_PIECES)
+        self.assertFalse(result["game_over"])
+
+    def test_simulate(self):
+        output = io.StringIO()
+        aggregate = simulate(output, "greedy", 5, workers=1, max_pieces=30,
+                             every=2)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        games = [record for record in records if record["type"] == "game"]
+        stats = [record for record in records if record["type"] == "stats"]
+        self.assertEqual(sorted(game["seed"] for game in games),
+                         list(range(5)))
+        self.assertEqual([record["games"] for record in stats], [2, 4, 5])
+        self.assertEqual(aggregate.games, 5)
+        self.assertAlmostEqual(stats[-1]["lines"]["mean"],
+                               np.mean([game["lines"] for game in games]))
+
+    def test_every(self):
+        output = io.StringIO()
+        simulate(output, "greedy", 3, workers=1, max_pieces=10, every=0)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([record["type"] for record in records],
+                         ["game", "game", "game", "stats"])
+        with self.assertRaises(ValueError):
+            simulate(io.StringIO(), "greedy", 3, workers=1, every=-1)
+
+    def test_command(self):
+        # 不导入 pygame, 标准输出只有 JSON 行
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.run([
+            sys.executable, "-m", "pytetris", "simulate", "--games", "2",
+            "--workers", "1", "--max-pieces", "10"
+        ],
+                                 cwd=root,
+                                 stdout=subprocess.PIPE,
+                                 check=True)
+        records = [json.loads(line) for line in process.stdout.splitlines()]
+        self.assertEqual([record["type"] for record in records],
+                         ["game", "game", "stats"])
+        self.assertEqual(records[-1]["pieces"]["mean"], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 10:40:12
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 10:40:12
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import random
+import unittest
+
+import numpy as np
+from pytetris.board import ArrayBoard, BitBoard
+from pytetris.tetris import ITetris, TTetris, LTetris, JTetris, OTetris, ZTetris1, ZTetris2
+
+
+class TestBoard(unittest.TestCase):
+
+    def test_bitboard(self):
+        tetrises = [
+            ITetris, TTetris, LTetris, JTetris, OTetris, ZTetris1, ZTetris2
+        ]
+        rand = random.Random(0)
+        np.random.seed(0)
+        array_board = ArrayBoard()
+        array_board.random_startline(4)
+        np.random.seed(0)
+        bit_board = BitBoard()
+        bit_board.random_startline(4)
+        np.testing.assert_array_equal(bit_board.matrix, array_board.matrix)
+
+        for _ in range(100):
+            tetris = rand.choice(tetrises)(rand.randint(-1, 8), -2)
+            tetris.index = rand.randrange(len(tetris.matrixs))
+            collision = array_board.check_collision(tetris)
+            self.assertEqual(bit_board.check_collision(tetris), collision)
+            if collision:
+                continue
+            drop_y = bit_board.drop_position(tetris)
+            self.assertEqual(array_board.drop_position(tetris), drop_y)
+            while not array_board.check_collision(tetris):
+                tetris.y += 1
+            self.assertTrue(bit_board.check_collision(tetris))
+            tetris.y -= 1
+            self.assertEqual(tetris.y, drop_y)
+            array_board.add_tetris(tetris)
+            bit_board.add_tetris(tetris)
+            lines = array_board.full_lines()
+            np.testing.assert_array_equal(bit_board.full_lines(), lines)
+            array_board.clear_lines(lines)
+            bit_board.clear_lines(lines)
+            np.testing.assert_array_equal(bit_board.matrix, array_board.matrix)
+            self.assertEqual(bit_board.tops, array_board.tops)
+            self.assertEqual(bit_board.check_gameover(),
+                             array_board.check_gameover())
+            if array_board.check_gameover():
+                break
+
+    def test_drop_position_under_overhang(self):
+        board = BitBoard()
+        board.fill_line(21)
+        board.rows[21] ^= 0b11 << 3
+        board.rows[18] |= 0b11 << 3
+        board.update_tops()
+        tetris = OTetris(0, 17)
+        self.assertEqual(board.drop_position(tetris), 18)
+        self.assertEqual(tetris.y, 17)
+        tetris.y = -2
+        self.assertEqual(board.drop_position(tetris), 14)
+
+
+if __name__ == "__main__":
+    unittest.main()
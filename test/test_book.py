@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 18:31:44
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 18:31:44
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import pickle
+import tempfile
+import unittest
+
+from pytetris.simulate import play
+from pytetris.book import OpeningBook, build_book
+from pytetris.weights import PIERRE_DELLACHERIE
+from pytetris.search import Greedy, BookSearch, searcher_of
+
+
+class TestBook(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "book.npy")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_book(self):
+        count = build_book(Greedy(PIERRE_DELLACHERIE),
+                           plies=3,
+                           path=self.path,
+                           workers=1)
+        book = OpeningBook(self.path)
+        self.assertEqual(len(book), count)
+        self.assertGreater(count, 42)
+        self.assertEqual(len(pickle.loads(pickle.dumps(book))), count)
+
+        # 开局按库走, 之后交给搜索
+        searcher = BookSearch(Greedy(), book)
+        for seed in range(10):
+            self.assertEqual(play(searcher, seed, 3),
+                             play(Greedy(PIERRE_DELLACHERIE), seed, 3))
+        self.assertEqual((searcher.hits, searcher.misses), (30, 0))
+        play(searcher, 0, 5)
+        self.assertEqual((searcher.hits, searcher.misses), (33, 2))
+
+        searcher = searcher_of(f"book:{self.path}:lookahead")
+        self.assertEqual(type(searcher.searcher).__name__, "Lookahead")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 17:48:20
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 17:48:20
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from pytetris.search import Greedy
+from pytetris.simulate import play
+from pytetris import dataset
+from pytetris.dataset import generate, load, unpack_boards
+
+
+class TestDataset(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_generate(self):
+        manifest = generate(self.path, 2, 50, max_pieces=20, workers=1)
+        self.assertEqual(manifest["positions"], 100)
+        self.assertEqual(manifest["games"], 6)
+        first, second = load(self.path)
+        self.assertEqual(len(first), 50)
+        self.assertFalse(np.array_equal(first["board"], second["board"]))
+
+        game = first[first["game"] == 0]
+        self.assertEqual(list(game["ply"]), list(range(20)))
+        self.assertTrue((game["chosen"] == 0).all())
+        self.assertEqual(game["lines_to_go"][0], game["cleared"].sum())
+        self.assertFalse(game["game_over"].any())
+        self.assertFalse(unpack_boards(game["board"][0]).any())
+        self.assertEqual(unpack_boards(game["board"][1]).sum(), 4)
+        for record in game:
+            self.assertGreaterEqual(record["scores"][0],
+                                    record["scores"][record["count"] - 1])
+
+        # 中断后从清单续写得到相同的数据
+        expected = np.array(first)
+        del first, second
+        progress = os.path.join(self.path, "shard-00000.json")
+        with open(progress, "w") as f:
+            json.dump({"positions": 20, "games": 1}, f)
+        generate(self.path, 2, 50, max_pieces=20, workers=1)
+        self.assertTrue(np.array_equal(load(self.path)[0], expected))
+
+        with self.assertRaises(ValueError):
+            generate(self.path, 2, 60, max_pieces=20, workers=1)
+
+    def test_greedy(self):
+        # 不探索时与贪心搜索的对局一致
+        generate(self.path, 1, 300, seed=4, workers=1)
+        game = load(self.path)[0]
+        game = game[game["game"] == 0]
+        result = play(Greedy(), "4:0:0", len(game))
+        self.assertEqual(result.lines, game["cleared"].sum())
+        self.assertEqual(result.pieces, len(game))
+
+    def test_checkpoint(self):
+        # 一局填满分片, 中途被终止后从检查点续写得到相同的数据
+        generate(self.path, 1, 50, max_pieces=None, workers=1)
+        expected = np.array(load(self.path)[0])
+        self.assertEqual(expected["game"].max(), 0)
+
+        path = os.path.join(self.path, "resumed")
+        os.makedirs(path)
+        write_json = dataset._write_json
+        calls = []
+
+        def crash(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise RuntimeError("killed")
+            write_json(*args)
+
+        with mock.patch.object(dataset, "CHECKPOINT", 8), \
+                mock.patch.object(dataset, "_write_json", crash):
+            with self.assertRaises(RuntimeError):
+                dataset._fill_shard(path, 0, 50, 0, None, 0.)
+        with open(os.path.join(path, "shard-00000.json")) as f:
+            progress = json.load(f)
+        self.assertEqual(progress["positions"], 0)
+        self.assertEqual(progress["current"]["ply"], 16)
+
+        # 只搜索检查点之后的局面
+        with mock.patch.object(
+                dataset,
+                "pierre_dellacherie_candidates",
+                wraps=dataset.pierre_dellacherie_candidates) as candidates:
+            self.assertEqual(dataset._fill_shard(path, 0, 50, 0, None, 0.),
+                             (50, 1))
+        self.assertEqual(candidates.call_count, 50 - 16)
+        resumed = np.load(os.path.join(path, "shard-00000.npy"))
+        self.assertTrue(np.array_equal(resumed, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
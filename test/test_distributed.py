@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 16:05:29
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 16:05:29
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import json
+import socket
+import asyncio
+import unittest
+import threading
+import multiprocessing
+
+from pytetris.search import Greedy
+from pytetris.simulate import play
+from pytetris.weights import EL_TETRIS, PIERRE_DELLACHERIE
+from pytetris.distributed import Coordinator, run_worker, split_jobs
+
+
+class TestDistributed(unittest.TestCase):
+
+    def setUp(self):
+        self.jobs = split_jobs([("el-tetris", EL_TETRIS),
+                                ("pierre-dellacherie", PIERRE_DELLACHERIE)],
+                               seed=0,
+                               games=6,
+                               size=2,
+                               max_pieces=30)
+        self.started = threading.Event()
+        self.results = None
+        self.coordinator = Coordinator(self.jobs, timeout=10)
+        self.thread = threading.Thread(target=asyncio.run,
+                                       args=(self._serve(),),
+                                       daemon=True)
+
+    async def _serve(self):
+        await self.coordinator.start()
+        self.started.set()
+        self.results = await self.coordinator.join()
+
+    def test_workers(self):
+        self.thread.start()
+        self.assertTrue(self.started.wait(5))
+        port = self.coordinator.port
+
+        # 领取任务后只回传一局便断开的 worker
+        with socket.create_connection(("127.0.0.1", port)) as lost:
+            lost.sendall(b'{"type": "ready"}\n')
+            job = json.loads(lost.makefile().readline())
+            result = play(Greedy(tuple(job["weights"])), job["start"],
+                          job["max_pieces"])
+            lost.sendall(
+                json.dumps(
+                    dict(result.__dict__, type="result",
+                         job=job["id"])).encode() + b"\n")
+
+        workers = [
+            multiprocessing.Process(target=run_worker,
+                                    args=("127.0.0.1", port))
+            for _ in range(2)
+        ]
+        for worker in workers:
+            worker.start()
+        self.thread.join(60)
+        for worker in workers:
+            worker.join(10)
+        self.assertFalse(self.thread.is_alive())
+
+        for job in self.jobs:
+            expected = [
+                play(Greedy(job.weights), seed, job.max_pieces)
+                for seed in range(job.start, job.stop)
+            ]
+            self.assertEqual(self.results[job.id], expected)
+
+    def test_heartbeat(self):
+        # 单局比超时长, 心跳让 worker 不被判定丢失
+        self.jobs = split_jobs([("el-tetris", EL_TETRIS)],
+                               seed=0,
+                               games=1,
+                               size=1,
+                               max_pieces=2000)
+        self.coordinator = Coordinator(self.jobs, timeout=.5)
+        self.thread.start()
+        self.assertTrue(self.started.wait(5))
+        worker = multiprocessing.Process(target=run_worker,
+                                         args=("127.0.0.1",
+                                               self.coordinator.port, .1))
+        with self.assertNoLogs(level="WARNING"):
+            worker.start()
+            self.thread.join(60)
+        worker.join(10)
+        self.assertFalse(self.thread.is_alive())
+        self.assertEqual(self.results[0],
+                         [play(Greedy(EL_TETRIS), 0, 2000)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 20:02:13
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 20:02:13
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import sys
+import subprocess
+import unittest
+
+from pytetris.search import Greedy
+from pytetris.simulate import play
+from pytetris.board import FULL_ROW
+from pytetris.features import BoardStats
+from pytetris.tetris import ITetris
+from pytetris.engine import SPEEDS, GameState, Timestep
+
+
+class TestEngine(unittest.TestCase):
+
+    def test_no_pygame(self):
+        code = ("import sys, pytetris.engine; "
+                "sys.exit('pygame' in sys.modules)")
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode,
+                         0)
+
+    def test_controls(self):
+        state = GameState(seed=0)
+        current = state.current
+        while state.move(False):
+            pass
+        self.assertEqual(current.x, current.shape.min_x)
+        self.assertFalse(state.move(False))
+
+        landing = state.drop_position()
+        moves = 0
+        while state.soft_drop() is None:
+            moves += 1
+        self.assertEqual(state.pieces, 1)
+        self.assertIsNot(state.current, current)
+        self.assertEqual(current.y, landing)
+        self.assertEqual(moves, landing - current.spawn[1])
+
+        state.hard_drop()
+        self.assertEqual(state.pieces, 2)
+
+        # 每 SPEEDS[level] 帧下落一格
+        falls = sum(state.gravity() for _ in range(SPEEDS[1] * 3))
+        self.assertEqual(falls, 3)
+
+    def test_clear(self):
+        state = GameState(seed=1, defer_clear=True)
+        for row in range(18, 22):
+            state.board.rows[row] = FULL_ROW ^ (1 << 3)
+        state.stats = BoardStats(state.board.rows)
+        state.current = ITetris(*ITetris.spawn)
+        state.current.index = 1
+        x = state.current.x - state.current.shape.min_x
+        state.current.x -= x
+        self.assertEqual(state.hard_drop(), 4)
+        self.assertTrue(state.clearing)
+        self.assertEqual((state.score, state.lines), (100, 4))
+        state.clear()
+        self.assertFalse(state.clearing)
+        self.assertEqual(state.board.rows, GameState().board.rows)
+
+        state.score = 2400
+        state.hard_drop()
+        self.assertEqual(state.level, 5)
+
+    def test_seeded(self):
+        # AI 直接落子与无界面的模拟一致
+        state = GameState(seed=3)
+        searcher = Greedy()
+        for _ in range(300):
+            best = searcher.decide(
+                state.stats, [state.current.matrixs, state.next.matrixs],
+                [type(tetris) for tetris in state.bag])[0]
+            state.place(best.index, best.x, best.y)
+        result = play(Greedy(), 3, 300)
+        self.assertEqual((state.pieces, state.lines, state.score),
+                         (result.pieces, result.lines, result.score))
+
+        first = GameState(seed=5)
+        first.new_game(start_line=4)
+        second = GameState(seed=5)
+        second.new_game(start_line=4)
+        self.assertEqual(first.board.rows, second.board.rows)
+        self.assertNotEqual(first.board.rows, GameState().board.rows)
+
+    def test_timestep(self):
+        now = [0.]
+        timestep = Timestep(4, max_lag=2., clock=lambda: now[0])
+
+        def ticks(multiplier=1):
+            timestep.advance()
+            count = 0
+            while timestep.due(multiplier):
+                count += 1
+            return count
+
+        self.assertEqual(ticks(), 0)
+        now[0] += 1.
+        self.assertEqual(ticks(), 4)
+        now[0] += .125
+        self.assertEqual(ticks(), 0)
+        now[0] += .125
+        self.assertEqual(ticks(), 1)
+        # 加速时同样的时间运行更多逻辑帧
+        now[0] += 1.
+        self.assertEqual(ticks(8), 32)
+        # 卡顿时最多追赶 max_lag
+        now[0] += 10.
+        self.assertEqual(ticks(), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 11:42:03
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 11:42:03
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import unittest
+
+import numpy as np
+from pytetris import ai
+from pytetris.features import BoardStats
+from pytetris.tetris import TETRISES
+
+
+class TestFeatures(unittest.TestCase):
+
+    def test_lookup_tables(self):
+        rand = np.random.RandomState(0)
+        for index in range(200):
+            matrix = np.zeros((25, 16), dtype=np.int)
+            matrix[:, :3] = 1
+            matrix[:, -3:] = 1
+            matrix[-3:, :] = 1
+            # 随机高度与密度, 包含隐藏行
+            top = rand.randint(0, 23)
+            matrix[top:22, 3:13] = rand.rand(22 - top, 10) < rand.rand()
+            stats = BoardStats.from_matrix(matrix)
+            with self.subTest(i=index):
+                self.assertEqual(stats.totals,
+                                 (ai._board_row_transitions(matrix),
+                                  ai._board_column_transitions(matrix),
+                                  ai._board_buried_holes(matrix),
+                                  ai._board_wells(matrix)))
+
+    def test_zobrist(self):
+        rand = np.random.RandomState(1)
+        stats = BoardStats.from_matrix(_empty_matrix())
+        for index in range(300):
+            tetris = TETRISES[rand.randint(len(TETRISES))]
+            shape = tetris.shapes[rand.randint(len(tetris.shapes))]
+            x = rand.randint(shape.min_x, shape.max_x + 1)
+            y = stats.drop_position(shape, x)
+            if y < 0:
+                break
+            stats.place(shape, x, y)
+            fresh = BoardStats(stats.rows)
+            mirrored = BoardStats(
+                [int(f"{row:016b}"[::-1], 2) for row in stats.rows])
+            with self.subTest(i=index):
+                self.assertEqual(stats.hash, fresh.hash)
+                self.assertEqual(stats.mirror_hash, mirrored.hash)
+
+
+def _empty_matrix() -> np.ndarray:
+    matrix = np.zeros((25, 16), dtype=np.int)
+    matrix[:, :3] = 1
+    matrix[:, -3:] = 1
+    matrix[-3:, :] = 1
+    return matrix
+
+
+if __name__ == "__main__":
+    unittest.main()
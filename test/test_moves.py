@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 19:20:37
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 19:20:37
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import unittest
+
+from pytetris.typing import Move
+from pytetris.board import BitBoard
+from pytetris.search import Reachable
+from pytetris.features import BoardStats
+from pytetris.moves import MoveGenerator, reachable
+from pytetris.tetris import TETRISES, OTetris, TTetris
+from pytetris.ai import incremental_pierre_dellacherie
+
+
+def _drops(board: BitBoard, tetris) -> set:
+    return {(result.index, result.x, result.y)
+            for result in incremental_pierre_dellacherie(
+                BoardStats(board.rows), tetris.matrixs)}
+
+
+class TestMoves(unittest.TestCase):
+
+    def setUp(self):
+        # 左下角被第 19 行的前两格盖住, 只能从第 2, 3 列钻进去
+        self.board = BitBoard()
+        for row in (20, 21):
+            self.board.rows[row] |= sum(1 << (j + 3) for j in range(4, 10))
+        self.board.rows[19] |= 0b11 << 3
+
+    def replay(self, tetris, moves):
+        current = tetris(*tetris.spawn)
+        for move in moves:
+            if move is Move.DOWN:
+                current.y += 1
+            elif move is Move.ROTATE:
+                current.rotate(False)
+            else:
+                current.move(move is Move.RIGHT)
+            self.assertFalse(self.board.check_collision(current))
+        return current.index, current.x, current.y
+
+    def test_drops(self):
+        board = BitBoard()
+        for tetris in TETRISES:
+            generator = MoveGenerator(board.rows, tetris)
+            self.assertEqual(set(generator.search()), _drops(board, tetris))
+
+    def test_tuck(self):
+        placements = reachable(self.board.rows, OTetris)
+        self.assertIn((0, 0, 18), placements)
+        self.assertNotIn((0, 0, 18), _drops(self.board, OTetris))
+        for placement, moves in placements.items():
+            self.assertEqual(self.replay(OTetris, moves), placement)
+            current = OTetris(placement[1], placement[2] + 1, placement[0])
+            self.assertTrue(self.board.check_collision(current))
+
+        generator = MoveGenerator(self.board.rows, TTetris)
+        tucks = set(generator.search()) - _drops(self.board, TTetris)
+        self.assertTrue(tucks)
+        for placement in tucks:
+            self.assertEqual(
+                self.replay(TTetris, generator.path(placement)), placement)
+
+        best = Reachable().decide(BoardStats(self.board.rows),
+                                  [OTetris.matrixs])[0]
+        self.assertEqual((best.index, best.x, best.y), (0, 0, 18))
+
+    def test_spawn_blocked(self):
+        self.board.rows[1] = self.board.rows[0] = 0xFFFF
+        self.assertEqual(MoveGenerator(self.board.rows, TTetris).search(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
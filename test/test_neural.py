@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 17:20:55
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 17:20:55
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from pytetris.board import FULL_ROW, BitBoard
+from pytetris.weights import EL_TETRIS
+from pytetris.features import BoardStats
+from pytetris.neural import MLP, linear
+from pytetris.search import Lookahead, NeuralSearch
+from pytetris.tetris import ITetris, OTetris, TTetris, ZTetris1
+from pytetris.ai import EVALUATORS, PIERRE_DELLACHERIE_FEATURES, Batch
+
+
+class TestNeural(unittest.TestCase):
+
+    def setUp(self):
+        board = BitBoard()
+        for row in range(18, 22):
+            board.fill_line(row)
+            board.rows[row] ^= 1 << 12
+        self.stats = BoardStats(board.rows)
+
+    def test_linear(self):
+        network = linear(PIERRE_DELLACHERIE_FEATURES, EL_TETRIS)
+        batch = Batch(self.stats.matrix, TTetris.matrixs)
+        np.testing.assert_allclose(network.score(batch),
+                                   EVALUATORS["el-tetris"].score(batch))
+
+        search = NeuralSearch(network)
+        pieces = [ZTetris1.matrixs, ITetris.matrixs]
+        self.assertEqual(
+            [(r.index, r.x, r.y) for r in search.decide(self.stats, pieces)],
+            [(r.index, r.x, r.y)
+             for r in Lookahead().search(self.stats, *pieces)])
+
+    def test_mlp(self):
+        network = MLP.random(("cells", "column_heights"), 210, (16, 8))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mlp.npz")
+            network.save(path)
+            loaded = MLP.load(path)
+        self.assertEqual(loaded.features, network.features)
+
+        batches = [
+            Batch(self.stats.matrix, tetris.matrixs)
+            for tetris in (ITetris, TTetris)
+        ]
+        values = loaded.score_many(batches)
+        for batch, value in zip(batches, values):
+            np.testing.assert_allclose(value, network.score(batch))
+
+    def test_no_placement(self):
+        # 每行只留一个空格, 尚未结束但放不下任何方块
+        rows = BitBoard().rows
+        for row in range(2, 22):
+            rows[row] = FULL_ROW & ~(1 << (3 + row * 3 % 10))
+        stats = BoardStats(rows)
+        self.assertFalse(stats.check_gameover())
+
+        network = MLP.random(PIERRE_DELLACHERIE_FEATURES, 6)
+        batch = Batch(stats.matrix, ITetris.matrixs)
+        self.assertEqual(len(network.score(batch)), 0)
+        self.assertEqual(
+            [len(values) for values in network.score_many([batch, batch])],
+            [0, 0])
+        search = NeuralSearch(network)
+        self.assertEqual(search.value(stats, [ITetris.matrixs]),
+                         float("-inf"))
+        self.assertEqual(
+            search.decide(stats, [ITetris.matrixs, OTetris.matrixs]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 12:20:37
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 12:20:37
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import time
+import unittest
+
+from pytetris.board import BitBoard
+from pytetris.search import (Greedy, Lookahead, BeamSearch, Expectimax,
+                             CachedSearch)
+from pytetris.features import BoardStats
+from pytetris.worker import AIWorker
+from pytetris.parallel import ParallelSearch
+from pytetris.cache import MIRRORS
+from pytetris.tetris import REGISTRY, TETRISES, ITetris, TTetris, OTetris, ZTetris1
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        board = BitBoard()
+        for row in range(18, 22):
+            board.fill_line(row)
+            board.rows[row] ^= 1 << 12
+        self.stats = BoardStats(board.rows)
+
+    def test_lookahead(self):
+        lookahead = Lookahead()
+        results = lookahead.search(self.stats, OTetris.matrixs,
+                                   ITetris.matrixs)
+        self.assertLessEqual(len(results), lookahead.width)
+        self.assertEqual(lookahead.hits, 0)
+
+        again = lookahead.search(self.stats, OTetris.matrixs, ITetris.matrixs)
+        self.assertEqual([(r.index, r.x, r.y, r.score) for r in again],
+                         [(r.index, r.x, r.y, r.score) for r in results])
+        self.assertEqual(lookahead.hits, len(results))
+
+    def test_lookahead_keeps_well(self):
+        # 下一块为 I 时不应堵住右侧的井
+        results = Lookahead().search(self.stats, ZTetris1.matrixs,
+                                     ITetris.matrixs)
+        best = results[0]
+        shape = ZTetris1.shapes[best.index]
+        columns = {best.x + j for _, j in shape.cells}
+        self.assertNotIn(9, columns)
+
+    def test_beam_search(self):
+        pieces = [
+            ZTetris1.matrixs, ITetris.matrixs, TTetris.matrixs,
+            OTetris.matrixs
+        ]
+        beam = BeamSearch(width=4)
+        results = beam.search(self.stats, pieces)
+        self.assertTrue(results)
+        self.assertEqual(beam.info.depth, 4)
+        self.assertGreater(beam.info.nodes_per_second, 0)
+
+        # 预算耗尽时返回已完成深度的最优解
+        results = beam.search(self.stats, pieces, budget=0)
+        self.assertTrue(results)
+        self.assertEqual(beam.info.depth, 1)
+
+    def test_expectimax(self):
+        expectimax = Expectimax(depth=1, width=3)
+        # 袋中只剩 I 时, 第三块必为 I
+        results = expectimax.search(self.stats,
+                                    [ZTetris1.matrixs, OTetris.matrixs],
+                                    [ITetris])
+        self.assertTrue(results)
+        misses = expectimax.misses
+        self.assertGreater(misses, 0)
+
+        again = expectimax.search(self.stats,
+                                  [ZTetris1.matrixs, OTetris.matrixs],
+                                  [ITetris])
+        self.assertEqual([r.score for r in again], [r.score for r in results])
+        self.assertEqual(expectimax.misses, misses)
+        self.assertGreater(expectimax.hits, 0)
+
+    def test_cached_search(self):
+        cached = CachedSearch(Greedy(), mirror=True)
+        mirrored = BoardStats(
+            [int(f"{row:016b}"[::-1], 2) for row in self.stats.rows])
+        for tetris in TETRISES:
+            mirror = REGISTRY[MIRRORS[tetris.name][0]]
+            with self.subTest(tetris=tetris.name):
+                self.assertEqual(
+                    cached.decide(self.stats, [tetris.matrixs]),
+                    Greedy().decide(self.stats, [tetris.matrixs]))
+                # 镜像棋盘上的镜像方块命中同一条目
+                self.assertEqual(
+                    cached.decide(mirrored, [mirror.matrixs]),
+                    Greedy().decide(mirrored, [mirror.matrixs]))
+        self.assertEqual(cached.misses, len(TETRISES))
+        self.assertEqual(cached.hits, len(TETRISES))
+
+    def test_parallel(self):
+        pieces = [ZTetris1.matrixs, OTetris.matrixs]
+        expected = Expectimax(depth=1, width=3).search(self.stats, pieces,
+                                                       [ITetris, TTetris])
+        parallel = ParallelSearch(Expectimax(depth=1, width=3),
+                                  workers=2,
+                                  width=3)
+        try:
+            results = parallel.search(self.stats, pieces, [ITetris, TTetris])
+            self.assertEqual([(r.index, r.x, r.y) for r in results],
+                             [(r.index, r.x, r.y) for r in expected])
+            for result, expected_result in zip(results, expected):
+                self.assertAlmostEqual(result.score, expected_result.score)
+
+            parallel.submit(self.stats, pieces, [ITetris])
+            parallel.cancel()
+            self.assertIsNone(parallel.pending)
+        finally:
+            parallel.shutdown()
+
+    def test_worker(self):
+        for process in (False, True):
+            with self.subTest(process=process):
+                worker = AIWorker({"greedy": Greedy()}, process=process)
+                try:
+                    stale = worker.submit("greedy", self.stats, [OTetris])
+                    ticket = worker.submit("greedy", self.stats, [ITetris])
+                    result = None
+                    # 启动新进程需要更长时间
+                    for _ in range(10000):
+                        result = worker.poll()
+                        if result is not None:
+                            break
+                        time.sleep(0.001)
+                    expected = Greedy().decide(self.stats,
+                                               [ITetris.matrixs])[0]
+                    self.assertEqual(result, expected)
+                    self.assertEqual(worker.poll(ticket), expected)
+                    self.assertIsNone(worker.poll(stale))
+                finally:
+                    worker.stop()
+
+    def test_worker_speculation(self):
+        worker = AIWorker({"greedy": Greedy()}, process=False)
+        try:
+            worker.submit("greedy", self.stats, [ITetris, OTetris], [TTetris])
+            result = None
+            while result is None:
+                result = worker.poll()
+                time.sleep(0.001)
+            # 等待下一块的推测完成
+            time.sleep(0.1)
+            stats = self.stats.copy()
+            stats.place(ITetris.shapes[result.index], result.x, result.y)
+            worker.submit("greedy", stats, [OTetris, TTetris], TETRISES)
+            result = None
+            while result is None:
+                result = worker.poll()
+                time.sleep(0.001)
+            self.assertEqual(worker.speculated, 1)
+            self.assertEqual(result,
+                             Greedy().decide(stats, [OTetris.matrixs])[0])
+        finally:
+            worker.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
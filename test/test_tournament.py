@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 16:40:12
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 16:40:12
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import unittest
+
+from pytetris.tournament import Tournament, compare, summarize, t_critical
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_statistics(self):
+        self.assertAlmostEqual(t_critical(10), 2.228, places=3)
+        # 自由度很小时不能用展开式近似
+        self.assertAlmostEqual(t_critical(1), 12.706, places=3)
+        self.assertAlmostEqual(t_critical(2), 4.303, places=3)
+        self.assertAlmostEqual(t_critical(6), 2.447, places=2)
+        summary = summarize([1, 2, 3, 4, 5])
+        self.assertEqual((summary.mean, summary.median), (3., 3.))
+        self.assertAlmostEqual(summary.high - summary.mean,
+                               2.776 * (2.5**0.5) / 5**0.5,
+                               places=3)
+
+        # 配对差值稳定时即使均值接近也显著
+        comparison = compare([11, 12, 13, 14], [10, 11, 12, 12])
+        self.assertTrue(comparison.significant)
+        comparison = compare([11, 10, 13, 12], [10, 11, 12, 13])
+        self.assertFalse(comparison.significant)
+
+    def test_run(self):
+        tournament = Tournament(
+            ["greedy", "greedy", "greedy:pierre-dellacherie"],
+            games=3,
+            max_pieces=20,
+            workers=1)
+        results = tournament.run()
+        self.assertEqual(len(results), 2)
+        self.assertEqual([result.seed for result in results["greedy"]],
+                         [0, 1, 2])
+        report = tournament.report(results)
+        self.assertIn("greedy:pierre-dellacherie", report)
+        self.assertIn("lines:", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
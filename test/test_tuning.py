@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+@Author         : yanyongyu
+@Date           : 2026-10-18 15:34:50
+@LastEditors    : yanyongyu
+@LastEditTime   : 2026-10-18 15:34:50
+@Description    : None
+@GitHub         : https://github.com/yanyongyu
+"""
+__author__ = "yanyongyu"
+
+import os
+import tempfile
+import unittest
+
+from pytetris.search import Greedy
+from pytetris.simulate import play
+from pytetris.tuning import CrossEntropyTuner
+from pytetris.weights import (EL_TETRIS, PIERRE_DELLACHERIE, load_weights,
+                              save_weights)
+
+
+class TestTuning(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "weights.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_play(self):
+        result = play(Greedy(), 3, 200)
+        self.assertEqual(result.pieces, 200)
+        self.assertGreater(result.lines, 0)
+        self.assertEqual(result, play(Greedy(), 3, 200))
+        self.assertNotEqual(result, play(Greedy(PIERRE_DELLACHERIE), 3, 200))
+
+    def test_weights_file(self):
+        self.assertEqual(load_weights("el-tetris", self.path), EL_TETRIS)
+        with self.assertRaises(KeyError):
+            load_weights("tuned", self.path)
+        save_weights("tuned", [1, 2, 3, 4, 5, 6], self.path)
+        self.assertEqual(load_weights("tuned", self.path),
+                         (1., 2., 3., 4., 5., 6.))
+        with self.assertRaises(ValueError):
+            save_weights("el-tetris", EL_TETRIS, self.path)
+
+    def test_cross_entropy(self):
+        tuner = CrossEntropyTuner(population=4,
+                                  elite=2,
+                                  games=1,
+                                  max_pieces=50,
+                                  workers=1)
+        weights = tuner.tune(1, name="tuned", path=self.path)
+        self.assertEqual(load_weights("tuned", self.path), weights)
+
+
+if __name__ == "__main__":
+    unittest.main()